@@ -6,8 +6,22 @@ import config
 from AbhiXMusic import LOGGER, app, userbot
 from AbhiXMusic.core.call import Abhi
 from AbhiXMusic.misc import sudo
+from AbhiXMusic.mongo.afkdb import load_afk_users
 from AbhiXMusic.plugins import ALL_MODULES
-from AbhiXMusic.utils.database import get_banned_users, get_gbanned
+from AbhiXMusic.utils.assistantchats import load_assistant_chats
+from AbhiXMusic.utils import cards  # registers the card assets with the render pool
+from AbhiXMusic.utils.fanout import resume_jobs
+from AbhiXMusic.utils.photos import photo_cache
+from AbhiXMusic.utils.render import render_pool
+from AbhiXMusic.utils.scheduler import scheduler
+from AbhiXMusic.utils.schema import ensure_indexes
+from AbhiXMusic.utils.thumbnails import thumb_cache, warm_thumbs
+from AbhiXMusic.utils.writebehind import flush_all
+from AbhiXMusic.utils.database import (
+    iter_banned_users,
+    iter_gbanned,
+    migrate_chat_settings,
+)
 
 async def init():
     if (
@@ -19,20 +33,33 @@ async def init():
     ):
         LOGGER(__name__).error("𝐒𝐭𝐫𝐢𝐧𝐠 𝐒𝐞𝐬𝐬𝐢𝐨𝐧 𝐍𝐨𝐭 𝐅𝐢𝐥𝐥𝐞𝐝, 𝐏𝐥𝐞𝐚𝐬𝐞 𝐅𝐢𝐥𝐥 𝐀 𝐏𝐲𝐫𝐨𝐠𝐫𝐚𝐦 𝐒𝐞𝐬𝐬𝐢𝐨𝐧")
         exit()
+    # Fork the render workers before any client, Mongo query or thread pool
+    # is busy, so no child inherits a lock held by another thread. The card
+    # and thumbnail modules imported above have registered their assets.
+    render_pool.start()
     await sudo()
+    await migrate_chat_settings()
+    await ensure_indexes()
+    await load_afk_users()
+    await load_assistant_chats()
+    await thumb_cache.load()
+    scheduler.every("thumb_manifest", 300, thumb_cache.save, jitter=30)
+    await photo_cache.load()
+    scheduler.every("photo_manifest", 300, photo_cache.save, jitter=30)
     try:
-        users = await get_gbanned()
-        for user_id in users:
-            BANNED_USERS.add(user_id)
-        users = await get_banned_users()
-        for user_id in users:
-            BANNED_USERS.add(user_id)
+        async for user_id in iter_gbanned():
+            config.BANNED_USERS.add(user_id)
+        async for user_id in iter_banned_users():
+            config.BANNED_USERS.add(user_id)
     except:
         pass
     await app.start()
     for all_module in ALL_MODULES:
         importlib.import_module("AbhiXMusic.plugins" + all_module)
     LOGGER("AbhiXMusic.plugins").info("𝐀𝐥𝐥 𝐅𝐞𝐚𝐭𝐮𝐫𝐞𝐬 𝐋𝐨𝐚𝐝𝐞𝐝 𝐁𝐚𝐛𝐲🥳...")
+    scheduler.start()
+    await resume_jobs()
+    asyncio.create_task(warm_thumbs())
     await userbot.start()
     await Abhi.start()
     try:
@@ -49,6 +76,10 @@ async def init():
         "╔═════ஜ۩۞۩ஜ════╗\n  ☠︎︎MADE BY MR ABHI\n╚═════ஜ۩۞۩ஜ════╝"
     )
     await idle()
+    await flush_all()
+    await thumb_cache.save()
+    await photo_cache.save()
+    render_pool.shutdown()
     await app.stop()
     await userbot.stop()
     LOGGER("AbhiXMusic").info("𝗦𝗧𝗢𝗣 𝗦𝗧𝗥𝗔𝗡𝗚𝗘𝗥 𝗠𝗨𝗦𝗜𝗖🎻 𝗕𝗢𝗧..")
@@ -1,8 +1,11 @@
 
 from pyrogram import Client, errors
 from pyrogram.enums import ChatMemberStatus, ParseMode
+from pyrogram.types import InputMediaPhoto
 import config
 from ..logging import LOGGER
+from .governor import GOVERNED, Governor
+from .media import MediaRegistry, is_stale
 
 class Abhi(Client):
     def __init__(self):
@@ -15,6 +18,53 @@ class Abhi(Client):
             in_memory=True,
             max_concurrent_transmissions=7,
         )
+        self.governor = Governor()
+        self.media = MediaRegistry()
+
+    async def invoke(self, query, *args, **kwargs):
+        if not isinstance(query, GOVERNED):
+            return await super().invoke(query, *args, **kwargs)
+        await self.governor.acquire(query)
+        try:
+            return await super().invoke(query, *args, **kwargs)
+        except errors.FloodWait as e:
+            # Hold back the rest of this chat's sends instead of letting each
+            # of them run into the same wait.
+            self.governor.flood_wait(query, int(e.value))
+            raise
+
+    async def send_photo(self, chat_id, photo, *args, **kwargs):
+        key = await self.media.key(photo)
+        file_id = self.media.get(key)
+        if file_id:
+            try:
+                return await super().send_photo(chat_id, file_id, *args, **kwargs)
+            except errors.RPCError as e:
+                if not is_stale(e):
+                    raise
+                self.media.forget(key)
+        message = await super().send_photo(chat_id, photo, *args, **kwargs)
+        self.media.remember(key, message)
+        return message
+
+    async def edit_message_media(self, chat_id, message_id, media, *args, **kwargs):
+        if not isinstance(media, InputMediaPhoto):
+            return await super().edit_message_media(chat_id, message_id, media, *args, **kwargs)
+        source = media.media
+        key = await self.media.key(source)
+        file_id = self.media.get(key)
+        if file_id:
+            media.media = file_id
+            try:
+                return await super().edit_message_media(chat_id, message_id, media, *args, **kwargs)
+            except errors.RPCError as e:
+                if not is_stale(e):
+                    raise
+                self.media.forget(key)
+            media.media = source
+        message = await super().edit_message_media(chat_id, message_id, media, *args, **kwargs)
+        self.media.remember(key, message)
+        return message
 
     async def start(self):
         await super().start()
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+# name -> Cache, for /caches
+caches = {}
+
+_MISSING = object()
+
+
+class Cache:
+    """A size-bounded LRU mapping whose entries can also expire.
+
+    Behaves like the plain dicts it replaces (`in`, `[]`, `get`, `pop`), but
+    drops the least recently used key once `maxsize` is reached and treats
+    entries older than `ttl` seconds as absent; `ttl` may also be a function
+    of the value. With a `loader`, `load` fills misses and concurrent misses
+    for the same key share one call.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl=None, loader=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.loader = loader
+        # key -> (value, expires or None), least recently used first
+        self.data = OrderedDict()
+        self._loading = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        caches[name] = self
+
+    def _lookup(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires = entry
+        if expires is not None and expires < time.monotonic():
+            del self.data[key]
+            self.stats["expired"] += 1
+            return _MISSING
+        self.data.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.stats["misses"] += 1
+            return default
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        # A value set directly is newer than whatever a running load read.
+        self._loading.pop(key, None)
+        ttl = self.ttl if ttl is None else ttl
+        if callable(ttl):
+            ttl = ttl(value)
+        self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def pop(self, key, default=None):
+        # A load already running for the key read the old value; its result
+        # is handed to its waiters but not cached.
+        self._loading.pop(key, None)
+        value = self._lookup(key)
+        if value is _MISSING:
+            return default
+        del self.data[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.set(key, default)
+            return default
+        return value
+
+    def clear(self):
+        self._loading.clear()
+        self.data.clear()
+
+    def __contains__(self, key) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _loaded(self, key, task: asyncio.Future):
+        if self._loading.get(key) is not task:
+            # Invalidated by pop or clear while it ran.
+            return
+        del self._loading[key]
+        if not task.cancelled() and task.exception() is None:
+            self.set(key, task.result())
+
+    async def load(self, key):
+        """The cached value for `key`, calling the loader on a miss.
+
+        Errors from the loader are raised to every waiting caller and
+        nothing is cached, so the next call tries again.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return await asyncio.shield(self.refresh(key))
+
+    def refresh(self, key) -> asyncio.Future:
+        """Run the loader for `key` unless it is running already.
+
+        The result replaces the cached value, so a caller can keep serving a
+        stale value while its replacement loads.
+        """
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.loader(key))
+            self._loading[key] = task
+            task.add_done_callback(lambda task: self._loaded(key, task))
+        return task
+
+    def report(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0,
+        }
@@ -17,6 +17,7 @@ from pytgcalls.types.input_stream.quality import HighQualityAudio, MediumQuality
 from pytgcalls.types.stream import StreamAudioEnded
 import config
 from AbhiXMusic import LOGGER, YouTube, app
+from AbhiXMusic.core.governor import NORMAL, send_priority
 from AbhiXMusic.misc import db
 from AbhiXMusic.utils.database import (
     add_active_chat,
@@ -33,12 +34,12 @@ from AbhiXMusic.utils.database import (
 from AbhiXMusic.utils.exceptions import AssistantErr
 from AbhiXMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
 from AbhiXMusic.utils.inline.play import stream_markup
+from AbhiXMusic.utils.scheduler import scheduler
 from AbhiXMusic.utils.stream.autoclear import auto_clean
 from AbhiXMusic.utils.thumbnails import get_thumb
 from strings import get_string
 
 autoend = {}
-counter = {}
 
 async def _clear_(chat_id):
     db[chat_id] = []
@@ -321,10 +322,10 @@ class Call(PyTgCalls):
         if video:
             await add_active_video_chat(chat_id)
         if await is_autoend():
-            counter[chat_id] = {}
             users = len(await assistant.get_participants(chat_id))
             if users == 1:
                 autoend[chat_id] = datetime.now() + timedelta(minutes=1)
+                scheduler.wake("auto_end")
 
     async def change_stream(self, client, chat_id):
         check = db.get(chat_id)
@@ -592,7 +593,8 @@ class Call(PyTgCalls):
         async def stream_end_handler1(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
-            await self.change_stream(client, update.chat_id)
+            with send_priority(NORMAL):
+                await self.change_stream(client, update.chat_id)
 
 
 Abhi = Call()
\ No newline at end of file
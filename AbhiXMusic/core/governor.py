@@ -0,0 +1,228 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pyrogram.raw.functions.messages import (
+    EditMessage,
+    ForwardMessages,
+    SendMedia,
+    SendMessage,
+    SendMultiMedia,
+)
+
+from AbhiXMusic.core.cache import Cache
+
+# Priority classes, most urgent first. Sends default to INTERACTIVE, so only
+# background work has to opt out with `send_priority`.
+INTERACTIVE = 0
+NORMAL = 1
+LOW = 2
+LEVELS = {INTERACTIVE: "interactive", NORMAL: "normal", LOW: "low"}
+
+# Telegram allows a bot about 30 messages a second overall, 20 a minute in one
+# group and about one a second in a private chat.
+GLOBAL_RATE = 30
+GROUP_RATE = 20 / 60
+GROUP_BURST = 10
+PRIVATE_RATE = 1
+PRIVATE_BURST = 3
+# Edits are limited apart from new messages, so progress edits never spend a
+# group's send budget; about one a second per chat stays clear of FloodWait.
+EDIT_RATE = 1
+EDIT_BURST = 5
+# LOW sends are dropped once this many sends are already waiting.
+LOW_DROP_QUEUE = 50
+CHAT_BUCKETS = 10000
+
+GOVERNED = (SendMessage, SendMedia, SendMultiMedia, ForwardMessages, EditMessage)
+
+send_priority_var = ContextVar("send_priority", default=INTERACTIVE)
+
+
+class SendDropped(Exception):
+    """A low-priority send was dropped or replaced by a newer edit."""
+
+
+@contextmanager
+def send_priority(level: int):
+    token = send_priority_var.set(level)
+    try:
+        yield
+    finally:
+        send_priority_var.reset(token)
+
+
+class Bucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+
+    def wait_time(self, now: float) -> float:
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+def _peer_key(query):
+    peer = getattr(query, "to_peer", None) or getattr(query, "peer", None)
+    for attr, sign in (("channel_id", -1), ("chat_id", -1), ("user_id", 1)):
+        value = getattr(peer, attr, None)
+        if value is not None:
+            return sign * value
+    return None
+
+
+def _bucket_key(query):
+    """(chat, is_edit) naming the per-chat bucket a send draws from."""
+    chat = _peer_key(query)
+    if chat is None:
+        return None
+    return (chat, isinstance(query, EditMessage))
+
+
+class Governor:
+    """Orders outbound sends by priority under a global and a per-chat bucket.
+
+    Sends that find both buckets ready go straight through. Everything else
+    queues, and a single dispatcher releases the most urgent send whose chat
+    has a token, so one flooded chat never holds up replies in another.
+    """
+
+    def __init__(self):
+        self.global_bucket = Bucket(GLOBAL_RATE, GLOBAL_RATE)
+        self.chats = Cache("send_buckets", CHAT_BUCKETS)
+        self.queues = {level: deque() for level in LEVELS}
+        self.pending_edits = {}
+        self.wakeup = asyncio.Event()
+        self.dispatcher = None
+        self.stats = {
+            level: {"sent": 0, "waited": 0.0, "max_wait": 0.0, "dropped": 0}
+            for level in LEVELS
+        }
+
+    def _chat_bucket(self, key):
+        bucket = self.chats.get(key)
+        if bucket is None:
+            chat, edit = key
+            if edit:
+                bucket = Bucket(EDIT_RATE, EDIT_BURST)
+            elif chat > 0:
+                bucket = Bucket(PRIVATE_RATE, PRIVATE_BURST)
+            else:
+                bucket = Bucket(GROUP_RATE, GROUP_BURST)
+            self.chats[key] = bucket
+        return bucket
+
+    def _ready(self, key, now: float) -> float:
+        wait = self.global_bucket.wait_time(now)
+        if key is not None:
+            wait = max(wait, self._chat_bucket(key).wait_time(now))
+        return wait
+
+    def _take(self, key):
+        self.global_bucket.take()
+        if key is not None:
+            self._chat_bucket(key).take()
+
+    def _record(self, level: int, waited: float):
+        stats = self.stats[level]
+        stats["sent"] += 1
+        stats["waited"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    async def acquire(self, query):
+        level = send_priority_var.get()
+        key = _bucket_key(query)
+        if not self.queued() and self._ready(key, time.monotonic()) == 0:
+            self._take(key)
+            self._record(level, 0)
+            return
+        if level == LOW and self.queued() >= LOW_DROP_QUEUE:
+            self.stats[level]["dropped"] += 1
+            raise SendDropped
+        future = asyncio.get_running_loop().create_future()
+        edit = None
+        if level == LOW and isinstance(query, EditMessage):
+            # Only the latest cosmetic edit of a message is worth sending.
+            edit = (key, query.id)
+            previous = self.pending_edits.get(edit)
+            if previous and not previous.done():
+                previous.set_exception(SendDropped())
+                self.stats[level]["dropped"] += 1
+            self.pending_edits[edit] = future
+        self.queues[level].append((key, future, time.monotonic()))
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.create_task(self._dispatch())
+        self.wakeup.set()
+        try:
+            await future
+        finally:
+            if edit and self.pending_edits.get(edit) is future:
+                del self.pending_edits[edit]
+
+    async def _dispatch(self):
+        while self.queued():
+            now = time.monotonic()
+            sleep = None
+            released = False
+            for level, queue in self.queues.items():
+                for entry in list(queue):
+                    key, future, queued_at = entry
+                    if future.done():
+                        queue.remove(entry)
+                        continue
+                    wait = self._ready(key, now)
+                    if wait == 0:
+                        queue.remove(entry)
+                        self._take(key)
+                        self._record(level, now - queued_at)
+                        future.set_result(None)
+                        released = True
+                        break
+                    sleep = wait if sleep is None else min(sleep, wait)
+                if released:
+                    break
+            if released:
+                await asyncio.sleep(0)
+                continue
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), sleep)
+            except asyncio.TimeoutError:
+                pass
+
+    def flood_wait(self, query, seconds: int):
+        key = _bucket_key(query)
+        if key is None:
+            self.global_bucket.block(seconds)
+        else:
+            self._chat_bucket(key).block(seconds)
+
+    def report(self) -> dict:
+        report = {}
+        for level, stats in self.stats.items():
+            report[LEVELS[level]] = {
+                **stats,
+                "queued": len(self.queues[level]),
+                "avg_wait": stats["waited"] / stats["sent"] if stats["sent"] else 0,
+            }
+        return report
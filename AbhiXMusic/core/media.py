@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import os
+
+from pyrogram import errors
+
+from .cache import Cache
+
+FILE_IDS = 20000
+
+
+def _digest(path: str) -> str:
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# Errors meaning a remembered file_id, or the URL behind it, no longer works.
+STALE_ERRORS = frozenset(
+    (
+        "FILE_REFERENCE_EXPIRED",
+        "FILE_ID_INVALID",
+        "MEDIA_EMPTY",
+        "WEBPAGE_CURL_FAILED",
+        "WEBPAGE_MEDIA_EMPTY",
+    )
+)
+
+
+def is_stale(error: errors.RPCError) -> bool:
+    """Whether Telegram refused the file itself rather than the request."""
+    return getattr(error, "ID", None) in STALE_ERRORS
+
+
+class MediaRegistry:
+    """Remembers the file_id Telegram assigned to a URL or a local file.
+
+    URLs are keyed as they are and local files by the hash of their content,
+    so the same card or asset is uploaded once and re-sent by id afterwards.
+    """
+
+    def __init__(self, maxsize: int = FILE_IDS):
+        self.ids = Cache("file_ids", maxsize)
+
+    async def key(self, media):
+        if not isinstance(media, str):
+            return None
+        if media.startswith(("http://", "https://")):
+            return media
+        if os.path.isfile(media):
+            return "sha1:" + await asyncio.to_thread(_digest, media)
+        # Anything else already is a file_id.
+        return None
+
+    def get(self, key):
+        if key is None:
+            return None
+        return self.ids.get(key)
+
+    def remember(self, key, message):
+        if key is None or not message:
+            return
+        photo = getattr(message, "photo", None)
+        if photo:
+            self.ids[key] = photo.file_id
+
+    def forget(self, key):
+        self.ids.pop(key, None)
@@ -3,11 +3,18 @@ import time
 import heroku3
 from pyrogram import filters
 import config
+from AbhiXMusic.core.cache import Cache
 from AbhiXMusic.core.mongo import mongodb
 from .logging import LOGGER
 
 SUDOERS = filters.user()
 
+# Per-message state of downloads, playlist buttons and vote skips; none of it
+# is needed once the message is old.
+lyrical = Cache("lyrical", 10000, ttl=6 * 3600)
+votemode = Cache("votemode", 10000, ttl=3600)
+confirmer = Cache("confirmer", 10000, ttl=3600)
+
 HAPP = None
 _boot_ = time.time()
 
@@ -6,29 +6,89 @@ PROCESS = [
           ]
 afkdb = db.afk
 
+# user_id -> reason dict for everyone currently AFK, filled by load_afk_users
+afk_users = {}
+# lowercase username -> user_id, so @mentions of non-AFK users need no lookup
+afk_usernames = {}
+# AFK users whose record predates stored usernames
+afk_legacy = set()
+
+
+async def load_afk_users():
+    afk_users.clear()
+    afk_usernames.clear()
+    afk_legacy.clear()
+    async for user in iter_afk_users():
+        _remember(user["user_id"], user["reason"])
+
+
+def _remember(user_id: int, reason: dict):
+    afk_users[user_id] = reason
+    if not isinstance(reason, dict) or "username" not in reason:
+        afk_legacy.add(user_id)
+        return
+    username = reason["username"]
+    if username:
+        afk_usernames[username.lower()] = user_id
+
+
+def _forget(user_id: int):
+    reason = afk_users.pop(user_id, None)
+    afk_legacy.discard(user_id)
+    username = reason.get("username") if isinstance(reason, dict) else None
+    if username:
+        afk_usernames.pop(username.lower(), None)
+
+
+def afk_lookup(user_ids) -> dict:
+    """Return {user_id: reason} for the AFK users among `user_ids`."""
+    return {
+        user_id: afk_users[user_id] for user_id in user_ids if user_id in afk_users
+    }
+
+
+def afk_username_lookup(username: str):
+    """user_id of an AFK user by username, False if nobody AFK has it, or None
+    when some AFK record predates stored usernames and the caller must resolve it.
+    """
+    user_id = afk_usernames.get(username.lower())
+    if user_id:
+        return user_id
+    if afk_legacy:
+        return None
+    return False
+
 
 async def is_afk(user_id: int) -> bool:
-    user = await afkdb.find_one({"user_id": user_id})
-    if not user:
+    reason = afk_users.get(user_id)
+    if reason is None:
         return False, {}
-    return True, user["reason"]
+    return True, reason
 
 
 async def add_afk(user_id: int, mode):
+    _forget(user_id)
+    _remember(user_id, mode)
     await afkdb.update_one(
         {"user_id": user_id}, {"$set": {"reason": mode}}, upsert=True
     )
 
 async def remove_afk(user_id: int):
-    user = await afkdb.find_one({"user_id": user_id})
-    if user:
-        return await afkdb.delete_one({"user_id": user_id})
+    if user_id not in afk_users:
+        return
+    _forget(user_id)
+    return await afkdb.delete_one({"user_id": user_id})
+
+async def iter_afk_users():
+    async for user in afkdb.find(
+        {"user_id": {"$gt": 0}}, {"_id": 0, "user_id": 1, "reason": 1}
+    ):
+        yield user
+
+
+async def get_afk_count() -> int:
+    return await afkdb.count_documents({"user_id": {"$gt": 0}})
+
 
 async def get_afk_users() -> list:
-    users = afkdb.find({"user_id": {"$gt": 0}})
-    if not users:
-        return []
-    users_list = []
-    for user in await users.to_list(length=1000000000):
-        users_list.append(user)
-    return users_list
\ No newline at end of file
+    return [user async for user in iter_afk_users()]
\ No newline at end of file
@@ -27,10 +27,13 @@ async def get_couple(cid: int, date: str):
         return False
 
 async def save_couple(cid: int, date: str, couple: dict, img: str):
-    lovers = await _get_lovers(cid)
-    lovers[date] = couple
+    # Only the day's pair is kept; `img` is the file_id of its card.
     await coupledb.update_one(
         {"chat_id": cid},
-        {"$set": {"couple": lovers, "img": img}},
+        {"$set": {"couple": {date: couple}, "img": img}},
         upsert=True,
-                              )
+    )
+
+
+async def set_couple_image(cid: int, img: str):
+    await coupledb.update_one({"chat_id": cid}, {"$set": {"img": img}})
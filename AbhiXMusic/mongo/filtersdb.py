@@ -1,8 +1,37 @@
 # Owner @Tera_YaaaR_Hu
+from AbhiXMusic.core.cache import Cache
+from AbhiXMusic.utils.filter_matcher import FilterMatcher
 from AbhiXMusic.utils.mongo import db
 
 filters = db.filters["filters"] 
 
+# Shared by every chat without filters, which is most of them.
+NO_FILTERS = FilterMatcher({})
+
+async def _load_matcher(chat_id: int) -> FilterMatcher:
+   filter_data = await filters.find_one(
+      {
+         'chat_id': chat_id
+      }
+   )
+   payloads = {}
+   if filter_data is not None:
+      for filter_ in filter_data['filters']:
+         payloads[filter_['filter_name']] = (
+            filter_['content'],
+            filter_['text'],
+            filter_['data_type']
+         )
+   if not payloads:
+      return NO_FILTERS
+   return FilterMatcher(payloads)
+
+# chat_id -> FilterMatcher, dropped whenever the chat's filters change
+filter_cache = Cache("filters", 20000, loader=_load_matcher)
+
+async def get_filter_matcher(chat_id: int) -> FilterMatcher:
+   return await filter_cache.load(chat_id)
+
 async def add_filter_db(chat_id: int, filter_name: str, content: str, text: str, data_type: int):
    filter_data = await filters.find_one(
       {
@@ -11,10 +40,8 @@ async def add_filter_db(chat_id: int, filter_name: str, content: str, text: str,
    )
 
    if filter_data is None:
-      _id = await filters.count_documents({}) + 1
       await filters.insert_one(
          {
-            '_id': _id,
             'chat_id': chat_id,
             'filters': [
                {
@@ -28,7 +55,7 @@ async def add_filter_db(chat_id: int, filter_name: str, content: str, text: str,
       )
    
    else:
-         FILTERS_NAME = await get_filters_list(chat_id)
+         FILTERS_NAME = [filter_['filter_name'] for filter_ in filter_data['filters']]
          if filter_name not in FILTERS_NAME:
             await filters.update_one(
                {
@@ -61,6 +88,7 @@ async def add_filter_db(chat_id: int, filter_name: str, content: str, text: str,
                   }
                }
             )
+   filter_cache.pop(chat_id, None)
 
 async def stop_db(chat_id: int, filter_name:str):
    await filters.update_one(
@@ -75,6 +103,7 @@ async def stop_db(chat_id: int, filter_name:str):
          }
       }
    )
+   filter_cache.pop(chat_id, None)
 
 async def stop_all_db(chat_id: id):
    await filters.update_one(
@@ -88,37 +117,19 @@ async def stop_all_db(chat_id: id):
       },
       upsert=True
    )
+   filter_cache.pop(chat_id, None)
    
 async def get_filter(chat_id: int, filter_name: str):
-   filter_data = await filters.find_one(
-      {
-         'chat_id': chat_id
-      }
-   )
-   if filter_data is not None:
-      filters_ = filter_data['filters']
-      for filter_ in filters_:
-         if filter_['filter_name'] == filter_name:
-            content = filter_['content']
-            text = filter_['text']
-            data_type = filter_['data_type']
-            return (
-               filter_name,
-               content,
-               text,
-               data_type
-            )
+   matcher = await get_filter_matcher(chat_id)
+   if filter_name in matcher:
+      content, text, data_type = matcher.payloads[filter_name]
+      return (
+         filter_name,
+         content,
+         text,
+         data_type
+      )
 
 async def get_filters_list(chat_id: int):
-   filter_data = await filters.find_one(
-      {
-         'chat_id': chat_id
-      }
-   )
-   if filter_data is not None:
-      FILTERS_NAME = list()
-      for filter_name in filter_data['filters']:
-         FILTERS_NAME.append(filter_name['filter_name'])
-      return FILTERS_NAME
-   else:
-      return []
\ No newline at end of file
+   matcher = await get_filter_matcher(chat_id)
+   return matcher.names()
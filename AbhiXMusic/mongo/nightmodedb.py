@@ -1,4 +1,4 @@
-from typing import Dict, List, Union
+from typing import AsyncIterator, Dict, List, Union
 from config import MONGO_DB_URI
 from motor.motor_asyncio import AsyncIOMotorClient as MongoCli
 
@@ -14,6 +14,11 @@ async def nightmode_on(chat_id : int) :
 async def nightmode_off(chat_id : int):
     return nightdb.delete_one({"chat_id" : chat_id})
 
+async def iter_nightchats() -> AsyncIterator[int]:
+    async for chat in nightdb.find({"chat_id": {"$lt": 0}}, {"_id": 0, "chat_id": 1}):
+        yield int(chat["chat_id"])
+
+
 async def get_nightchats() -> list:
     chats = nightdb.find({"chat_id": {"$lt": 0}})
     if not chats:
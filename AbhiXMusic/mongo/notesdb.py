@@ -1,8 +1,44 @@
 # Owner @Tera_YaaaR_Hu
+from AbhiXMusic.core.cache import Cache
 from AbhiXMusic.utils.mongo import db
 
 notes = db.notes["notes"]
 
+NOTE_CACHE_SIZE = 5000
+# Notes whose content and text together are longer than this are indexed by
+# name only and fetched from Mongo when used.
+NOTE_PAYLOAD_LIMIT = 4096
+
+async def _load_note_index(chat_id) -> dict:
+    GetNoteData = await notes.find_one(
+        {
+            'chat_id': chat_id
+        }
+    )
+    index = {'notes': {}, 'admin': set(), 'private_note': False}
+    if GetNoteData is not None:
+        for note in GetNoteData.get('notes') or []:
+            payload = (
+                note['content'],
+                note['text'],
+                note['data_type']
+            )
+            size = len(str(note['content'] or '')) + len(str(note['text'] or ''))
+            index['notes'][note['note_name']] = (
+                payload if size <= NOTE_PAYLOAD_LIMIT else None
+            )
+            if '{admin}' in (note['text'] or ''):
+                index['admin'].add(note['note_name'])
+        index['private_note'] = GetNoteData.get('private_note', False)
+    return index
+
+# chat_id -> {'notes': {note_name: (content, text, data_type) or None if too
+# large}, 'admin': names using {admin}, 'private_note': bool}
+note_cache = Cache("notes", NOTE_CACHE_SIZE, loader=_load_note_index)
+
+async def _get_note_index(chat_id) -> dict:
+    return await note_cache.load(chat_id)
+
 async def SaveNote(chat_id, note_name, content, text, data_type):
     GetNotes = await notes.find_one(
         {
@@ -10,11 +46,9 @@ async def SaveNote(chat_id, note_name, content, text, data_type):
         }
     )
     
-    totalNote = await notes.count_documents({})
-    NotesIDs = totalNote + 1
+    NotesIDs = 1
     if GetNotes == None:
         NoteData = {
-            '_id': 1,
             'chat_id': chat_id,
             'notes': [
                 {   
@@ -43,7 +77,7 @@ async def SaveNote(chat_id, note_name, content, text, data_type):
                 NotesNamesList.append(note)
 
             if note_name in NotesNamesList:
-                await notes.update(
+                await notes.update_one(
                     {
                         'chat_id': chat_id,
                         'notes.note_name' : note_name 
@@ -55,9 +89,7 @@ async def SaveNote(chat_id, note_name, content, text, data_type):
                             'notes.$.text': text,
                             'notes.$.data_type': data_type
                             }
-                        },
-                        False,
-                        True
+                        }
                     )
         
             else:
@@ -97,71 +129,43 @@ async def SaveNote(chat_id, note_name, content, text, data_type):
                     }
                 }
             )
-async def GetNote(chat_id, note_name):
-    GetNoteData = await notes.find_one(
-        {
-            'chat_id': chat_id
-        }
-    )
-
-    if not GetNoteData == None:
-        Getnotes = GetNoteData['notes']
-        for note in Getnotes:
-            GetNote = note['note_name']
-            if GetNote == note_name:
-                content = note['content']
-                text = note['text']
-                data_type = note['data_type']
-                return (
-                    content,
-                    text,
-                    data_type
-                )
-    else:
-        return None 
+    note_cache.pop(chat_id, None)
 
-async def isNoteExist(chat_id, note_name) -> bool:
-    GetNoteData = await notes.find_one(
-        {
-                'chat_id': chat_id
+async def GetNote(chat_id, note_name):
+    index = await _get_note_index(chat_id)
+    payload = index['notes'].get(note_name)
+    if payload is None and note_name in index['notes']:
+        GetNoteData = await notes.find_one(
+            {
+                'chat_id': chat_id,
+                'notes.note_name': note_name
+            },
+            {
+                'notes.$': 1
             }
         )
-    if (
-        GetNoteData is not None
-        and 'notes' in GetNoteData
-    ):
-        gnotes = GetNoteData['notes']
-        notes_list = []
-        for Getnotes in gnotes:
-            n_name = Getnotes['note_name']
-            notes_list.append(n_name)
-        if note_name in notes_list: 
-            return True 
-        else:
-            return False
-    return False
+        if GetNoteData is None:
+            return None
+        note = GetNoteData['notes'][0]
+        payload = (
+            note['content'],
+            note['text'],
+            note['data_type']
+        )
+    return payload
+
+async def isNoteExist(chat_id, note_name) -> bool:
+    index = await _get_note_index(chat_id)
+    return note_name in index['notes']
 
 async def NoteList(chat_id) -> list:
     NotesNamesList = []
-    GetNoteData = await notes.find_one(
-        {
-            'chat_id': chat_id
-        }
-    )
-    if not GetNoteData == None:
-        if 'notes' in GetNoteData:
-            Getnotes = GetNoteData['notes']
-            for note in Getnotes:
-                NoteText = note['text']
-                NoteNames = note['note_name']
-                if '{admin}' in NoteText:
-                        NoteNames = NoteNames + ' ' + '__{admin}__'
-                NotesNamesList.append(NoteNames)
-            return NotesNamesList
-        else:
-            return NotesNamesList
-    else:
-        return NotesNamesList
+    index = await _get_note_index(chat_id)
+    for NoteNames in index['notes']:
+        if NoteNames in index['admin']:
+            NoteNames = NoteNames + ' ' + '__{admin}__'
+        NotesNamesList.append(NoteNames)
+    return NotesNamesList
 
 
 async def ClearNote(chat_id, note_name):
@@ -177,21 +181,11 @@ async def ClearNote(chat_id, note_name):
             }
         }
     )
+    note_cache.pop(chat_id, None)
 
 async def is_pnote_on(chat_id) -> bool:
-    GetNoteData = await notes.find_one(
-        {
-                'chat_id': chat_id
-            }
-        )
-    if not GetNoteData == None:
-        if 'private_note' in GetNoteData:
-            private_note = GetNoteData['private_note']
-            return private_note
-        else:
-            return False 
-    else: 
-        return False 
+    index = await _get_note_index(chat_id)
+    return index['private_note']
 
 async def ClearAllNotes(chat_id):
     await notes.update_one(
@@ -204,6 +198,7 @@ async def ClearAllNotes(chat_id):
             }
         }
     )
+    note_cache.pop(chat_id, None)
 
 async def set_private_note(chat_id, private_note):
     await notes.update_one(
@@ -216,4 +211,6 @@ async def set_private_note(chat_id, private_note):
             }
         },
         upsert=True
-                              )
+    )
+    note_cache.pop(chat_id, None)
+
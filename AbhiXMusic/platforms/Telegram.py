@@ -4,8 +4,8 @@ import os
 import time
 from typing import Union
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
-import config
 from AbhiXMusic import app
+from AbhiXMusic.misc import lyrical
 from AbhiXMusic.utils.formatters import (
     check_duration,
     convert_bytes,
@@ -166,10 +166,10 @@ class TeleAPI:
                 await mystic.edit_text(_["tg_3"])
 
         task = asyncio.create_task(down_load())
-        config.lyrical[mystic.id] = task
+        lyrical[mystic.id] = task
         await task
-        verify = config.lyrical.get(mystic.id)
+        verify = lyrical.get(mystic.id)
         if not verify:
             return False
-        config.lyrical.pop(mystic.id)
+        lyrical.pop(mystic.id)
         return True
@@ -1,11 +1,12 @@
 # Owner @Tera_YaaaR_Hu
-import asyncio
 from telegram import CallbackQuery
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from AbhiXMusic import YouTube, app
 from AbhiXMusic.core.call import Abhi
-from AbhiXMusic.misc import SUDOERS, db
+from AbhiXMusic.core.governor import LOW, send_priority
+from AbhiXMusic.core.cache import Cache
+from AbhiXMusic.misc import SUDOERS, confirmer, db, votemode
 from AbhiXMusic.utils.database import (
     get_active_chats,
     get_lang,
@@ -23,11 +24,13 @@ from pyrogram.errors import (
     UserAlreadyParticipant,
     UserNotParticipant,
 )
+from AbhiXMusic.utils.admincache import get_vc_admins
 from AbhiXMusic.utils.database import get_assistant
 from AbhiXMusic.utils.decorators.language import languageCB
 from AbhiXMusic.utils.formatters import seconds_to_min
 from AbhiXMusic.utils.inline import close_markup, stream_markup, stream_markup_timer
 from AbhiXMusic.utils.stream.autoclear import auto_clean
+from AbhiXMusic.utils.scheduler import scheduler
 from AbhiXMusic.utils.thumbnails import get_thumb
 from config import (
     BANNED_USERS,
@@ -35,14 +38,10 @@ from config import (
     STREAM_IMG_URL,
     TELEGRAM_AUDIO_URL,
     TELEGRAM_VIDEO_URL,
-    adminlist,
-    confirmer,
-    votemode,
 )
 from strings import get_string
 
-checker = {}
-upvoters = {}
+upvoters = Cache("upvoters", 10000, ttl=3600)
 
 
 
@@ -73,35 +72,23 @@ async def del_back_playlist(client, CallbackQuery, _):
         return await CallbackQuery.answer(_["general_5"], show_alert=True)
     mention = CallbackQuery.from_user.mention
     if command == "UpVote":
-        if chat_id not in votemode:
-            votemode[chat_id] = {}
-        if chat_id not in upvoters:
-            upvoters[chat_id] = {}
+        vote_key = (chat_id, CallbackQuery.message.id)
+        voters = upvoters.setdefault(vote_key, [])
+        vote = votemode.get(vote_key, 0)
 
-        voters = (upvoters[chat_id]).get(CallbackQuery.message.id)
-        if not voters:
-            upvoters[chat_id][CallbackQuery.message.id] = []
-
-        vote = (votemode[chat_id]).get(CallbackQuery.message.id)
-        if not vote:
-            votemode[chat_id][CallbackQuery.message.id] = 0
-
-        if CallbackQuery.from_user.id in upvoters[chat_id][CallbackQuery.message.id]:
-            (upvoters[chat_id][CallbackQuery.message.id]).remove(
-                CallbackQuery.from_user.id
-            )
-            votemode[chat_id][CallbackQuery.message.id] -= 1
+        if CallbackQuery.from_user.id in voters:
+            voters.remove(CallbackQuery.from_user.id)
+            vote -= 1
         else:
-            (upvoters[chat_id][CallbackQuery.message.id]).append(
-                CallbackQuery.from_user.id
-            )
-            votemode[chat_id][CallbackQuery.message.id] += 1
+            voters.append(CallbackQuery.from_user.id)
+            vote += 1
+        votemode[vote_key] = vote
         upvote = await get_upvote_count(chat_id)
-        get_upvotes = int(votemode[chat_id][CallbackQuery.message.id])
+        get_upvotes = int(vote)
         if get_upvotes >= upvote:
-            votemode[chat_id][CallbackQuery.message.id] = upvote
+            votemode[vote_key] = upvote
             try:
-                exists = confirmer[chat_id][CallbackQuery.message.id]
+                exists = confirmer[vote_key]
                 current = db[chat_id][0]
             except:
                 return await CallbackQuery.edit_message_text(f"ғᴀɪʟᴇᴅ.")
@@ -121,7 +108,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         else:
             if (
                 CallbackQuery.from_user.id
-                in upvoters[chat_id][CallbackQuery.message.id]
+                in voters
             ):
                 await CallbackQuery.answer(_["admin_38"], show_alert=True)
             else:
@@ -142,7 +129,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
         if not is_non_admin:
             if CallbackQuery.from_user.id not in SUDOERS:
-                admins = adminlist.get(CallbackQuery.message.chat.id)
+                admins = await get_vc_admins(CallbackQuery.message.chat.id)
                 if not admins:
                     return await CallbackQuery.answer(_["admin_13"], show_alert=True)
                 else:
@@ -370,47 +357,43 @@ async def del_back_playlist(client, CallbackQuery, _):
 
 
 async def markup_timer():
-    while not await asyncio.sleep(7):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
+    active_chats = await get_active_chats()
+    if not active_chats:
+        return False
+    for chat_id in active_chats:
+        try:
+            if not await is_music_playing(chat_id):
+                continue
+            playing = db.get(chat_id)
+            if not playing:
+                continue
+            duration_seconds = int(playing[0]["seconds"])
+            if duration_seconds == 0:
+                continue
             try:
-                if not await is_music_playing(chat_id):
-                    continue
-                playing = db.get(chat_id)
-                if not playing:
-                    continue
-                duration_seconds = int(playing[0]["seconds"])
-                if duration_seconds == 0:
-                    continue
-                try:
-                    mystic = playing[0]["mystic"]
-                except:
-                    continue
-                try:
-                    check = checker[chat_id][mystic.id]
-                    if check is False:
-                        continue
-                except:
-                    pass
-                try:
-                    language = await get_lang(chat_id)
-                    _ = get_string(language)
-                except:
-                    _ = get_string("en")
-                try:
-                    buttons = stream_markup_timer(
-                        _,
-                        chat_id,
-                        seconds_to_min(playing[0]["played"]),
-                        playing[0]["dur"],
-                    )
+                mystic = playing[0]["mystic"]
+            except:
+                continue
+            try:
+                language = await get_lang(chat_id)
+                _ = get_string(language)
+            except:
+                _ = get_string("en")
+            try:
+                buttons = stream_markup_timer(
+                    _,
+                    chat_id,
+                    seconds_to_min(playing[0]["played"]),
+                    playing[0]["dur"],
+                )
+                with send_priority(LOW):
                     await mystic.edit_reply_markup(
                         reply_markup=InlineKeyboardMarkup(buttons)
                     )
-                except:
-                    continue
             except:
                 continue
+        except:
+            continue
 
 
-asyncio.create_task(markup_timer())
+scheduler.every("markup_timer", 7, markup_timer, parks=True)
@@ -1,11 +1,8 @@
 # Owner @Tera_YaaaR_Hu
-import asyncio
-from pyrogram.enums import ChatType, ChatMemberStatus
 from AbhiXMusic import app
 from pyrogram import filters
 from AbhiXMusic.utils.Abhi_ban import admin_filter
-
-SPAM_CHATS = []
+from AbhiXMusic.utils.tagger import is_tagging, mention, stop_tagging, tag_members
 
 
 @app.on_message(filters.command(["mention", "all"]) & filters.group & admin_filter)
@@ -14,53 +11,26 @@ async def tag_all_users(_,message):
     if len(message.command) < 2 and not replied:
         await message.reply_text("**ʀᴇᴘʟʏ ᴛᴏ ᴀ ᴍᴇssᴀɢᴇ ᴏʀ ɢɪᴠᴇ sᴏᴍᴇ ᴛᴇxᴛ ᴛᴏ ᴛᴀɢ ᴀʟʟ**") 
         return                  
-    if replied:
-        SPAM_CHATS.append(message.chat.id)      
-        usernum= 0
-        usertxt = ""
-        async for m in app.get_chat_members(message.chat.id): 
-            if message.chat.id not in SPAM_CHATS:
-                break       
-            usernum += 5
-            usertxt += f"\n⊚ [{m.user.first_name}](tg://user?id={m.user.id})\n"
-            if usernum == 1:
-                await replied.reply_text(usertxt)
-                await asyncio.sleep(2)
-                usernum = 0
-                usertxt = ""
-        try :
-            SPAM_CHATS.remove(message.chat.id)
-        except Exception:
-            pass
-    else:
-        text = message.text.split(None, 1)[1]
-        
-        SPAM_CHATS.append(message.chat.id)
-        usernum= 0
-        usertxt = ""
-        async for m in app.get_chat_members(message.chat.id):       
-            if message.chat.id not in SPAM_CHATS:
-                break 
-            usernum += 1
-            usertxt += f"\n⊚ [{m.user.first_name}](tg://user?id={m.user.id})\n"
-            if usernum == 5:
-                await app.send_message(message.chat.id,f'{text}\n{usertxt}')
-                await asyncio.sleep(2)
-                usernum = 0
-                usertxt = ""                          
-        try :
-            SPAM_CHATS.remove(message.chat.id)
-        except Exception:
-            pass        
-           
+    if is_tagging(message.chat.id):
+        return await message.reply_text("**ᴀ ᴛᴀɢ ᴘʀᴏᴄᴇss ɪs ᴀʟʀᴇᴀᴅʏ ʀᴜɴɴɪɴɢ!**")
+    text = None if replied else message.text.split(None, 1)[1]
+
+    async def send(users):
+        usertxt = "".join(
+            f"\n⊚ {mention(user_id, name)}\n" for user_id, name in users
+        )
+        if replied:
+            await replied.reply_text(usertxt)
+        else:
+            await app.send_message(message.chat.id, f"{text}\n{usertxt}")
+
+    await tag_members(message.chat.id, send)
+
+
 @app.on_message(filters.command("alloff") & ~filters.private)
 async def cancelcmd(_, message):
     chat_id = message.chat.id
-    if chat_id in SPAM_CHATS:
-        try :
-            SPAM_CHATS.remove(chat_id)
-        except Exception:
-            pass   
+    if stop_tagging(chat_id):
         return await message.reply_text("**ᴛᴀɢ ᴀʟʟ sᴜᴄᴄᴇssғᴜʟʟʏ sᴛᴏᴘᴘᴇᴅ!**")     
                                      
     else :
@@ -5,10 +5,11 @@ from AbhiXMusic import app
 from AbhiXMusic.core.call import Abhi
 from AbhiXMusic.misc import SUDOERS, db
 from AbhiXMusic.utils import AdminRightsCheck
+from AbhiXMusic.utils.admincache import get_vc_admins
 from AbhiXMusic.utils.database import is_active_chat, is_nonadmin_chat
 from AbhiXMusic.utils.decorators.language import languageCB
 from AbhiXMusic.utils.inline import close_markup, speed_markup
-from config import BANNED_USERS, adminlist
+from config import BANNED_USERS
 
 checker = []
 
@@ -48,7 +49,7 @@ async def del_back_playlist(client, CallbackQuery, _):
     is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
     if not is_non_admin:
         if CallbackQuery.from_user.id not in SUDOERS:
-            admins = adminlist.get(CallbackQuery.message.chat.id)
+            admins = await get_vc_admins(CallbackQuery.message.chat.id)
             if not admins:
                 return await CallbackQuery.answer(_["admin_13"], show_alert=True)
             else:
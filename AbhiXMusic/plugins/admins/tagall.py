@@ -1,13 +1,13 @@
 # Owner @Tera_YaaaR_Hu
 from AbhiXMusic import app 
-import asyncio
 import random
 from pyrogram import Client, filters
-from pyrogram.enums import ChatType, ChatMemberStatus
-from pyrogram.errors import UserNotParticipant
+from pyrogram.enums import ChatMemberStatus, ChatType
 from pyrogram.types import ChatPermissions
+from AbhiXMusic.utils.admin_check import is_admin
+from AbhiXMusic.utils.roster import roster_add, roster_remove
+from AbhiXMusic.utils.tagger import is_tagging, mention, stop_tagging, tag_members
 
-spam_chats = []
 
 EMOJI = [ "🦋🦋🦋🦋🦋",
           "🧚🌸🧋🍬🫖",
@@ -145,18 +145,7 @@ async def mentionall(client, message):
     if message.chat.type == ChatType.PRIVATE:
         return await message.reply("𝐓𝐡𝐢𝐬 𝐂𝐨𝐦𝐦𝐚𝐧𝐝 𝐎𝐧𝐥𝐲 𝐅𝐨𝐫 𝐆𝐫𝐨𝐮𝐩𝐬.")
 
-    is_admin = False
-    try:
-        participant = await client.get_chat_member(chat_id, message.from_user.id)
-    except UserNotParticipant:
-        is_admin = False
-    else:
-        if participant.status in (
-            ChatMemberStatus.ADMINISTRATOR,
-            ChatMemberStatus.OWNER
-        ):
-            is_admin = True
-    if not is_admin:
+    if not await is_admin(message):
         return await message.reply("𝐘𝐨𝐮 𝐀𝐫𝐞 𝐍𝐨𝐭 𝐀𝐝𝐦𝐢𝐧 𝐁𝐚𝐛𝐲, 𝐎𝐧𝐥𝐲 𝐀𝐝𝐦𝐢𝐧𝐬 𝐂𝐚𝐧 . ")
 
     if message.reply_to_message and message.text:
@@ -171,53 +160,47 @@ async def mentionall(client, message):
             return await message.reply("/tagall  𝐓𝐲𝐩𝐞 𝐋𝐢𝐤𝐞 𝐓𝐡𝐢𝐬 / 𝐑𝐞𝐩𝐥𝐲 𝐀𝐧𝐲 𝐌𝐞𝐬𝐬𝐚𝐠𝐞 𝐍𝐞𝐱𝐭 𝐓𝐢𝐦𝐞 ...")
     else:
         return await message.reply("/tagall  𝐓𝐲𝐩𝐞 𝐋𝐢𝐤𝐞 𝐓𝐡𝐢𝐬 / 𝐑𝐞𝐩𝐥𝐲 𝐀𝐧𝐲 𝐌𝐞𝐬𝐬𝐚𝐠𝐞 𝐍𝐞𝐱𝐭 𝐓𝐢𝐦𝐞 ..")
-    if chat_id in spam_chats:
+    if is_tagging(chat_id):
         return await message.reply("𝐏𝐥𝐞𝐚𝐬𝐞 𝐀𝐭 𝐅𝐢𝐫𝐬𝐭 𝐒𝐭𝐨𝐩 𝐑𝐮𝐧𝐧𝐢𝐧𝐠 𝐏𝐫𝐨𝐜𝐞𝐬𝐬 ...")
-    spam_chats.append(chat_id)
-    usrnum = 0
-    usrtxt = ""
-    async for usr in client.get_chat_members(chat_id):
-        if not chat_id in spam_chats:
-            break
-        if usr.user.is_bot:
-            continue
-        usrnum += 1
-        usrtxt += f"[{usr.user.first_name}](tg://user?id={usr.user.id}) "
 
-        if usrnum == 1:
-            if mode == "text_on_cmd":
-                txt = f"{usrtxt} {random.choice(TAGMES)}"
-                await client.send_message(chat_id, txt)
-            elif mode == "text_on_reply":
-                await msg.reply(f"[{random.choice(EMOJI)}](tg://user?id={usr.user.id})")
-            await asyncio.sleep(4)
-            usrnum = 0
-            usrtxt = ""
-    try:
-        spam_chats.remove(chat_id)
-    except:
-        pass
+    async def send(users):
+        if mode == "text_on_cmd":
+            usrtxt = " ".join(mention(user_id, name) for user_id, name in users)
+            await client.send_message(chat_id, f"{usrtxt} {random.choice(TAGMES)}")
+        elif mode == "text_on_reply":
+            await msg.reply(
+                " ".join(
+                    f"[{random.choice(EMOJI)}](tg://user?id={user_id})"
+                    for user_id, _ in users
+                )
+            )
+
+    await tag_members(chat_id, send)
 
 @app.on_message(filters.command(["tagoff", "tagstop"]))
 async def cancel_spam(client, message):
-    if not message.chat.id in spam_chats:
+    if not is_tagging(message.chat.id):
         return await message.reply("𝐂𝐮𝐫𝐫𝐞𝐧𝐭𝐥𝐲 𝐈'𝐦 𝐍𝐨𝐭 ..")
-    is_admin = False
-    try:
-        participant = await client.get_chat_member(message.chat.id, message.from_user.id)
-    except UserNotParticipant:
-        is_admin = False
-    else:
-        if participant.status in (
-            ChatMemberStatus.ADMINISTRATOR,
-            ChatMemberStatus.OWNER
-        ):
-            is_admin = True
-    if not is_admin:
+    if not await is_admin(message):
         return await message.reply("𝐘𝐨𝐮 𝐀𝐫𝐞 𝐍𝐨𝐭 𝐀𝐝𝐦𝐢𝐧 𝐁𝐚𝐛𝐲, 𝐎𝐧𝐥𝐲 𝐀𝐝𝐦𝐢𝐧𝐬 𝐂𝐚𝐧 𝐓𝐚𝐠 𝐌𝐞𝐦𝐛𝐞𝐫𝐬.")
     else:
-        try:
-            spam_chats.remove(message.chat.id)
-        except:
-            pass
-        return await message.reply("♦STOP♦")
\ No newline at end of file
+        stop_tagging(message.chat.id)
+        return await message.reply("♦STOP♦")
+
+@app.on_message(filters.new_chat_members | filters.left_chat_member, group=8)
+async def roster_watcher(client, message):
+    for user in message.new_chat_members or []:
+        roster_add(message.chat.id, user)
+    if message.left_chat_member:
+        roster_remove(message.chat.id, message.left_chat_member.id)
+
+
+@app.on_chat_member_updated(filters.group, group=-5)
+async def roster_member_watcher(client, update):
+    if update.new_chat_member and update.new_chat_member.status not in (
+        ChatMemberStatus.LEFT,
+        ChatMemberStatus.BANNED,
+    ):
+        roster_add(update.chat.id, update.new_chat_member.user)
+    elif update.old_chat_member:
+        roster_remove(update.chat.id, update.old_chat_member.user.id)
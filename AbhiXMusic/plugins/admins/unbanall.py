@@ -4,25 +4,44 @@ from config import OWNER_ID
 from pyrogram import filters, enums
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from AbhiXMusic.utils.Abhi_ban import admin_filter
+from AbhiXMusic.utils.fanout import register, start_job
 
 BOT_ID = "6824607634"
 
+async def banned_members_source(params, after):
+    # Unbanning shifts Telegram's member offsets, so list everyone up front.
+    # A resumed job lists again; users unbanned before the restart are gone.
+    banned_users = []
+    async for m in app.get_chat_members(
+        params["chat_id"], filter=enums.ChatMembersFilter.BANNED
+    ):
+        banned_users.append(m.user.id)
+    for user_id in banned_users:
+        yield user_id
+
+
+async def unban_action(user_id, params):
+    await app.unban_chat_member(params["chat_id"], user_id)
+
+
+async def unban_finish(doc):
+    await app.send_message(
+        doc["chat_id"],
+        f"ᴜɴʙᴀɴɴᴇᴅ {doc['counts']['done']} ᴜsᴇʀs ɪɴ ᴛʜɪs ɢʀᴏᴜᴘ.",
+    )
+
+
+register("unbanall", banned_members_source, unban_action, unban_finish)
+
+
 @app.on_message(filters.command("unbanall") & admin_filter)
 async def unban_all(_, msg):
     chat_id = msg.chat.id
-    x = 0
     bot = await app.get_chat_member(chat_id, BOT_ID)
     bot_permission = bot.privileges.can_restrict_members == True
     if bot_permission:
-        banned_users = []
-        async for m in app.get_chat_members(chat_id, filter=enums.ChatMembersFilter.BANNED):
-            banned_users.append(m.user.id)
-            try:
-                await app.unban_chat_member(chat_id, banned_users[x])
-                print(f"ᴜɴʙᴀɴɪɴɢ ᴀʟʟ ᴍᴄ ɪɴ ᴛʜɪs ɢʀᴏᴜᴘ {m.user.mention}")
-                x += 1
-            except Exception:
-                pass
+        mystic = await msg.reply_text("» ᴜɴʙᴀɴɴɪɴɢ ᴀʟʟ ᴍᴇᴍʙᴇʀs...")
+        await start_job("unbanall", {"chat_id": chat_id}, chat_id, mystic.id)
     else:
         await msg.reply_text("ᴇɪᴛʜᴇʀ ɪ ᴅᴏɴ'ᴛ ʜᴀᴠᴇ ᴛʜᴇ ʀɪɢʜᴛ ᴛᴏ ʀᴇsᴛʀɪᴄᴛ ᴜsᴇʀs ᴏʀ ʏᴏᴜ ᴀʀᴇ ɴᴏᴛ ɪɴ sᴜᴅᴏ ᴜsᴇʀs")
 
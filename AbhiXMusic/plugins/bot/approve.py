@@ -1,63 +1,15 @@
 # Owner @Tera_YaaaR_Hu
 from AbhiXMusic import app
+from AbhiXMusic.utils.cards import userinfo_card
+from AbhiXMusic.utils.photos import get_profile_photo
+import os
 from os import environ
 from config import BOT_USERNAME
 import config
 from pyrogram import Client, filters
 from pyrogram.types import ChatJoinRequest, InlineKeyboardButton, InlineKeyboardMarkup
-from PIL import Image, ImageDraw, ImageFont
 from typing import Union, Optional
 
-# --------------------------------------------------------------------------------- #
-
-get_font = lambda font_size, font_path: ImageFont.truetype(font_path, font_size)
-resize_text = (
-    lambda text_size, text: (text[:text_size] + "...").upper()
-    if len(text) > text_size
-    else text.upper()
-)
-
-# --------------------------------------------------------------------------------- #
-
-async def get_userinfo_img(
-    bg_path: str,
-    font_path: str,
-    user_id: Union[int, str],    
-    profile_path: Optional[str] = None
-):
-    bg = Image.open(bg_path)
-
-    if profile_path:
-        img = Image.open(profile_path)
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.pieslice([(0, 0), img.size], 0, 360, fill=255)
-
-        circular_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        circular_img.paste(img, (0, 0), mask)
-        resized = circular_img.resize((400, 400))
-        bg.paste(resized, (440, 160), resized)
-
-    img_draw = ImageDraw.Draw(bg)
-
-    img_draw.text(
-        (529, 627),
-        text=str(user_id).upper(),
-        font=get_font(46, font_path),
-        fill=(255, 255, 255),
-    )
-
-    path = f"./userinfo_img_{user_id}.png"
-    bg.save(path)
-    return path
-
-# --------------------------------------------------------------------------------- #
-
-bg_path = "AbhiXMusic/assets/userinfo.png"
-font_path = "AbhiXMusic/assets/hiroko.ttf"
-
-# --------------------------------------------------------------------------------- #
-
 # Extract environment variables or provide default values
 chat_id_env = environ.get("CHAT_ID")
 CHAT_ID = [int(app) for app in chat_id_env.split(",")] if chat_id_env else []
@@ -80,16 +32,13 @@ async def autoapprove(client: app, message: ChatJoinRequest):
     user = message.from_user  # User
 
     # Check if user has a profile photo
-    photo = None
-    if user.photo:
-        photo = await app.download_media(user.photo.big_file_id)
+    photo = await get_profile_photo(user.photo)
 
     # Fix the indentation here
-    welcome_photo = await get_userinfo_img(
-        bg_path=bg_path,
-        font_path=font_path,
+    welcome_photo = await userinfo_card(
         user_id=user.id,
         profile_path=photo,
+        chat_id=chat.id,
     )
 
     print(f"{user.first_name} Joined 🤝")  # Logs
@@ -111,3 +60,4 @@ async def autoapprove(client: app, message: ChatJoinRequest):
             ),
     )
     
+    os.remove(welcome_photo)
@@ -1,26 +1,75 @@
 # Owner @Tera_YaaaR_Hu
 from pyrogram import Client, filters
+from pyrogram.enums import ChatMemberStatus
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, Message
 from pyrogram.errors import ChatAdminRequired, UserNotParticipant, ChatWriteForbidden
 from AbhiXMusic import app
+from AbhiXMusic.core.cache import Cache
+from AbhiXMusic.utils.chatinfo import get_chat_info
 
 #--------------------------
 
 MUST_JOIN = "ITSZAbhi"
 #------------------------
+
+# Members rarely leave, so they are trusted for longer than non-members, who
+# should get through soon after joining even if the join update is missed.
+MEMBER_TTL = 6 * 3600
+NON_MEMBER_TTL = 60
+MEMBER_CACHE_SIZE = 50000
+
+
+async def _check_member(user_id: int):
+    """True or False, or None when membership cannot be checked."""
+    try:
+        await app.get_chat_member(MUST_JOIN, user_id)
+    except UserNotParticipant:
+        return False
+    except ChatAdminRequired:
+        print(f"๏ᴘʀᴏᴍᴏᴛᴇ ᴍᴇ ᴀs ᴀɴ ᴀᴅᴍɪɴ ɪɴ ᴛʜᴇ ᴍᴜsᴛ_Jᴏɪɴ ᴄʜᴀᴛ ๏: {MUST_JOIN} !")
+        return None
+    return True
+
+
+def _member_ttl(joined) -> int:
+    return MEMBER_TTL if joined else NON_MEMBER_TTL
+
+
+# user_id -> is member
+members = Cache(
+    "must_join", MEMBER_CACHE_SIZE, ttl=_member_ttl, loader=_check_member
+)
+
+
+async def is_member(user_id: int) -> bool:
+    # Nothing can be checked until the bot is promoted; let users through.
+    return await members.load(user_id) is not False
+
+
+@app.on_chat_member_updated(filters.chat(MUST_JOIN), group=-6)
+async def must_join_watcher(app: Client, update):
+    member = update.new_chat_member or update.old_chat_member
+    if not member or not member.user:
+        return
+    if update.new_chat_member and update.new_chat_member.status not in (
+        ChatMemberStatus.LEFT,
+        ChatMemberStatus.BANNED,
+    ):
+        members[member.user.id] = True
+    else:
+        members.pop(member.user.id, None)
+
+
 @app.on_message(filters.incoming & filters.private, group=-1)
 async def must_join_channel(app: Client, msg: Message):
-    if not MUST_JOIN:
+    if not MUST_JOIN or not msg.from_user:
         return
     try:
-        try:
-            await app.get_chat_member(MUST_JOIN, msg.from_user.id)
-        except UserNotParticipant:
+        if not await is_member(msg.from_user.id):
             if MUST_JOIN.isalpha():
                 link = "https://t.me/" + MUST_JOIN
             else:
-                chat_info = await app.get_chat(MUST_JOIN)
-                link = chat_info.invite_link
+                link = (await get_chat_info(MUST_JOIN))["invite_link"]
             try:
                 await msg.reply_photo(
                     photo="https://telegra.ph/file/d24262661dda3f1832290.jpg", caption=f"๏ ᴀᴄᴄᴏʀᴅɪɴɢ ᴛᴏ ᴍʏ ᴅᴀᴛᴀʙᴀsᴇ ʏᴏᴜ'ᴠᴇ ɴᴏᴛ ᴊᴏɪɴᴇᴅ [๏sᴜᴘᴘᴏʀᴛ๏]({link}) ʏᴇᴛ, ɪғ ʏᴏᴜ ᴡᴀɴᴛ ᴛᴏ ᴜsᴇ ᴍᴇ ᴛʜᴇɴ ᴊᴏɪɴ [๏sᴜᴘᴘᴏʀᴛ๏]({link}) ᴀɴᴅ sᴛᴀʀᴛ ᴍᴇ ᴀɢᴀɪɴ ! ",
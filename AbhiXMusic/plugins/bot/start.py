@@ -16,8 +16,8 @@ from AbhiXMusic.utils.database import (
     add_served_user,
     blacklisted_chats,
     get_lang,
-    get_served_chats,
-    get_served_users,
+    get_served_chats_count,
+    get_served_users_count,
     is_banned_user,
     is_on_off,
 )
@@ -110,8 +110,8 @@ async def start_pm(client, message: Message, _):
                 )
     else:
         out = private_panel(_)
-        served_chats = len(await get_served_chats())
-        served_users = len(await get_served_users())
+        served_chats = await get_served_chats_count()
+        served_users = await get_served_users_count()
         UP, CPU, RAM, DISK = await bot_sys_stats()
         await message.reply_photo(
             random.choice(SHASHANK_IMG),
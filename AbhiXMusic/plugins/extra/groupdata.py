@@ -5,12 +5,13 @@ from asyncio import sleep
 from pyrogram import Client, filters
 from pyrogram import enums, filters
 from AbhiXMusic import app
+from AbhiXMusic.utils.chatinfo import get_member_count
 
 @app.on_message(~filters.private & filters.command(["groupdata"]), group=2)
 async def instatus(app, message):
     start_time = time.perf_counter()
     user = await app.get_chat_member(message.chat.id, message.from_user.id)
-    count = await app.get_chat_members_count(message.chat.id)
+    count = await get_member_count(message.chat.id)
     if user.status in (
         enums.ChatMemberStatus.ADMINISTRATOR,
         enums.ChatMemberStatus.OWNER,
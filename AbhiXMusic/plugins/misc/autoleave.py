@@ -1,78 +1,92 @@
 # Owner @Tera_YaaaR_Hu
-import asyncio
 from datetime import datetime
-from pyrogram.enums import ChatType
+
+from pyrogram.errors import (
+    ChannelInvalid,
+    ChannelPrivate,
+    PeerIdInvalid,
+    UserNotParticipant,
+)
+
 import config
 from AbhiXMusic import app
 from AbhiXMusic.core.call import Abhi, autoend
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.assistantchats import (
+    forget_assistant_chat,
+    idle_assistant_chats,
+    seed_assistant_chats,
+    touch_assistant_chat,
+)
 from AbhiXMusic.utils.database import get_client, is_active_chat, is_autoend
+from AbhiXMusic.utils.scheduler import scheduler
+
+
+# Chats the assistants never leave.
+KEEP_CHATS = [config.LOGGER_ID, -1002006121442, -1001939309491]
 
 
 async def auto_leave():
-    if config.AUTO_LEAVING_ASSISTANT == str(True):
-        while not await asyncio.sleep(
-            config.AUTO_LEAVE_ASSISTANT_TIME
-        ):
-            from AbhiXMusic.core.userbot import assistants
+    from AbhiXMusic.core.userbot import assistants
 
-            for num in assistants:
-                client = await get_client(num)
-                left = 0
-                try:
-                    async for i in client.iter_dialogs():
-                        chat_type = i.chat.type
-                        if chat_type in [
-                            "supergroup",
-                            "group",
-                            "channel",
-                        ]:
-                            chat_id = i.chat.id
-                            if (
-                                chat_id != config.LOGGER_ID
-                                and i.chat.id != -1002006121442
-                                and i.chat.id != -1001939309491
-                            ):
-                                if left == 20:
-                                    continue
-                                if not await is_active_chat(chat_id):
-                                    try:
-                                        await client.leave_chat(
-                                            chat_id
-                                        )
-                                        left += 1
-                                    except:
-                                        continue
-                except:
-                    pass
+    # The assistants are only started after the plugins load.
+    await seed_assistant_chats({num: await get_client(num) for num in assistants})
+    for num in assistants:
+        client = await get_client(num)
+        candidates = []
+        for chat_id in idle_assistant_chats(num, config.AUTO_LEAVE_ASSISTANT_TIME):
+            if len(candidates) == 20:
+                break
+            if chat_id in KEEP_CHATS or await is_active_chat(chat_id):
+                continue
+            candidates.append(chat_id)
+        for chat_id in candidates:
+            try:
+                await client.leave_chat(chat_id)
+            except (UserNotParticipant, ChannelPrivate, PeerIdInvalid, ChannelInvalid):
+                # Already gone, kicked or the chat no longer exists.
+                pass
+            except Exception as e:
+                LOGGER(__name__).warning(
+                    f"Assistant {num} could not leave {chat_id}: {e}"
+                )
+                # Retried next round, behind the chats that have not failed.
+                touch_assistant_chat(num, chat_id)
+                continue
+            await forget_assistant_chat(num, chat_id)
 
 
-asyncio.create_task(auto_leave())
+if config.AUTO_LEAVING_ASSISTANT == str(True):
+    scheduler.every(
+        "auto_leave", config.AUTO_LEAVE_ASSISTANT_TIME, auto_leave, jitter=60
+    )
 
 
 async def auto_end():
-    while not await asyncio.sleep(5):
-        if not await is_autoend():
+    if not any(autoend.values()):
+        return False
+    if not await is_autoend():
+        return
+    for chat_id in list(autoend):
+        timer = autoend.get(chat_id)
+        if not timer:
             continue
-        for chat_id in autoend:
-            timer = autoend.get(chat_id)
-            if not timer:
-                continue
-            if datetime.now() > timer:
-                if not await is_active_chat(chat_id):
-                    autoend[chat_id] = {}
-                    continue
+        if datetime.now() > timer:
+            if not await is_active_chat(chat_id):
                 autoend[chat_id] = {}
-                try:
-                    await Abhi.stop_stream(chat_id)
-                except:
-                    continue
-                try:
-                    await app.send_message(
-                        chat_id,
-                        "» ʙᴏᴛ ᴀᴜᴛᴏᴍᴀᴛɪᴄᴀʟʟʏ ʟᴇғᴛ ᴠɪᴅᴇᴏᴄʜᴀᴛ ʙᴇᴄᴀᴜsᴇ ɴᴏ ᴏɴᴇ ᴡᴀs ʟɪsᴛᴇɴɪɴɢ ᴏɴ ᴠɪᴅᴇᴏᴄʜᴀᴛ.",
-                    )
-                except:
-                    continue
+                continue
+            autoend[chat_id] = {}
+            try:
+                await Abhi.stop_stream(chat_id)
+            except:
+                continue
+            try:
+                await app.send_message(
+                    chat_id,
+                    "» ʙᴏᴛ ᴀᴜᴛᴏᴍᴀᴛɪᴄᴀʟʟʏ ʟᴇғᴛ ᴠɪᴅᴇᴏᴄʜᴀᴛ ʙᴇᴄᴀᴜsᴇ ɴᴏ ᴏɴᴇ ᴡᴀs ʟɪsᴛᴇɴɪɴɢ ᴏɴ ᴠɪᴅᴇᴏᴄʜᴀᴛ.",
+                )
+            except:
+                continue
 
 
-asyncio.create_task(auto_end())
+scheduler.every("auto_end", 5, auto_end, parks=True)
@@ -1,28 +1,65 @@
 # Owner @Tera_YaaaR_Hu
 import asyncio
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.errors import FloodWait
 from AbhiXMusic import app
 from AbhiXMusic.misc import SUDOERS
 from AbhiXMusic.utils.database import (
-    get_active_chats,
-    get_authuser_names,
     get_client,
-    get_served_chats,
-    get_served_users,
+    get_lang,
+    get_served_chats_count,
+    get_served_users_count,
+    iter_served_chats,
+    iter_served_users,
 )
 from AbhiXMusic.utils.decorators.language import language
-from AbhiXMusic.utils.formatters import alpha_to_int
-from config import adminlist
+from AbhiXMusic.utils.fanout import register, start_job
+from strings import get_string
 
-IS_BROADCASTING = False
+
+async def broadcast_source(params, after):
+    if params["users"]:
+        async for user_id in iter_served_users(after):
+            yield user_id
+    else:
+        async for chat_id in iter_served_chats(after):
+            yield chat_id
+
+
+async def broadcast_action(chat_id, params):
+    if params["message_id"]:
+        m = await app.forward_messages(
+            chat_id, params["from_chat"], params["message_id"]
+        )
+    else:
+        m = await app.send_message(chat_id, text=params["text"])
+    if params["pin"]:
+        try:
+            await m.pin(disable_notification=params["pin"] != "loud")
+            return "pinned"
+        except:
+            pass
+
+
+async def broadcast_finish(doc):
+    params = doc["params"]
+    _ = get_string(params["lang"])
+    counts = doc["counts"]
+    if params["users"]:
+        text = _["broad_4"].format(counts["done"])
+    else:
+        text = _["broad_3"].format(counts["done"], counts.get("pinned", 0))
+    await app.send_message(doc["chat_id"], text)
+
+
+register("broadcast", broadcast_source, broadcast_action, broadcast_finish)
 
 
 @app.on_message(filters.command("broadcast") & SUDOERS)
 @language
 async def braodcast_message(client, message, _):
-    global IS_BROADCASTING
+    x = y = None
+    query = None
     if message.reply_to_message:
         x = message.reply_to_message.id
         y = message.chat.id
@@ -43,75 +80,40 @@ async def braodcast_message(client, message, _):
         if query == "":
             return await message.reply_text(_["broad_8"])
 
-    IS_BROADCASTING = True
     await message.reply_text(_["broad_1"])
+    if "-pinloud" in message.text:
+        pin = "loud"
+    elif "-pin" in message.text:
+        pin = "silent"
+    else:
+        pin = None
+    params = {
+        "from_chat": y,
+        "message_id": x,
+        "text": query,
+        "pin": pin,
+        "lang": await get_lang(message.chat.id),
+    }
 
     if "-nobot" not in message.text:
-        sent = 0
-        pin = 0
-        chats = []
-        schats = await get_served_chats()
-        for chat in schats:
-            chats.append(int(chat["chat_id"]))
-        for i in chats:
-            try:
-                m = (
-                    await app.forward_messages(i, y, x)
-                    if message.reply_to_message
-                    else await app.send_message(i, text=query)
-                )
-                if "-pin" in message.text:
-                    try:
-                        await m.pin(disable_notification=True)
-                        pin += 1
-                    except:
-                        continue
-                elif "-pinloud" in message.text:
-                    try:
-                        await m.pin(disable_notification=False)
-                        pin += 1
-                    except:
-                        continue
-                sent += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                continue
-        try:
-            await message.reply_text(_["broad_3"].format(sent, pin))
-        except:
-            pass
+        mystic = await message.reply_text("» sᴛᴀʀᴛɪɴɢ ʙʀᴏᴀᴅᴄᴀsᴛ ᴛᴏ ᴄʜᴀᴛs...")
+        await start_job(
+            "broadcast",
+            {**params, "users": False},
+            message.chat.id,
+            mystic.id,
+            await get_served_chats_count(),
+        )
 
     if "-user" in message.text:
-        susr = 0
-        served_users = []
-        susers = await get_served_users()
-        for user in susers:
-            served_users.append(int(user["user_id"]))
-        for i in served_users:
-            try:
-                m = (
-                    await app.forward_messages(i, y, x)
-                    if message.reply_to_message
-                    else await app.send_message(i, text=query)
-                )
-                susr += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                pass
-        try:
-            await message.reply_text(_["broad_4"].format(susr))
-        except:
-            pass
+        mystic = await message.reply_text("» sᴛᴀʀᴛɪɴɢ ʙʀᴏᴀᴅᴄᴀsᴛ ᴛᴏ ᴜsᴇʀs...")
+        await start_job(
+            "broadcast",
+            {**params, "users": True, "pin": None},
+            message.chat.id,
+            mystic.id,
+            await get_served_users_count(),
+        )
 
     if "-assistant" in message.text:
         aw = await message.reply_text(_["broad_5"])
@@ -142,27 +144,4 @@ async def braodcast_message(client, message, _):
             await aw.edit_text(text)
         except:
             pass
-    IS_BROADCASTING = False
-
-
-async def auto_clean():
-    while not await asyncio.sleep(10):
-        try:
-            served_chats = await get_active_chats()
-            for chat_id in served_chats:
-                if chat_id not in adminlist:
-                    adminlist[chat_id] = []
-                    async for user in app.get_chat_members(
-                        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
-                    ):
-                        if user.privileges.can_manage_video_chats:
-                            adminlist[chat_id].append(user.user.id)
-                    authusers = await get_authuser_names(chat_id)
-                    for user in authusers:
-                        user_id = await alpha_to_int(user)
-                        adminlist[chat_id].append(user_id)
-        except:
-            continue
-
 
-asyncio.create_task(auto_clean())
@@ -1,13 +1,12 @@
 # Owner @Tera_YaaaR_Hu
-import re
 from AbhiXMusic import app
 from config import BOT_USERNAME
 from AbhiXMusic.utils.Abhi_ban import admin_filter
+from AbhiXMusic.utils.admincache import get_owner
 from AbhiXMusic.mongo.filtersdb import *
 from AbhiXMusic.utils.filters_func import GetFIlterMessage, get_text_reason, SendFilterMessage
 from AbhiXMusic.utils.shivdb import user_admin
 from pyrogram import filters
-from pyrogram.enums import ChatMemberStatus
 from pyrogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 
 @app.on_message(filters.command("filter") & admin_filter)
@@ -41,34 +40,25 @@ async def _filter(client, message):
 async def FilterCheckker(client, message):
     if not message.text:
         return
-    text = message.text
-    chat_id = message.chat.id
+    matcher = await get_filter_matcher(message.chat.id)
+    if len(matcher) == 0:
+        return
     if (
-        len(await get_filters_list(chat_id)) == 0
+        message.command
+        and message.command[0] == 'filter'
+        and len(message.command) >= 2
+        and message.command[1] in matcher
     ):
         return
 
-    ALL_FILTERS = await get_filters_list(chat_id)
-    for filter_ in ALL_FILTERS:
-        
-        if (
-            message.command
-            and message.command[0] == 'filter'
-            and len(message.command) >= 2
-            and message.command[1] ==  filter_
-        ):
-            return
-            
-        pattern = r"( |^|[^\w])" + re.escape(filter_) + r"( |$|[^\w])"
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            filter_name, content, text, data_type = await get_filter(chat_id, filter_)
-            await SendFilterMessage(
-                message=message,
-                filter_name=filter_,
-                content=content,
-                text=text,
-                data_type=data_type
-            )
+    for filter_, (content, text, data_type) in matcher.match(message.text):
+        await SendFilterMessage(
+            message=message,
+            filter_name=filter_,
+            content=content,
+            text=text,
+            data_type=data_type
+        )
 
 @app.on_message(filters.command('filters') & filters.group)
 async def _filters(client, message):
@@ -98,8 +88,7 @@ async def _filters(client, message):
 async def stopall(client, message):
     chat_id = message.chat.id
     chat_title = message.chat.title 
-    user = await client.get_chat_member(chat_id,message.from_user.id)
-    if not user.status == ChatMemberStatus.OWNER :
+    if await get_owner(chat_id) != message.from_user.id:
         return await message.reply_text("Only Owner Can Use This!!") 
 
     KEYBOARD = InlineKeyboardMarkup(
@@ -118,9 +107,7 @@ async def stopall_callback(client, callback_query: CallbackQuery):
     chat_id = callback_query.message.chat.id 
     query_data = callback_query.data.split('_')[1]  
 
-    user = await client.get_chat_member(chat_id, callback_query.from_user.id)
-
-    if not user.status == ChatMemberStatus.OWNER :
+    if await get_owner(chat_id) != callback_query.from_user.id:
         return await callback_query.answer("Only Owner Can Use This!!") 
     
     if query_data == 'stopall':
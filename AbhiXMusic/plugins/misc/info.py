@@ -1,9 +1,10 @@
 # Owner @Tera_YaaaR_Hu
 import asyncio, os, time, aiohttp
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
 from asyncio import sleep
 from AbhiXMusic import app
+from AbhiXMusic.utils.cards import userinfo_card
+from AbhiXMusic.utils.photos import get_profile_photo
 from pyrogram import filters, Client, enums
 from pyrogram.enums import ParseMode
 from pyrogram.types import *
@@ -18,58 +19,6 @@ random_photo = [
     "https://telegra.ph/file/2973150dd62fd27a3a6ba.jpg",
 ]
 
-# --------------------------------------------------------------------------------- #
-
-get_font = lambda font_size, font_path: ImageFont.truetype(font_path, font_size)
-resize_text = (
-    lambda text_size, text: (text[:text_size] + "...").upper()
-    if len(text) > text_size
-    else text.upper()
-)
-
-# --------------------------------------------------------------------------------- #
-
-async def get_userinfo_img(
-    bg_path: str,
-    font_path: str,
-    user_id: Union[int, str],    
-    profile_path: Optional[str] = None
-):
-    bg = Image.open(bg_path)
-
-    if profile_path:
-        img = Image.open(profile_path)
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.pieslice([(0, 0), img.size], 0, 360, fill=255)
-
-        circular_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        circular_img.paste(img, (0, 0), mask)
-        resized = circular_img.resize((400, 400))
-        bg.paste(resized, (440, 160), resized)
-
-    img_draw = ImageDraw.Draw(bg)
-
-    img_draw.text(
-        (529, 627),
-        text=str(user_id).upper(),
-        font=get_font(46, font_path),
-        fill=(255, 255, 255),
-    )
-
-
-    path = f"./userinfo_img_{user_id}.png"
-    bg.save(path)
-    return path
-   
-
-# --------------------------------------------------------------------------------- #
-
-bg_path = "AbhiXMusic/assets/userinfo.png"
-font_path = "AbhiXMusic/assets/hiroko.ttf"
-
-# --------------------------------------------------------------------------------- #
-
 
 INFO_TEXT = """**
 [ᯤ] 𝗨𝗦𝗘𝗥 𝗜𝗡𝗙𝗢𝗥𝗠𝗔𝗡𝗧𝗢𝗡 [ᯤ]
@@ -131,12 +80,11 @@ async def userinfo(_, message):
             
             if user.photo:
                 # User has a profile photo
-                photo = await app.download_media(user.photo.big_file_id)
-                welcome_photo = await get_userinfo_img(
-                    bg_path=bg_path,
-                    font_path=font_path,
+                photo = await get_profile_photo(user.photo)
+                welcome_photo = await userinfo_card(
                     user_id=user.id,
                     profile_path=photo,
+                    chat_id=chat_id,
                 )
             else:
                 # User doesn't have a profile photo, use random_photo directly
@@ -144,6 +92,8 @@ async def userinfo(_, message):
                 
             await app.send_photo(chat_id, photo=welcome_photo, caption=INFO_TEXT.format(
                 id, first_name, last_name, username, mention, status, dc_id, bio), reply_to_message_id=message.id)
+            if user.photo:
+                os.remove(welcome_photo)
         except Exception as e:
             await message.reply_text(str(e))        
       
@@ -162,12 +112,11 @@ async def userinfo(_, message):
             
             if user.photo:
                 # User has a profile photo
-                photo = await app.download_media(user.photo.big_file_id)
-                welcome_photo = await get_userinfo_img(
-                    bg_path=bg_path,
-                    font_path=font_path,
+                photo = await get_profile_photo(user.photo)
+                welcome_photo = await userinfo_card(
                     user_id=user.id,
                     profile_path=photo,
+                    chat_id=chat_id,
                 )
             else:
                 # User doesn't have a profile photo, use random_photo directly
@@ -175,6 +124,8 @@ async def userinfo(_, message):
                 
             await app.send_photo(chat_id, photo=welcome_photo, caption=INFO_TEXT.format(
                 id, first_name, last_name, username, mention, status, dc_id, bio), reply_to_message_id=message.id)
+            if user.photo:
+                os.remove(welcome_photo)
         except Exception as e:
             await message.reply_text(str(e))
 
@@ -194,12 +145,11 @@ async def userinfo(_, message):
             
             if user.photo:
                 # User has a profile photo
-                photo = await app.download_media(user.photo.big_file_id)
-                welcome_photo = await get_userinfo_img(
-                    bg_path=bg_path,
-                    font_path=font_path,
+                photo = await get_profile_photo(user.photo)
+                welcome_photo = await userinfo_card(
                     user_id=user.id,
                     profile_path=photo,
+                    chat_id=chat_id,
                 )
             else:
                 # User doesn't have a profile photo, use random_photo directly
@@ -207,6 +157,8 @@ async def userinfo(_, message):
                 
             await app.send_photo(chat_id, photo=welcome_photo, caption=INFO_TEXT.format(
                 id, first_name, last_name, username, mention, status, dc_id, bio), reply_to_message_id=message.id)
+            if user.photo:
+                os.remove(welcome_photo)
         except Exception as e:
             await message.reply_text(str(e))
                 
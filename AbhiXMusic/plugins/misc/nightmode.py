@@ -1,11 +1,24 @@
 # Owner @Tera_YaaaR_Hu
+import asyncio
 import random 
+import time
 from pyrogram import filters,Client,enums
+from pyrogram.errors import (
+    ChannelPrivate,
+    ChatAdminRequired,
+    ChatWriteForbidden,
+    FloodWait,
+    PeerIdInvalid,
+)
 from AbhiXMusic import app
+from AbhiXMusic.core.governor import NORMAL, send_priority
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.fanout import TokenBucket, Window
+from AbhiXMusic.utils.admincache import get_admins
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from AbhiXMusic.utils.scheduler import scheduler
 from pyrogram.types import ChatPermissions
-from AbhiXMusic.mongo.nightmodedb import nightdb,nightmode_on,nightmode_off,get_nightchats 
+from AbhiXMusic.mongo.nightmodedb import nightdb,nightmode_on,nightmode_off,iter_nightchats
 
 
 CLOSE_CHAT = ChatPermissions(
@@ -42,9 +55,7 @@ async def nightcb(_, query : CallbackQuery):
     chat_id = query.message.chat.id
     user_id = query.from_user.id
     check_night = await nightdb.find_one({"chat_id" : chat_id})
-    administrators = []
-    async for m in app.get_chat_members(chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS):
-        administrators.append(m.user.id)     
+    administrators = await get_admins(chat_id)
     if user_id in administrators:   
         if data == "add_night":
             if check_night:        
@@ -60,51 +71,100 @@ async def nightcb(_, query : CallbackQuery):
                 await query.message.edit_caption("**๏  ɴɪɢʜᴛᴍᴏᴅᴇ ɪs ᴀʟʀᴇᴀᴅʏ ᴅɪsᴀʙʟᴇᴅ  ɪɴ ᴛʜɪs ᴄʜᴀᴛ.**") 
             
       
-async def start_nightmode() :
-    chats = []
-    schats = await get_nightchats()
-    for chat in schats:
-        chats.append(int(chat["chat_id"]))
-    if len(chats) == 0:
-        return
-    for add_chat in chats:
-        try:
-            await app.send_photo(
-                add_chat,
-                photo="https://telegra.ph//file/06649d4d0bbf4285238ee.jpg",
-                caption= f"**ᴍᴀʏ ᴛʜᴇ ᴀɴɢᴇʟs ғʀᴏᴍ ʜᴇᴀᴠᴇɴ ʙʀɪɴɢ ᴛʜᴇ sᴡᴇᴇᴛᴇsᴛ ᴏғ ᴀʟʟ ᴅʀᴇᴀᴍs ғᴏʀ ʏᴏᴜ. ᴍᴀʏ ʏᴏᴜ ʜᴀᴠᴇ ʟᴏɴɢ ᴀɴᴅ ʙʟɪssғᴜʟ sʟᴇᴇᴘ ғᴜʟʟ ᴏғ ʜᴀᴘᴘʏ ᴅʀᴇᴀᴍs.\n\nɢʀᴏᴜᴘ ɪs ᴄʟᴏsɪɴɢ ɢᴏᴏᴅ ɴɪɢʜᴛ ᴇᴠᴇʀʏᴏɴᴇ  !**")
-            
-            await app.set_chat_permissions(add_chat,CLOSE_CHAT)
+CLOSE_PHOTO = "https://telegra.ph//file/06649d4d0bbf4285238ee.jpg"
+CLOSE_CAPTION = "**ᴍᴀʏ ᴛʜᴇ ᴀɴɢᴇʟs ғʀᴏᴍ ʜᴇᴀᴠᴇɴ ʙʀɪɴɢ ᴛʜᴇ sᴡᴇᴇᴛᴇsᴛ ᴏғ ᴀʟʟ ᴅʀᴇᴀᴍs ғᴏʀ ʏᴏᴜ. ᴍᴀʏ ʏᴏᴜ ʜᴀᴠᴇ ʟᴏɴɢ ᴀɴᴅ ʙʟɪssғᴜʟ sʟᴇᴇᴘ ғᴜʟʟ ᴏғ ʜᴀᴘᴘʏ ᴅʀᴇᴀᴍs.\n\nɢʀᴏᴜᴘ ɪs ᴄʟᴏsɪɴɢ ɢᴏᴏᴅ ɴɪɢʜᴛ ᴇᴠᴇʀʏᴏɴᴇ  !**"
+OPEN_PHOTO = "https://telegra.ph//file/14ec9c3ff42b59867040a.jpg"
+OPEN_CAPTION = "**ɢʀᴏᴜᴘ ɪs ᴏᴘᴇɴɪɴɢ ɢᴏᴏᴅ ᴍᴏʀɴɪɴɢ ᴇᴠᴇʀʏᴏɴᴇ !\n\nᴍᴀʏ ᴛʜɪs ᴅᴀʏ ᴄᴏᴍᴇ ᴡɪᴛʜ ᴀʟʟ ᴛʜᴇ ʟᴏᴠᴇ ʏᴏᴜʀ ʜᴇᴀʀᴛ ᴄᴀɴ ʜᴏʟᴅ ᴀɴᴅ ʙʀɪɴɢ ʏᴏᴜ ᴇᴠᴇʀʏ sᴜᴄᴄᴇss ʏᴏᴜ ᴅᴇsɪʀᴇ. Mᴀʏ ᴇᴀᴄʜ ᴏғ ʏᴏᴜʀ ғᴏᴏᴛsᴛᴇᴘs ʙʀɪɴɢ Jᴏʏ ᴛᴏ ᴛʜᴇ ᴇᴀʀᴛʜ ᴀɴᴅ ʏᴏᴜʀsᴇʟғ. ɪ ᴡɪsʜ ʏᴏᴜ ᴀ ᴍᴀɢɪᴄᴀʟ ᴅᴀʏ ᴀɴᴅ ᴀ ᴡᴏɴᴅᴇʀғᴜʟ ʟɪғᴇ ᴀʜᴇᴀᴅ.**"
+
+NIGHT_WORKERS = 20
+# API calls a second. Each chat costs two, so about 7 chats a second, which
+# leaves half of the bot's ~30 a second for everything else.
+NIGHT_RATE = 15
+NIGHT_RETRIES = 3
+# Chats started but not finished.
+NIGHT_WINDOW = 400
+
+# "close"/"open" -> metrics of the last run
+night_runs = {}
 
+
+async def _night_step(chat_id, call, bucket, workers):
+    for attempt in range(NIGHT_RETRIES):
+        try:
+            async with workers:
+                await bucket.acquire()
+                with send_priority(NORMAL):
+                    await call()
+            return True
+        except FloodWait as e:
+            await asyncio.sleep(int(e.value))
+        except (ChatAdminRequired, ChannelPrivate, ChatWriteForbidden, PeerIdInvalid) as e:
+            print(f"[bold red] Unable To update Group {chat_id} - {e}")
+            return False
         except Exception as e:
-            print(f"[bold red] Unable To close Group {add_chat} - {e}")
+            if attempt == NIGHT_RETRIES - 1:
+                print(f"[bold red] Unable To update Group {chat_id} - {e}")
+                return False
+            await asyncio.sleep(2 ** attempt)
+    return False
 
-scheduler = AsyncIOScheduler(timezone="Asia/Kolkata")
-scheduler.add_job(start_nightmode, trigger="cron", hour=23, minute=59)
-scheduler.start()
 
-async def close_nightmode():
-    chats = []
-    schats = await get_nightchats()
-    for chat in schats:
-        chats.append(int(chat["chat_id"]))
-    if len(chats) == 0:
+async def _night_chat(chat_id, permissions, photo, caption, bucket, workers):
+    # Each step is retried on its own, so a failed announcement never sets
+    # the permissions a second time. Permissions first: they are what has to
+    # happen on time.
+    steps = (
+        lambda: app.set_chat_permissions(chat_id, permissions),
+        lambda: app.send_photo(chat_id, photo=photo, caption=caption),
+    )
+    for step in steps:
+        if not await _night_step(chat_id, step, bucket, workers):
+            return False
+    return True
+
+
+async def run_nightmode(name, permissions, photo, caption):
+    chats = [chat_id async for chat_id in iter_nightchats()]
+    if not chats:
         return
-    for rm_chat in chats:
-        try:
-            await app.send_photo(
-                rm_chat,
-                photo="https://telegra.ph//file/14ec9c3ff42b59867040a.jpg",
-                caption= f"**ɢʀᴏᴜᴘ ɪs ᴏᴘᴇɴɪɴɢ ɢᴏᴏᴅ ᴍᴏʀɴɪɴɢ ᴇᴠᴇʀʏᴏɴᴇ !\n\nᴍᴀʏ ᴛʜɪs ᴅᴀʏ ᴄᴏᴍᴇ ᴡɪᴛʜ ᴀʟʟ ᴛʜᴇ ʟᴏᴠᴇ ʏᴏᴜʀ ʜᴇᴀʀᴛ ᴄᴀɴ ʜᴏʟᴅ ᴀɴᴅ ʙʀɪɴɢ ʏᴏᴜ ᴇᴠᴇʀʏ sᴜᴄᴄᴇss ʏᴏᴜ ᴅᴇsɪʀᴇ. Mᴀʏ ᴇᴀᴄʜ ᴏғ ʏᴏᴜʀ ғᴏᴏᴛsᴛᴇᴘs ʙʀɪɴɢ Jᴏʏ ᴛᴏ ᴛʜᴇ ᴇᴀʀᴛʜ ᴀɴᴅ ʏᴏᴜʀsᴇʟғ. ɪ ᴡɪsʜ ʏᴏᴜ ᴀ ᴍᴀɢɪᴄᴀʟ ᴅᴀʏ ᴀɴᴅ ᴀ ᴡᴏɴᴅᴇʀғᴜʟ ʟɪғᴇ ᴀʜᴇᴀᴅ.**")
-            
-            await app.set_chat_permissions(rm_chat,OPEN_CHAT)
+    started = time.monotonic()
+    bucket = TokenBucket(NIGHT_RATE)
+    workers = asyncio.Semaphore(NIGHT_WORKERS)
+    window = Window(NIGHT_WINDOW)
+    # Seconds from the start of the run until each chat was done.
+    latencies = []
 
-        except Exception as e:
-            print(f"[bold red] Unable To open Group {rm_chat} - {e}")
+    async def worker(chat_id):
+        ok = await _night_chat(chat_id, permissions, photo, caption, bucket, workers)
+        latencies.append(time.monotonic() - started)
+        return ok
 
-scheduler = AsyncIOScheduler(timezone="Asia/Kolkata")
-scheduler.add_job(close_nightmode, trigger="cron", hour=6, minute=1)
-scheduler.start()
+    results = []
+    if app.media.get(await app.media.key(photo)) is None:
+        # Upload the photo with the first chat so every other chat reuses it.
+        results.append(await worker(chats.pop(0)))
+    tasks = [await window.start(worker, chat_id) for chat_id in chats]
+    await window.wait()
+    results += [task.result() for task in tasks]
+    latencies.sort()
+    night_runs[name] = {
+        "chats": len(results),
+        "ok": results.count(True),
+        "failed": results.count(False),
+        "duration": time.monotonic() - started,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)],
+    }
+    LOGGER(__name__).info(f"Nightmode {name} run: {night_runs[name]}")
 
 
+async def start_nightmode():
+    await run_nightmode("close", CLOSE_CHAT, CLOSE_PHOTO, CLOSE_CAPTION)
+
+
+async def close_nightmode():
+    await run_nightmode("open", OPEN_CHAT, OPEN_PHOTO, OPEN_CAPTION)
+
 
+scheduler.daily("nightmode_close", 23, 59, start_nightmode, timezone="Asia/Kolkata")
+scheduler.daily("nightmode_open", 6, 1, close_nightmode, timezone="Asia/Kolkata")
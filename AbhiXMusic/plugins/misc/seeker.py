@@ -1,24 +1,25 @@
 # Owner @Tera_YaaaR_Hu
-import asyncio
 from AbhiXMusic.misc import db
 from AbhiXMusic.utils.database import get_active_chats, is_music_playing
+from AbhiXMusic.utils.scheduler import scheduler
 
 
 async def timer():
-    while not await asyncio.sleep(1):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
-            if not await is_music_playing(chat_id):
-                continue
-            playing = db.get(chat_id)
-            if not playing:
-                continue
-            duration = int(playing[0]["seconds"])
-            if duration == 0:
-                continue
-            if db[chat_id][0]["played"] >= duration:
-                continue
-            db[chat_id][0]["played"] += 1
+    active_chats = await get_active_chats()
+    if not active_chats:
+        return False
+    for chat_id in active_chats:
+        if not await is_music_playing(chat_id):
+            continue
+        playing = db.get(chat_id)
+        if not playing:
+            continue
+        duration = int(playing[0]["seconds"])
+        if duration == 0:
+            continue
+        if db[chat_id][0]["played"] >= duration:
+            continue
+        db[chat_id][0]["played"] += 1
 
 
-asyncio.create_task(timer())
+scheduler.every("seeker", 1, timer, parks=True)
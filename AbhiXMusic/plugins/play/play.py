@@ -7,6 +7,7 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from AbhiXMusic import Apple, Resso, SoundCloud, Spotify, Telegram, YouTube, app
 from AbhiXMusic.core.call import Abhi
+from AbhiXMusic.misc import lyrical
 from AbhiXMusic.utils import seconds_to_min, time_to_seconds
 from AbhiXMusic.utils.channelplay import get_channeplayCB
 from AbhiXMusic.utils.decorators.language import languageCB
@@ -21,7 +22,7 @@ from AbhiXMusic.utils.inline import (
 )
 from AbhiXMusic.utils.logger import play_logs
 from AbhiXMusic.utils.stream.stream import stream
-from config import BANNED_USERS, lyrical
+from config import BANNED_USERS
 
 @app.on_message(
    filters.command(["play", "vplay", "cplay", "cvplay", "playforce", "vplayforce", "cplayforce", "cvplayforce"] ,prefixes=["/", "!", "%", ",", "", ".", "@", "#"])
@@ -3,6 +3,7 @@ from pyrogram import filters
 from pyrogram.types import Message
 from AbhiXMusic import app
 from AbhiXMusic.misc import SUDOERS
+from AbhiXMusic.utils.chatinfo import get_chat_info
 from AbhiXMusic.utils.database import blacklist_chat, blacklisted_chats, whitelist_chat
 from AbhiXMusic.utils.decorators.language import language
 from config import BANNED_USERS
@@ -50,7 +51,7 @@ async def all_chats(client, message: Message, _):
     j = 0
     for count, chat_id in enumerate(await blacklisted_chats(), 1):
         try:
-            title = (await app.get_chat(chat_id)).title
+            title = (await get_chat_info(chat_id))["title"]
         except:
             title = "ᴘʀɪᴠᴀᴛᴇ ᴄʜᴀᴛ"
         j = 1
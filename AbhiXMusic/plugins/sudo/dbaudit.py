@@ -0,0 +1,23 @@
+# Owner @Tera_YaaaR_Hu
+from pyrogram import filters
+from pyrogram.types import Message
+from AbhiXMusic import app
+from AbhiXMusic.misc import SUDOERS
+from AbhiXMusic.utils.schema import audit_queries, ensure_indexes
+
+
+@app.on_message(filters.command("dbaudit") & SUDOERS)
+async def db_audit(_, message: Message):
+    mystic = await message.reply_text("» ᴇxᴘʟᴀɪɴɪɴɢ ʜᴏᴛ ǫᴜᴇʀɪᴇs...")
+    if len(message.command) > 1 and message.command[1].lower() == "fix":
+        await ensure_indexes()
+    report = await audit_queries()
+    text = "<b>ǫᴜᴇʀʏ ᴘʟᴀɴ ᴀᴜᴅɪᴛ</b>\n\n"
+    scans = 0
+    for collection, query, status in report:
+        if status != "OK":
+            scans += 1
+        text += f"{'✅' if status == 'OK' else '⚠️'} <code>{collection}</code> {list(query)[0]} : {status}\n"
+    if scans:
+        text += "\n» ʀᴜɴ <code>/dbaudit fix</code> ᴛᴏ ʀᴇᴄʀᴇᴀᴛᴇ ᴍɪssɪɴɢ ɪɴᴅᴇxᴇs."
+    await mystic.edit_text(text)
@@ -1,7 +1,5 @@
 # Owner @Tera_YaaaR_Hu
-import asyncio
 from pyrogram import filters
-from pyrogram.errors import FloodWait
 from pyrogram.types import Message
 from AbhiXMusic import app
 from AbhiXMusic.misc import SUDOERS
@@ -9,14 +7,63 @@ from AbhiXMusic.utils import get_readable_time
 from AbhiXMusic.utils.database import (
     add_banned_user,
     get_banned_count,
-    get_banned_users,
-    get_served_chats,
+    get_lang,
+    get_served_chats_count,
+    iter_banned_users,
+    iter_served_chats,
     is_banned_user,
     remove_banned_user,
 )
 from AbhiXMusic.utils.decorators.language import language
 from AbhiXMusic.utils.extraction import extract_user
+from AbhiXMusic.utils.fanout import FANOUT_RATE, register, start_job
 from config import BANNED_USERS
+from strings import get_string
+
+
+async def served_chats_source(params, after):
+    async for chat_id in iter_served_chats(after):
+        yield chat_id
+
+
+async def gban_action(chat_id, params):
+    await app.ban_chat_member(chat_id, params["user_id"])
+
+
+async def ungban_action(chat_id, params):
+    await app.unban_chat_member(chat_id, params["user_id"])
+
+
+async def gban_finish(doc):
+    params = doc["params"]
+    _ = get_string(params["lang"])
+    await app.send_message(
+        doc["chat_id"],
+        _["gban_6"].format(
+            app.mention,
+            params["chat_title"],
+            doc["chat_id"],
+            params["user_mention"],
+            params["user_id"],
+            params["admin_mention"],
+            doc["counts"]["done"],
+        ),
+    )
+    await app.delete_messages(doc["chat_id"], doc["message_id"])
+
+
+async def ungban_finish(doc):
+    params = doc["params"]
+    _ = get_string(params["lang"])
+    await app.send_message(
+        doc["chat_id"],
+        _["gban_9"].format(params["user_mention"], doc["counts"]["done"]),
+    )
+    await app.delete_messages(doc["chat_id"], doc["message_id"])
+
+
+register("gban", served_chats_source, gban_action, gban_finish)
+register("ungban", served_chats_source, ungban_action, ungban_finish)
 
 
 @app.on_message(filters.command(["gban", "globalban"]) & SUDOERS)
@@ -37,34 +84,23 @@ async def global_ban(client, message: Message, _):
         return await message.reply_text(_["gban_4"].format(user.mention))
     if user.id not in BANNED_USERS:
         BANNED_USERS.add(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
-    time_expected = get_readable_time(len(served_chats))
-    mystic = await message.reply_text(_["gban_5"].format(user.mention, time_expected))
-    number_of_chats = 0
-    for chat_id in served_chats:
-        try:
-            await app.ban_chat_member(chat_id, user.id)
-            number_of_chats += 1
-        except FloodWait as fw:
-            await asyncio.sleep(int(fw.value))
-        except:
-            continue
     await add_banned_user(user.id)
-    await message.reply_text(
-        _["gban_6"].format(
-            app.mention,
-            message.chat.title,
-            message.chat.id,
-            user.mention,
-            user.id,
-            message.from_user.mention,
-            number_of_chats,
-        )
+    total = await get_served_chats_count()
+    time_expected = get_readable_time(max(1, total // FANOUT_RATE))
+    mystic = await message.reply_text(_["gban_5"].format(user.mention, time_expected))
+    await start_job(
+        "gban",
+        {
+            "user_id": user.id,
+            "user_mention": user.mention,
+            "admin_mention": message.from_user.mention,
+            "chat_title": message.chat.title,
+            "lang": await get_lang(message.chat.id),
+        },
+        message.chat.id,
+        mystic.id,
+        total,
     )
-    await mystic.delete()
 
 
 @app.on_message(filters.command(["ungban"]) & SUDOERS)
@@ -79,24 +115,21 @@ async def global_un(client, message: Message, _):
         return await message.reply_text(_["gban_7"].format(user.mention))
     if user.id in BANNED_USERS:
         BANNED_USERS.remove(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
-    time_expected = get_readable_time(len(served_chats))
-    mystic = await message.reply_text(_["gban_8"].format(user.mention, time_expected))
-    number_of_chats = 0
-    for chat_id in served_chats:
-        try:
-            await app.unban_chat_member(chat_id, user.id)
-            number_of_chats += 1
-        except FloodWait as fw:
-            await asyncio.sleep(int(fw.value))
-        except:
-            continue
     await remove_banned_user(user.id)
-    await message.reply_text(_["gban_9"].format(user.mention, number_of_chats))
-    await mystic.delete()
+    total = await get_served_chats_count()
+    time_expected = get_readable_time(max(1, total // FANOUT_RATE))
+    mystic = await message.reply_text(_["gban_8"].format(user.mention, time_expected))
+    await start_job(
+        "ungban",
+        {
+            "user_id": user.id,
+            "user_mention": user.mention,
+            "lang": await get_lang(message.chat.id),
+        },
+        message.chat.id,
+        mystic.id,
+        total,
+    )
 
 
 @app.on_message(filters.command(["gbannedusers", "gbanlist"]) & SUDOERS)
@@ -108,8 +141,7 @@ async def gbanned_list(client, message: Message, _):
     mystic = await message.reply_text(_["gban_11"])
     msg = _["gban_12"]
     count = 0
-    users = await get_banned_users()
-    for user_id in users:
+    async for user_id in iter_banned_users():
         count += 1
         try:
             user = await app.get_users(user_id)
@@ -0,0 +1,46 @@
+# Owner @Tera_YaaaR_Hu
+import time
+from pyrogram import filters
+from pyrogram.types import Message
+from AbhiXMusic import app
+from AbhiXMusic.misc import SUDOERS
+from AbhiXMusic.utils.fanout import cancel_job, format_job, list_jobs
+from AbhiXMusic.utils.scheduler import scheduler
+
+
+@app.on_message(filters.command(["jobs", "fanout"]) & SUDOERS)
+async def running_jobs(_, message: Message):
+    jobs = list_jobs()
+    if not jobs:
+        return await message.reply_text("» ɴᴏ ʙʀᴏᴀᴅᴄᴀsᴛ ᴏʀ ʙᴀɴ ᴊᴏʙs ᴀʀᴇ ʀᴜɴɴɪɴɢ.")
+    text = "\n\n".join(format_job(doc) for doc in jobs)
+    text += "\n\n» ᴜsᴇ <code>/canceljob [ɪᴅ]</code> ᴛᴏ sᴛᴏᴘ ᴀ ᴊᴏʙ."
+    await message.reply_text(text)
+
+
+@app.on_message(filters.command("canceljob") & SUDOERS)
+async def cancel_running_job(_, message: Message):
+    if len(message.command) != 2:
+        return await message.reply_text("» ᴜsᴀɢᴇ : <code>/canceljob [ɪᴅ]</code>")
+    job_id = message.command[1]
+    if await cancel_job(job_id):
+        await message.reply_text(f"» ᴊᴏʙ <code>{job_id}</code> ᴄᴀɴᴄᴇʟʟᴇᴅ.")
+    else:
+        await message.reply_text(f"» ɴᴏ ʀᴜɴɴɪɴɢ ᴊᴏʙ <code>{job_id}</code>.")
+
+
+@app.on_message(filters.command("scheduler") & SUDOERS)
+async def scheduled_jobs(_, message: Message):
+    text = "<b>sᴄʜᴇᴅᴜʟᴇᴅ ᴊᴏʙs</b>\n"
+    for name, stats in scheduler.report().items():
+        if stats["parked"]:
+            state = "ᴘᴀʀᴋᴇᴅ"
+        else:
+            state = f"ɴᴇxᴛ ɪɴ {max(0, int(stats['next_run'] - time.time()))}s"
+        text += (
+            f"\n<b>{name}</b> : {state}\n"
+            f"ʀᴜɴs : {stats['runs']} | ғᴀɪʟᴇᴅ : {stats['failures']} | "
+            f"sᴋɪᴘᴘᴇᴅ : {stats['skipped']} | ᴍɪssᴇᴅ : {stats['missed']}\n"
+            f"ᴀᴠɢ : {stats['avg_runtime']:.3f}s | ᴍᴀx : {stats['max_runtime']:.3f}s\n"
+        )
+    await message.reply_text(text)
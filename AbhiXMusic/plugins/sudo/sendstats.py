@@ -0,0 +1,46 @@
+# Owner @Tera_YaaaR_Hu
+from pyrogram import filters
+from pyrogram.types import Message
+from AbhiXMusic import app
+from AbhiXMusic.core.cache import caches
+from AbhiXMusic.misc import SUDOERS
+from AbhiXMusic.utils.render import render_pool
+
+
+@app.on_message(filters.command("sendstats") & SUDOERS)
+async def send_stats(_, message: Message):
+    text = "<b>ᴏᴜᴛʙᴏᴜɴᴅ sᴇɴᴅ ǫᴜᴇᴜᴇ</b>\n"
+    for level, stats in app.governor.report().items():
+        text += (
+            f"\n<b>{level}</b>\n"
+            f"sᴇɴᴛ : {stats['sent']} | ǫᴜᴇᴜᴇᴅ : {stats['queued']} | ᴅʀᴏᴘᴘᴇᴅ : {stats['dropped']}\n"
+            f"ᴀᴠɢ ᴡᴀɪᴛ : {stats['avg_wait']:.2f}s | ᴍᴀx ᴡᴀɪᴛ : {stats['max_wait']:.2f}s\n"
+        )
+    await message.reply_text(text)
+
+
+@app.on_message(filters.command("caches") & SUDOERS)
+async def cache_stats(_, message: Message):
+    text = "<b>ɪɴ-ᴍᴇᴍᴏʀʏ ᴄᴀᴄʜᴇs</b>\n"
+    for name, cache in caches.items():
+        stats = cache.report()
+        text += (
+            f"\n<b>{name}</b> : {stats['size']} / {stats['maxsize']}\n"
+            f"ʜɪᴛ ʀᴀᴛᴇ : {stats['hit_rate']:.0%} | ᴇᴠɪᴄᴛᴇᴅ : {stats['evictions']} | "
+            f"ᴇxᴘɪʀᴇᴅ : {stats['expired']}\n"
+        )
+    await message.reply_text(text)
+
+
+@app.on_message(filters.command("renderstats") & SUDOERS)
+async def render_stats(_, message: Message):
+    report = render_pool.report()
+    if not report:
+        return await message.reply_text("» ɴᴏᴛʜɪɴɢ ʀᴇɴᴅᴇʀᴇᴅ ʏᴇᴛ.")
+    text = f"<b>ʀᴇɴᴅᴇʀ ᴘᴏᴏʟ</b> ({render_pool.workers} ᴡᴏʀᴋᴇʀs)\n"
+    for name, stats in report.items():
+        text += (
+            f"\n<b>{name}</b> : {stats['runs']} ʀᴜɴs\n"
+            f"ᴀᴠɢ : {stats['avg']:.2f}s | ᴍᴀx : {stats['max']:.2f}s | ʟᴀsᴛ : {stats['last']:.2f}s\n"
+        )
+    await message.reply_text(text)
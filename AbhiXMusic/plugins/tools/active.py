@@ -4,6 +4,7 @@ from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 from unidecode import unidecode
 from AbhiXMusic import app
 from AbhiXMusic.misc import SUDOERS
+from AbhiXMusic.utils.chatinfo import get_chat_info
 from AbhiXMusic.utils.database import (
     get_active_chats,
     get_active_video_chats,
@@ -20,13 +21,14 @@ async def activevc(_, message: Message):
     j = 0
     for x in served_chats:
         try:
-            title = (await app.get_chat(x)).title
+            chat = await get_chat_info(x)
+            title = chat["title"]
         except:
             await remove_active_chat(x)
             continue
         try:
-            if (await app.get_chat(x)).username:
-                user = (await app.get_chat(x)).username
+            if chat["username"]:
+                user = chat["username"]
                 text += f"<b>{j + 1}.</b> <a href=https://t.me/{user}>{unidecode(title).upper()}</a>\n"
             else:
                 text += (
@@ -52,13 +54,14 @@ async def activevi_(_, message: Message):
     j = 0
     for x in served_chats:
         try:
-            title = (await app.get_chat(x)).title
+            chat = await get_chat_info(x)
+            title = chat["title"]
         except:
             await remove_active_video_chat(x)
             continue
         try:
-            if (await app.get_chat(x)).username:
-                user = (await app.get_chat(x)).username
+            if chat["username"]:
+                user = chat["username"]
                 text += f"<b>{j + 1}.</b> <a href=https://t.me/{user}>{unidecode(title).upper()}</a> [<code>{x}</code>]\n"
             else:
                 text += (
@@ -6,7 +6,14 @@ from pyrogram import filters
 from pyrogram.types import Message
 from AbhiXMusic import app
 from AbhiXMusic.mongo.readable_time import get_readable_time
-from AbhiXMusic.mongo.afkdb import add_afk, is_afk, remove_afk
+from AbhiXMusic.mongo.afkdb import (
+    add_afk,
+    afk_lookup,
+    afk_username_lookup,
+    afk_users,
+    is_afk,
+    remove_afk,
+)
 
 
 @app.on_message(filters.command(["afk", "brb", "ye"], prefixes=["/", "!", "b", "B"]))
@@ -159,6 +166,7 @@ async def active_afk(_, message: Message):
             "reason": None,
         }
 
+    details["username"] = message.from_user.username
     await add_afk(user_id, details)    
     await message.reply_text(f"{message.from_user.first_name} ɪs ɴᴏᴡ ᴀғᴋ!")
 
@@ -173,7 +181,7 @@ chat_watcher_group = 1
     group=chat_watcher_group,
 )
 async def chat_watcher_func(_, message):
-    if message.sender_chat:
+    if message.sender_chat or not afk_users:
         return
     userid = message.from_user.id
     user_name = message.from_user.first_name
@@ -185,6 +193,20 @@ async def chat_watcher_func(_, message):
                 if (message_text[0 : 0 + entity.length]).lower() in possible:
                     return
 
+    candidates = [userid]
+    if message.reply_to_message and message.reply_to_message.from_user:
+        candidates.append(message.reply_to_message.from_user.id)
+    usernames = []
+    for entity in message.entities or []:
+        if entity.type == MessageEntityType.TEXT_MENTION and entity.user:
+            candidates.append(entity.user.id)
+        elif entity.type == MessageEntityType.MENTION and not usernames:
+            usernames = re.findall("@([_0-9a-zA-Z]+)", message.text)
+    if not afk_lookup(candidates) and all(
+        afk_username_lookup(username) is False for username in usernames
+    ):
+        return
+
     msg = ""
     replied_user_id = 0
 
@@ -282,7 +304,11 @@ async def chat_watcher_func(_, message):
                 found = re.findall("@([_0-9a-zA-Z]+)", message.text)
                 try:
                     get_user = found[j]
-                    user = await app.get_users(get_user)
+                    afk_id = afk_username_lookup(get_user)
+                    if afk_id is False:
+                        j += 1
+                        continue
+                    user = await app.get_users(afk_id or get_user)
                     if user.id == replied_user_id:
                         j += 1
                         continue
@@ -4,6 +4,14 @@ from pyrogram import Client, filters
 from pyrogram.types import Message, InlineKeyboardButton, InlineKeyboardMarkup
 from config import LOGGER_ID as LOG_GROUP_ID
 from AbhiXMusic import app 
+from AbhiXMusic.core.governor import LOW, SendDropped, send_priority
+from AbhiXMusic.utils.chatinfo import (
+    add_member_count,
+    forget_chat_info,
+    get_invite_link,
+    get_member_count,
+    update_chat_info,
+)
 from pyrogram.errors import RPCError
 from typing import Union, Optional
 from PIL import Image, ImageDraw, ImageFont
@@ -22,10 +30,18 @@ photo = [
 @app.on_message(filters.new_chat_members, group=2)
 async def join_watcher(_, message):    
     chat = message.chat
-    link = await app.export_chat_invite_link(chat.id)
     for member in message.new_chat_members:
         if member.id == app.id:
-            count = await app.get_chat_members_count(chat.id)
+            try:
+                link = await get_invite_link(chat.id)
+                if not link.startswith("https://"):
+                    link = f"https://t.me/{link}"
+            except:
+                link = None
+            try:
+                count = await get_member_count(chat.id)
+            except:
+                count = "ᴜɴᴋɴᴏᴡɴ"
             msg = (
                 f"📝 ᴍᴜsɪᴄ ʙᴏᴛ ᴀᴅᴅᴇᴅ ɪɴ ᴀ ɴᴇᴡ ɢʀᴏᴜᴘ\n\n"
                 f"____________________________________\n\n"
@@ -36,9 +52,33 @@ async def join_watcher(_, message):
                 f"📈 ɢʀᴏᴜᴘ ᴍᴇᴍʙᴇʀs: {count}\n"
                 f"🤔 ᴀᴅᴅᴇᴅ ʙʏ: {message.from_user.mention}"
             )
-            await app.send_photo(LOG_GROUP_ID, photo=random.choice(photo), caption=msg, reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton(f"sᴇᴇ ɢʀᴏᴜᴘ👀", url=f"{link}")]
-            ]))
+            markup = None
+            if link:
+                markup = InlineKeyboardMarkup([
+                    [InlineKeyboardButton(f"sᴇᴇ ɢʀᴏᴜᴘ👀", url=f"{link}")]
+                ])
+            try:
+                with send_priority(LOW):
+                    await app.send_photo(LOG_GROUP_ID, photo=random.choice(photo), caption=msg, reply_markup=markup)
+            except SendDropped:
+                pass
+
+
+@app.on_message(
+    filters.new_chat_members | filters.left_chat_member | filters.new_chat_title,
+    group=9,
+)
+async def chat_info_watcher(_, message):
+    chat_id = message.chat.id
+    if message.new_chat_members:
+        add_member_count(chat_id, len(message.new_chat_members))
+    elif message.left_chat_member:
+        if message.left_chat_member.id == app.id:
+            forget_chat_info(chat_id)
+        else:
+            add_member_count(chat_id, -1)
+    elif message.new_chat_title:
+        update_chat_info(chat_id, title=message.new_chat_title)
 
 @app.on_message(filters.left_chat_member)
 async def on_left_chat_member(_, message: Message):
@@ -48,5 +88,9 @@ async def on_left_chat_member(_, message: Message):
         username = f"@{message.chat.username}" if message.chat.username else "𝐏ʀɪᴠᴀᴛᴇ 𝐂ʜᴀᴛ"
         chat_id = message.chat.id
         left = f"✫ <b><u>#𝐋ᴇғᴛ_𝐆ʀᴏᴜᴘ</u></b> ✫\n\n𝐂ʜᴀᴛ 𝐓ɪᴛʟᴇ : {title}\n\n𝐂ʜᴀᴛ 𝐈ᴅ : {chat_id}\n\n𝐑ᴇᴍᴏᴠᴇᴅ 𝐁ʏ : {remove_by}\n\n𝐁ᴏᴛ : @{app.username}"
-        await app.send_photo(LOG_GROUP_ID, photo=random.choice(photo), caption=left)
+        try:
+            with send_priority(LOW):
+                await app.send_photo(LOG_GROUP_ID, photo=random.choice(photo), caption=left)
+        except SendDropped:
+            pass
         
@@ -1,16 +1,19 @@
 # Owner @Tera_YaaaR_Hu
 import os 
 import random
-from datetime import datetime 
-from telegraph import upload_file
-from PIL import Image , ImageDraw
+import asyncio
+from datetime import datetime, timedelta
 from pyrogram import *
+from pyrogram.errors import RPCError
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from pyrogram.enums import *
 
 #BOT FILE NAME
 from AbhiXMusic import app as app
-from AbhiXMusic.mongo.couples_db import _get_image, get_couple
+from AbhiXMusic.core.media import is_stale
+from AbhiXMusic.mongo.couples_db import _get_image, get_couple, save_couple, set_couple_image
+from AbhiXMusic.utils.cards import couples_card
+from AbhiXMusic.utils.photos import DEFAULT_PHOTO, get_profile_photo
 
 POLICE = [
     [
@@ -21,6 +24,10 @@ POLICE = [
     ],
 ]
 
+# chat_id -> [lock, /couples calls holding or waiting for it], so concurrent
+# calls agree on one pair a day. Removed when the last call is done.
+couple_locks = {}
+
 
 def dt():
     now = datetime.now()
@@ -30,125 +37,112 @@ def dt():
     
 
 def dt_tom():
-    a = (
-        str(int(dt()[0].split("/")[0]) + 1)
-        + "/"
-        + dt()[0].split("/")[1]
-        + "/"
-        + dt()[0].split("/")[2]
-    )
-    return a
-
-tomorrow = str(dt_tom())
-today = str(dt()[0])
-
-@app.on_message(filters.command("couples"))
-async def ctest(_, message):
-    cid = message.chat.id
-    if message.chat.type == ChatType.PRIVATE:
-        return await message.reply_text("ᴛʜɪs ᴄᴏᴍᴍᴀɴᴅ ᴏɴʟʏ ᴡᴏʀᴋs ɪɴ ɢʀᴏᴜᴘs.")
-    try:
-     #  is_selected = await get_couple(cid, today)
-     #  if not is_selected:
-         msg = await message.reply_text("ɢᴇɴᴇʀᴀᴛɪɴɢ ᴄᴏᴜᴘʟᴇs ɪᴍᴀɢᴇ...")
-         #GET LIST OF USERS
-         list_of_users = []
-
-         async for i in app.get_chat_members(message.chat.id, limit=50):
-             if not i.user.is_bot:
-               list_of_users.append(i.user.id)
-
-         c1_id = random.choice(list_of_users)
-         c2_id = random.choice(list_of_users)
-         while c1_id == c2_id:
-              c1_id = random.choice(list_of_users)
-
-
-         photo1 = (await app.get_chat(c1_id)).photo
-         photo2 = (await app.get_chat(c2_id)).photo
- 
-         N1 = (await app.get_users(c1_id)).mention 
-         N2 = (await app.get_users(c2_id)).mention
-         
-         try:
-            p1 = await app.download_media(photo1.big_file_id, file_name="pfp.png")
-         except Exception:
-            p1 = "AbhiXMusic/assets/upic.png"
-         try:
-            p2 = await app.download_media(photo2.big_file_id, file_name="pfp1.png")
-         except Exception:
-            p2 = "AbhiXMusic/assets/upic.png"
-            
-         img1 = Image.open(f"{p1}")
-         img2 = Image.open(f"{p2}")
-
-         img = Image.open("AbhiXMusic/assets/cppic.png")
+    return (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
 
-         img1 = img1.resize((437,437))
-         img2 = img2.resize((437,437))
 
-         mask = Image.new('L', img1.size, 0)
-         draw = ImageDraw.Draw(mask) 
-         draw.ellipse((0, 0) + img1.size, fill=255)
+def couple_text(couple: dict) -> str:
+    N1 = f"[{couple['c1_name']}](tg://user?id={couple['c1_id']})"
+    N2 = f"[{couple['c2_name']}](tg://user?id={couple['c2_id']})"
+    return f"""
+**ᴛᴏᴅᴀʏ's ᴄᴏᴜᴘʟᴇ ᴏғ ᴛʜᴇ ᴅᴀʏ :
 
-         mask1 = Image.new('L', img2.size, 0)
-         draw = ImageDraw.Draw(mask1) 
-         draw.ellipse((0, 0) + img2.size, fill=255)
+{N1} + {N2} = 💚
 
+ɴᴇxᴛ ᴄᴏᴜᴘʟᴇs ᴡɪʟʟ ʙᴇ sᴇʟᴇᴄᴛᴇᴅ ᴏɴ {dt_tom()} !!**
+"""
 
-         img1.putalpha(mask)
-         img2.putalpha(mask1)
 
-         draw = ImageDraw.Draw(img)
+async def send_couple(message, couple: dict, photo1, photo2):
+    p1 = await get_profile_photo(photo1) or DEFAULT_PHOTO
+    p2 = await get_profile_photo(photo2) or DEFAULT_PHOTO
+    card = await couples_card(p1, p2, message.chat.id)
+    try:
+        return await message.reply_photo(
+            card, caption=couple_text(couple), reply_markup=InlineKeyboardMarkup(POLICE)
+        )
+    finally:
+        os.remove(card)
 
-         img.paste(img1, (116, 160), img1)
-         img.paste(img2, (789, 160), img2)
 
-         img.save(f'test_{cid}.png')
-    
-         TXT = f"""
-**ᴛᴏᴅᴀʏ's ᴄᴏᴜᴘʟᴇ ᴏғ ᴛʜᴇ ᴅᴀʏ :
+async def make_couple(message, today: str):
+    cid = message.chat.id
+    msg = await message.reply_text("ɢᴇɴᴇʀᴀᴛɪɴɢ ᴄᴏᴜᴘʟᴇs ɪᴍᴀɢᴇ...")
+    try:
+        #GET LIST OF USERS
+        list_of_users = []
+        async for i in app.get_chat_members(cid, limit=50):
+            if not i.user.is_bot and not i.user.is_deleted:
+                list_of_users.append(i.user)
+        if len(list_of_users) < 2:
+            return await message.reply_text("ɴᴏᴛ ᴇɴᴏᴜɢʜ ᴍᴇᴍʙᴇʀs ᴛᴏ ᴘɪᴄᴋ ᴀ ᴄᴏᴜᴘʟᴇ.")
+
+        c1, c2 = random.sample(list_of_users, 2)
+        couple = {
+            "c1_id": c1.id,
+            "c2_id": c2.id,
+            "c1_name": c1.first_name,
+            "c2_name": c2.first_name,
+        }
+        sent = await send_couple(message, couple, c1.photo, c2.photo)
+        await save_couple(cid, today, couple, sent.photo.file_id)
+    finally:
+        try:
+            await msg.delete()
+        except RPCError:
+            pass
+
+
+async def redraw_couple(message, couple: dict):
+    """Render the day's stored pair again when its card can no longer be sent."""
+    users = {
+        user.id: user
+        for user in await app.get_users([couple["c1_id"], couple["c2_id"]])
+    }
+    c1 = users.get(couple["c1_id"])
+    c2 = users.get(couple["c2_id"])
+    couple = {
+        **couple,
+        "c1_name": couple.get("c1_name") or (c1.first_name if c1 else "ᴜɴᴋɴᴏᴡɴ"),
+        "c2_name": couple.get("c2_name") or (c2.first_name if c2 else "ᴜɴᴋɴᴏᴡɴ"),
+    }
+    sent = await send_couple(
+        message, couple, c1.photo if c1 else None, c2.photo if c2 else None
+    )
+    await set_couple_image(message.chat.id, sent.photo.file_id)
 
-{N1} + {N2} = 💚
 
-ɴᴇxᴛ ᴄᴏᴜᴘʟᴇs ᴡɪʟʟ ʙᴇ sᴇʟᴇᴄᴛᴇᴅ ᴏɴ {tomorrow} !!**
-"""
-    
-         await message.reply_photo(f"test_{cid}.png", caption=TXT, reply_markup=InlineKeyboardMarkup(POLICE),
-    )
-         await msg.delete()
-         a = upload_file(f"test_{cid}.png")
-         for x in a:
-           img = "https://graph.org/" + x
-           couple = {"c1_id": c1_id, "c2_id": c2_id}
-          # await save_couple(cid, today, couple, img)
-    
-         
-      # elif is_selected:
-      #   msg = await message.reply_text("𝐆ᴇᴛᴛɪɴɢ 𝐓ᴏᴅᴀʏs 𝐂ᴏᴜᴘʟᴇs 𝐈ᴍᴀɢᴇ...")
-      #   b = await _get_image(cid)
-       #  c1_id = int(is_selected["c1_id"])
-       #  c2_id = int(is_selected["c2_id"])
-       #  c1_name = (await app.get_users(c1_id)).first_name
-        # c2_name = (await app.get_users(c2_id)).first_name
-         
-      #   TXT = f"""
-#**𝐓ᴏᴅᴀʏ's 𝐒ᴇʟᴇᴄᴛᴇᴅ 𝐂ᴏᴜᴘʟᴇs 🎉 :
-#➖➖➖➖➖➖➖➖➖➖➖➖
-#[{c1_name}](tg://openmessage?user_id={c1_id}) + [{c2_name}](tg://openmessage?user_id={c2_id}) = ❣️
-#➖➖➖➖➖➖➖➖➖➖➖➖
-#𝐍ᴇxᴛ 𝐂ᴏᴜᴘʟᴇs 𝐖ɪʟʟ 𝐁ᴇ 𝐒ᴇʟᴇᴄᴛᴇᴅ 𝐎ɴ {tomorrow} !!**
-#"""
- #        await message.reply_photo(b, caption=TXT)
-        # await msg.delete()
+@app.on_message(filters.command("couples"))
+async def ctest(_, message):
+    cid = message.chat.id
+    if message.chat.type == ChatType.PRIVATE:
+        return await message.reply_text("ᴛʜɪs ᴄᴏᴍᴍᴀɴᴅ ᴏɴʟʏ ᴡᴏʀᴋs ɪɴ ɢʀᴏᴜᴘs.")
+    today = dt()[0]
+    lock = couple_locks.setdefault(cid, [asyncio.Lock(), 0])
+    lock[1] += 1
+    try:
+        async with lock[0]:
+            is_selected = await get_couple(cid, today)
+            if not is_selected:
+                return await make_couple(message, today)
+            if "c1_name" in is_selected:
+                try:
+                    return await message.reply_photo(
+                        await _get_image(cid),
+                        caption=couple_text(is_selected),
+                        reply_markup=InlineKeyboardMarkup(POLICE),
+                    )
+                except RPCError as e:
+                    # Only a card Telegram no longer knows is drawn again;
+                    # anything else must not touch the day's pair.
+                    if not is_stale(e):
+                        raise
+            await redraw_couple(message, is_selected)
     except Exception as e:
         print(str(e))
-    try:
-      os.remove(f"./downloads/pfp1.png")
-      os.remove(f"./downloads/pfp2.png")
-      os.remove(f"test_{cid}.png")
-    except Exception:
-       pass
+    finally:
+        lock[1] -= 1
+        if not lock[1]:
+            del couple_locks[cid]
          
 
 __mod__ = "COUPLES"
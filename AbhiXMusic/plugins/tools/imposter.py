@@ -5,7 +5,8 @@ from pyrogram.types import Message
 from AbhiXMusic import app
 from AbhiXMusic.plugins.tools.pretenderdb import (
     impo_off, impo_on, check_pretender,
-    add_userdata, get_userdata, usr_data
+    add_userdata, get_userdata,
+    identity_fingerprint, is_known_identity, remember_identity
 )
 from AbhiXMusic.utils.admin_filters import admin_filter
 
@@ -40,14 +41,23 @@ SHASHANK_IMG = [
 async def chk_usr(_, message: Message):
     if message.sender_chat or not await check_pretender(message.chat.id):
         return
-    if not await usr_data(message.from_user.id):
+    fingerprint = identity_fingerprint(
+        message.from_user.username,
+        message.from_user.first_name,
+        message.from_user.last_name,
+    )
+    if is_known_identity(message.from_user.id, fingerprint):
+        return
+    userdata = await get_userdata(message.from_user.id)
+    if not userdata:
         return await add_userdata(
             message.from_user.id,
             message.from_user.username,
             message.from_user.first_name,
             message.from_user.last_name,
         )
-    usernamebefore, first_name, lastname_before = await get_userdata(message.from_user.id)
+    usernamebefore, first_name, lastname_before = userdata
+    remember_identity(message.from_user.id, fingerprint)
     msg = ""
     if (
         usernamebefore != message.from_user.username
@@ -75,12 +85,6 @@ async def chk_usr(_, message: Message):
 **🍜 ᴛᴏ** : {aft}
 ━━━━━━━━━━━━━━━  \n
 """.format(bef=usernamebefore, aft=usernameafter)
-        await add_userdata(
-            message.from_user.id,
-            message.from_user.username,
-            message.from_user.first_name,
-            message.from_user.last_name,
-        )
     if first_name != message.from_user.first_name:
         msg += """
 **🪧 ᴄʜᴀɴɢᴇs ғɪʀsᴛ ɴᴀᴍᴇ 🪧**
@@ -91,12 +95,6 @@ async def chk_usr(_, message: Message):
 """.format(
             bef=first_name, aft=message.from_user.first_name
         )
-        await add_userdata(
-            message.from_user.id,
-            message.from_user.username,
-            message.from_user.first_name,
-            message.from_user.last_name,
-        )
     if lastname_before != message.from_user.last_name:
         lastname_before = lastname_before or "NO LAST NAME"
         lastname_after = message.from_user.last_name or "NO LAST NAME"
@@ -109,13 +107,13 @@ async def chk_usr(_, message: Message):
 """.format(
             bef=lastname_before, aft=lastname_after
         )
+    if msg != "":
         await add_userdata(
             message.from_user.id,
             message.from_user.username,
             message.from_user.first_name,
             message.from_user.last_name,
         )
-    if msg != "":
         await message.reply_photo(random. choice(SHASHANK_IMG), caption=msg)
 
 
@@ -124,14 +122,14 @@ async def set_mataa(_, message: Message):
     if len(message.command) == 1:
         return await message.reply("ᴅᴇᴛᴇᴄᴛ ᴘʀᴇᴛᴇɴᴅᴇʀ ᴜsᴇʀs **ᴜsᴀɢᴇ:** `/imposter enable|disable`")
     if message.command[1] == "enable":
-        cekset = await impo_on(message.chat.id)
+        cekset = await check_pretender(message.chat.id)
         if cekset:
             await message.reply("**ᴘʀᴇᴛᴇɴᴅᴇʀ ᴍᴏᴅᴇ ɪs ᴀʟʀᴇᴀᴅʏ ᴇɴᴀʙʟᴇᴅ.**")
         else:
             await impo_on(message.chat.id)
             await message.reply(f"**sᴜᴄᴄᴇssғᴜʟʟʏ ᴇɴᴀʙʟᴇᴅ ᴘʀᴇᴛᴇɴᴅᴇʀ ᴍᴏᴅᴇ ғᴏʀ** {message.chat.title}")
     elif message.command[1] == "disable":
-        cekset = await impo_off(message.chat.id)
+        cekset = await check_pretender(message.chat.id)
         if not cekset:
             await message.reply("**ᴘʀᴇᴛᴇɴᴅᴇʀ ᴍᴏᴅᴇ ɪs ᴀʟʀᴇᴀᴅʏ ᴅɪsᴀʙʟᴇᴅ.**")
         else:
@@ -1,63 +1,15 @@
 # Owner @Tera_YaaaR_Hu
 from AbhiXMusic import app
+from AbhiXMusic.utils.cards import userinfo_card
+from AbhiXMusic.utils.photos import get_profile_photo
 from pyrogram import Client, filters
 from pyrogram.errors import RPCError
 from pyrogram.types import ChatMemberUpdated, InlineKeyboardMarkup, InlineKeyboardButton
+import os
 from os import environ
 from typing import Union, Optional
-from PIL import Image, ImageDraw, ImageFont
 import asyncio
 
-# --------------------------------------------------------------------------------- #
-
-get_font = lambda font_size, font_path: ImageFont.truetype(font_path, font_size)
-resize_text = (
-    lambda text_size, text: (text[:text_size] + "...").upper()
-    if len(text) > text_size
-    else text.upper()
-)
-
-# --------------------------------------------------------------------------------- #
-
-async def get_userinfo_img(
-    bg_path: str,
-    font_path: str,
-    user_id: Union[int, str],
-    profile_path: Optional[str] = None
-):
-    bg = Image.open(bg_path)
-
-    if profile_path:
-        img = Image.open(profile_path)
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.pieslice([(0, 0), img.size], 0, 360, fill=255)
-
-        circular_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        circular_img.paste(img, (0, 0), mask)
-        resized = circular_img.resize((400, 400))
-        bg.paste(resized, (440, 160), resized)
-
-    img_draw = ImageDraw.Draw(bg)
-
-    img_draw.text(
-        (529, 627),
-        text=str(user_id).upper(),
-        font=get_font(46, font_path),
-        fill=(255, 255, 255),
-    )
-
-    path = f"./userinfo_img_{user_id}.png"
-    bg.save(path)
-    return path
-
-# --------------------------------------------------------------------------------- #
-
-bg_path = "AbhiXMusic/assets/userinfo.png"
-font_path = "AbhiXMusic/assets/hiroko.ttf"
-
-# --------------------------------------------------------------------------------- #
-
 # -------------
 
 @app.on_chat_member_updated(filters.group, group=20)
@@ -84,13 +36,12 @@ async def member_has_left(client: app, member: ChatMemberUpdated):
     if user.photo and user.photo.big_file_id:
         try:
             # Add the photo path, caption, and button details
-            photo = await app.download_media(user.photo.big_file_id)
+            photo = await get_profile_photo(user.photo)
 
-            welcome_photo = await get_userinfo_img(
-                bg_path=bg_path,
-                font_path=font_path,
+            welcome_photo = await userinfo_card(
                 user_id=user.id,
                 profile_path=photo,
+                chat_id=member.chat.id,
             )
         
             caption = f"**❅─────✧❅✦❅✧─────❅**\n\n**๏ ᴀ ᴍᴇᴍʙᴇʀ ʟᴇғᴛ ᴛʜᴇ ɢʀᴏᴜᴘ🥀**\n\n**➻** {member.old_chat_member.user.mention}\n\n**๏ ᴏᴋ ʙʏᴇ ᴅᴇᴀʀ ᴀɴᴅ ʜᴏᴘᴇ ᴛᴏ sᴇᴇ ʏᴏᴜ ᴀɢᴀɪɴ ɪɴ ᴛʜɪs ᴄᴜᴛᴇ ɢʀᴏᴜᴘ ᴡɪᴛʜ ʏᴏᴜʀ ғʀɪᴇɴᴅs✨**\n\n**ㅤ•─╼⃝𖠁 ʙʏᴇ ♡︎ ʙᴀʙʏ 𖠁⃝╾─•**"
@@ -108,6 +59,7 @@ async def member_has_left(client: app, member: ChatMemberUpdated):
                     [InlineKeyboardButton(button_text, url=deep_link)]
                 ])
             )
+            os.remove(welcome_photo)
 
             # Schedule a task to delete the message after 30 seconds
             async def delete_message():
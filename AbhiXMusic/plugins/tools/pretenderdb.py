@@ -1,39 +1,77 @@
 # Owner @Tera_YaaaR_Hu
+from AbhiXMusic.core.cache import Cache
 from AbhiXMusic.utils.mongo import impdb
+from AbhiXMusic.utils.writebehind import WriteBehind
+
+userdata_buffer = WriteBehind(impdb, "user_id")
+
+IDENTITY_CACHE_SIZE = 100000
+PRETENDER_CACHE_SIZE = 50000
+
+# user_id -> fingerprint of the identity last stored
+identities = Cache("identities", IDENTITY_CACHE_SIZE)
+
+
+def identity_fingerprint(username, first_name, last_name) -> int:
+    return hash((username, first_name, last_name))
+
+
+def is_known_identity(user_id: int, fingerprint: int) -> bool:
+    return identities.get(user_id) == fingerprint
+
+
+def remember_identity(user_id: int, fingerprint: int):
+    identities[user_id] = fingerprint
 
 
 async def usr_data(user_id: int) -> bool:
-    user = await impdb.find_one({"user_id": user_id})
-    return bool(user)
+    return bool(await get_userdata(user_id))
 
 
 async def get_userdata(user_id: int):
-    user = await impdb.find_one({"user_id": user_id})
+    user = userdata_buffer.peek(user_id)
+    if not user:
+        user = await impdb.find_one({"user_id": user_id})
+    if not user:
+        return None
     return user["username"], user["first_name"], user["last_name"]
 
 
 async def add_userdata(user_id: int, username, first_name, last_name):
-    await impdb.update_one(
-        {"user_id": user_id},
+    remember_identity(
+        user_id, identity_fingerprint(username, first_name, last_name)
+    )
+    userdata_buffer.set(
+        user_id,
         {
-            "$set": {
-                "username": username,
-                "first_name": first_name,
-                "last_name": last_name,
-            }
+            "username": username,
+            "first_name": first_name,
+            "last_name": last_name,
         },
-        upsert=True,
     )
 
 
+async def _load_pretender(chat_id: int) -> bool:
+    return bool(await impdb.find_one({"chat_id_toggle": chat_id}))
+
+
+# chat_id -> whether pretender mode is on
+pretender_chats = Cache("pretender_chats", PRETENDER_CACHE_SIZE, loader=_load_pretender)
+
+
 async def check_pretender(chat_id: int) -> bool:
-    chat = await impdb.find_one({"chat_id_toggle": chat_id})
-    return bool(chat)
+    return await pretender_chats.load(chat_id)
 
 
 async def impo_on(chat_id: int):
-    await impdb.insert_one({"chat_id_toggle": chat_id})
+    pretender_chats[chat_id] = True
+    await impdb.update_one(
+        {"chat_id_toggle": chat_id},
+        {"$set": {"chat_id_toggle": chat_id}},
+        upsert=True,
+    )
 
 
 async def impo_off(chat_id: int):
-    await impdb.delete_one({"chat_id_toggle": chat_id})
\ No newline at end of file
+    pretender_chats[chat_id] = False
+    await impdb.delete_one({"chat_id_toggle": chat_id})
@@ -9,6 +9,7 @@ import config
 from AbhiXMusic import app
 from AbhiXMusic.misc import db
 from AbhiXMusic.utils import AbhiBin, get_channeplayCB, seconds_to_min
+from AbhiXMusic.utils.chatinfo import get_chat_info
 from AbhiXMusic.utils.database import get_cmode, is_active_chat, is_music_playing
 from AbhiXMusic.utils.decorators.language import language, languageCB
 from AbhiXMusic.utils.inline import queue_back_markup, queue_markup
@@ -47,7 +48,7 @@ async def get_queue(client, message: Message, _):
         if chat_id is None:
             return await message.reply_text(_["setting_7"])
         try:
-            await app.get_chat(chat_id)
+            await get_chat_info(chat_id)
         except:
             return await message.reply_text(_["cplay_4"])
         cplay = True
@@ -4,7 +4,6 @@ import asyncio
 import time
 from pyrogram import Client, filters
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.types import CallbackQuery, Message
 import re
 from os import getenv
@@ -16,19 +15,25 @@ from pyrogram import filters
 load_dotenv()
 
 from AbhiXMusic import app
+from AbhiXMusic.core.cache import Cache
 from AbhiXMusic.core.call import Abhi
-from AbhiXMusic.misc import db
+from AbhiXMusic.misc import db, lyrical
 from AbhiXMusic.mongo.afkdb import PROCESS
-from AbhiXMusic.utils.database import get_assistant, get_authuser_names, get_cmode
+from AbhiXMusic.utils.admincache import reload_admins, update_admin
+from AbhiXMusic.utils.chatinfo import get_chat_info
+from AbhiXMusic.utils.database import get_assistant, get_cmode
 from AbhiXMusic.utils.decorators import ActualAdminCB, AdminActual, language
-from AbhiXMusic.utils.formatters import alpha_to_int, get_readable_time
-from config import BANNED_USERS, adminlist, lyrical
+from AbhiXMusic.utils.formatters import get_readable_time
+from config import BANNED_USERS
 BOT_TOKEN = getenv("BOT_TOKEN", "")
 MONGO_DB_URI = getenv("MONGO_DB_URI", "")
 STRING_SESSION = getenv("STRING_SESSION", "")
 from dotenv import load_dotenv
 
-rel = {}
+RELOAD_COOLDOWN = 180
+
+# chat_id -> time the chat may reload again
+rel = Cache("reload_cooldowns", 10000, ttl=RELOAD_COOLDOWN)
 
 
 @app.on_message(
@@ -37,30 +42,25 @@ rel = {}
 @language
 async def reload_admin_cache(client, message: Message, _):
     try:
-        if message.chat.id not in rel:
-            rel[message.chat.id] = {}
-        else:
-            saved = rel[message.chat.id]
-            if saved > time.time():
-                left = get_readable_time((int(saved) - int(time.time())))
-                return await message.reply_text(_["reload_1"].format(left))
-        adminlist[message.chat.id] = []
-        async for user in app.get_chat_members(
-            message.chat.id, filter=ChatMembersFilter.ADMINISTRATORS
-        ):
-            if user.privileges.can_manage_video_chats:
-                adminlist[message.chat.id].append(user.user.id)
-        authusers = await get_authuser_names(message.chat.id)
-        for user in authusers:
-            user_id = await alpha_to_int(user)
-            adminlist[message.chat.id].append(user_id)
-        now = int(time.time()) + 180
-        rel[message.chat.id] = now
+        saved = rel.get(message.chat.id)
+        if saved:
+            left = get_readable_time(max(1, int(saved) - int(time.time())))
+            return await message.reply_text(_["reload_1"].format(left))
+        await reload_admins(message.chat.id)
+        rel[message.chat.id] = int(time.time()) + RELOAD_COOLDOWN
         await message.reply_text(_["reload_2"])
     except:
         await message.reply_text(_["reload_3"])
 
 
+@app.on_chat_member_updated(filters.group, group=-4)
+async def admin_cache_watcher(client, update):
+    member = update.new_chat_member or update.old_chat_member
+    if not member or not member.user:
+        return
+    update_admin(update.chat.id, member.user.id, update.new_chat_member)
+
+
 @app.on_message(filters.command(["reboot"]) & filters.group & ~BANNED_USERS)
 @AdminActual
 async def restartbot(client, message: Message, _):
@@ -82,13 +82,13 @@ async def restartbot(client, message: Message, _):
     chat_id = await get_cmode(message.chat.id)
     if chat_id:
         try:
-            got = await app.get_chat(chat_id)
+            got = await get_chat_info(chat_id)
         except:
             pass
         userbot = await get_assistant(chat_id)
         try:
-            if got.username:
-                await userbot.resolve_peer(got.username)
+            if got["username"]:
+                await userbot.resolve_peer(got["username"])
             else:
                 await userbot.resolve_peer(chat_id)
         except:
@@ -1,9 +1,8 @@
 # Owner @Tera_YaaaR_Hu
 from AbhiXMusic import app
-from pyrogram.errors import RPCError
+from pyrogram.errors import FloodWait, RPCError
 from pyrogram.types import ChatMemberUpdated, InlineKeyboardMarkup, InlineKeyboardButton
 from typing import Union, Optional
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageChops
 import random
 import asyncio
 import os
@@ -11,6 +10,9 @@ import time
 from logging import getLogger
 from pyrogram import Client, filters, enums
 from pyrogram.enums import ParseMode, ChatMemberStatus
+from AbhiXMusic.utils.cards import welcome_card
+from AbhiXMusic.utils.chatinfo import get_member_count
+from AbhiXMusic.utils.photos import DEFAULT_PHOTO, get_profile_photo
 from AbhiXMusic.utils.database import add_served_chat, get_assistant, is_active_chat
 from AbhiXMusic.misc import SUDOERS
 from AbhiXMusic.mongo.afkdb import PROCESS
@@ -18,6 +20,17 @@ from AbhiXMusic.utils.Abhi_ban import admin_filter
 
 LOGGER = getLogger(__name__)
 
+# Joins closer together than this are welcomed with one message.
+WELCOME_WINDOW = 3
+# Least time between two welcomes in one chat.
+WELCOME_INTERVAL = 10
+# New members named in a batched welcome; the rest are only counted.
+WELCOME_MENTIONS = 20
+# chat_id -> members waiting to be welcomed
+arrivals = {}
+# chat_id -> task sending that chat's welcomes
+welcomers = {}
+
 random_photo = [
     "https://telegra.ph/file/1949480f01355b4e87d26.jpg",
     "https://telegra.ph/file/3ef2cc0ad2bc548bafb30.jpg",
@@ -53,33 +66,6 @@ class temp:
     B_NAME = None
 
 
-def circle(pfp, size=(500, 500), brightness_factor=10):
-    pfp = pfp.resize(size).convert("RGBA")
-    pfp = ImageEnhance.Brightness(pfp).enhance(brightness_factor)
-    bigsize = (pfp.size[0] * 3, pfp.size[1] * 3)
-    mask = Image.new("L", bigsize, 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0) + bigsize, fill=255)
-    mask = mask.resize(pfp.size)
-    mask = ImageChops.darker(mask, pfp.split()[-1])
-    pfp.putalpha(mask)
-    return pfp
-
-
-def welcomepic(pic, user, chatname, id, uname, brightness_factor=1.3):
-    background = Image.open("AbhiXMusic/assets/wel2.png")
-    pfp = Image.open(pic).convert("RGBA")
-    pfp = circle(pfp, brightness_factor=brightness_factor)
-    pfp = pfp.resize((500, 500))
-    draw = ImageDraw.Draw(background)
-    font = ImageFont.truetype('AbhiXMusic/assets/font.ttf', size=60)
-    draw.text((630, 450), f'ID: {id}', fill=(255, 255, 255), font=font)
-    pfp_position = (48, 88)
-    background.paste(pfp, pfp_position, pfp)
-    background.save(f"downloads/welcome#{id}.png")
-    return f"downloads/welcome#{id}.png"
-
-
 @app.on_message(filters.command("welcome") & ~filters.private)
 async def auto_state(_, message):
     usage = "**ᴜsᴀɢᴇ:**\n**⦿ /welcome [on|off]**"
@@ -109,38 +95,88 @@ async def auto_state(_, message):
         await message.reply("**sᴏʀʀʏ ᴏɴʟʏ ᴀᴅᴍɪɴs ᴄᴀɴ ᴇɴᴀʙʟᴇ ᴡᴇʟᴄᴏᴍᴇ!**")
 
 
+def _joined(member: ChatMemberUpdated) -> bool:
+    new = member.new_chat_member
+    return bool(
+        new
+        and not member.old_chat_member
+        and new.status not in (ChatMemberStatus.LEFT, ChatMemberStatus.BANNED)
+    )
+
+
 @app.on_chat_member_updated(filters.group, group=-3)
 async def greet_new_member(_, member: ChatMemberUpdated):
+    # Leaves, promotions and restrictions arrive here too; drop them before
+    # anything touches the API.
+    if not _joined(member):
+        return
     chat_id = member.chat.id
-    count = await app.get_chat_members_count(chat_id)
-    A = await wlcm.find_one(chat_id)
-    if A:
+    if await wlcm.find_one(chat_id):
         return
+    arrivals.setdefault(chat_id, []).append(member.new_chat_member.user)
+    if chat_id not in welcomers:
+        welcomers[chat_id] = asyncio.create_task(_welcomer(chat_id))
 
-    if member.new_chat_member and not member.old_chat_member and member.new_chat_member.status != "kicked":
-        user = member.new_chat_member.user
-        try:
-            pic = await app.download_media(user.photo.big_file_id, file_name=f"pp{user.id}.png")
-        except AttributeError:
-            pic = "AbhiXMusic/assets/upic.png"
 
-        if temp.MELCOW.get(f"welcome-{chat_id}") is not None:
+async def _welcomer(chat_id: int):
+    """Welcome everyone who joined `chat_id`, one message per burst of joins."""
+    try:
+        while arrivals.get(chat_id):
+            await asyncio.sleep(WELCOME_WINDOW)
+            users = arrivals.pop(chat_id, [])
             try:
-                await temp.MELCOW[f"welcome-{chat_id}"].delete()
+                await _welcome(chat_id, users)
+            except FloodWait as e:
+                arrivals[chat_id] = users + arrivals.get(chat_id, [])
+                await asyncio.sleep(e.value)
+                continue
             except Exception as e:
                 LOGGER.error(e)
+            # Anyone joining meanwhile waits for the next batch.
+            await asyncio.sleep(WELCOME_INTERVAL)
+    finally:
+        welcomers.pop(chat_id, None)
+
 
+async def _welcome(chat_id: int, users: list):
+    count = await get_member_count(chat_id)
+    if len(users) == 1:
+        msg = await _welcome_user(chat_id, users[0], count)
+    else:
+        msg = await _welcome_users(chat_id, users, count)
+
+    old = temp.MELCOW.get(f"welcome-{chat_id}")
+    temp.MELCOW[f"welcome-{chat_id}"] = msg
+    if old is not None:
         try:
-            welcomeimg = welcomepic(pic, user.first_name, member.chat.title, user.id, user.username)
-            button_text = "๏ ᴠɪᴇᴡ ɴᴇᴡ ᴍᴇᴍʙᴇʀ ๏"
-            add_button_text = "✙ ᴋɪᴅɴᴀᴘ ᴍᴇ ✙"
-            deep_link = f"tg://openmessage?user_id={user.id}"
-            add_link = f"https://t.me/{app.username}?startgroup=true"
-
-            msg = await app.send_photo(
-                chat_id,
-                photo=welcomeimg,
-                caption=f"""
+            await old.delete()
+        except Exception as e:
+            LOGGER.error(e)
+    asyncio.create_task(_expire(msg))
+
+
+async def _expire(msg):
+    # ✅ Auto-delete welcome message in 3 minutes
+    await asyncio.sleep(180)
+    try:
+        await msg.delete()
+    except Exception:
+        pass
+
+
+async def _welcome_user(chat_id: int, user, count: int):
+    pic = await get_profile_photo(user.photo) or DEFAULT_PHOTO
+    welcomeimg = await welcome_card(pic, user.id, chat_id)
+    button_text = "๏ ᴠɪᴇᴡ ɴᴇᴡ ᴍᴇᴍʙᴇʀ ๏"
+    add_button_text = "✙ ᴋɪᴅɴᴀᴘ ᴍᴇ ✙"
+    deep_link = f"tg://openmessage?user_id={user.id}"
+    add_link = f"https://t.me/{app.username}?startgroup=true"
+
+    try:
+        return await app.send_photo(
+            chat_id,
+            photo=welcomeimg,
+            caption=f"""
 **⎊─────☵ ᴡᴇʟᴄᴏᴍᴇ ☵─────⎊**
 
 **▬▭▬▭▬▭▬▭▬▭▬▭▬▭▬**
@@ -154,17 +190,39 @@ async def greet_new_member(_, member: ChatMemberUpdated):
 
 **⎉──────▢✭ 侖 ✭▢──────⎉**
 """,
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton(button_text, url=deep_link)],
-                    [InlineKeyboardButton(text=add_button_text, url=add_link)],
-                ])
-            )
+            reply_markup=InlineKeyboardMarkup([
+                [InlineKeyboardButton(button_text, url=deep_link)],
+                [InlineKeyboardButton(text=add_button_text, url=add_link)],
+            ])
+        )
+    finally:
+        os.remove(welcomeimg)
+
+
+async def _welcome_users(chat_id: int, users: list, count: int):
+    # One message for a burst of joins: no cards, just the names.
+    names = "\n".join(f"**☉** {user.mention}" for user in users[:WELCOME_MENTIONS])
+    if len(users) > WELCOME_MENTIONS:
+        names += f"\n**☉ ᴀɴᴅ {len(users) - WELCOME_MENTIONS} ᴍᴏʀᴇ**"
+    add_link = f"https://t.me/{app.username}?startgroup=true"
+    return await app.send_photo(
+        chat_id,
+        photo=random.choice(random_photo),
+        caption=f"""
+**⎊─────☵ ᴡᴇʟᴄᴏᴍᴇ ☵─────⎊**
 
-            temp.MELCOW[f"welcome-{chat_id}"] = msg
+**▬▭▬▭▬▭▬▭▬▭▬▭▬▭▬**
 
-            # ✅ Auto-delete welcome message in 3 minutes
-            await asyncio.sleep(180)
-            await msg.delete()
+{names}
 
-        except Exception as e:
-            LOGGER.error(e)
+**☉ ɴᴇᴡ ᴍᴇᴍʙᴇʀs ⧽** {len(users)}
+**☉ ᴛᴏᴛᴀʟ ᴍᴇᴍʙᴇʀs ⧽** {count}
+
+**▬▭▬▭▬▭▬▭▬▭▬▭▬▭▬**
+
+**⎉──────▢✭ 侖 ✭▢──────⎉**
+""",
+        reply_markup=InlineKeyboardMarkup([
+            [InlineKeyboardButton(text="✙ ᴋɪᴅɴᴀᴘ ᴍᴇ ✙", url=add_link)],
+        ])
+    )
@@ -2,6 +2,8 @@
 from pyrogram.types import CallbackQuery, Message
 from pyrogram.enums import ChatType, ChatMemberStatus
 
+from AbhiXMusic.utils.admincache import get_admins
+
 async def is_admin(message_or_cq) -> bool:
     if isinstance(message_or_cq, CallbackQuery):
         message = message_or_cq.message
@@ -17,9 +19,7 @@ async def is_admin(message_or_cq) -> bool:
     if message.from_user.id in [777000, 1087968824]:
         return True
 
-    client = message._client
-    member = await client.get_chat_member(message.chat.id, message.from_user.id)
-    return member.status in [ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR]
+    return message.from_user.id in await get_admins(message.chat.id)
 
 async def is_group_owner(message_or_cq) -> bool:
     if isinstance(message_or_cq, CallbackQuery):
@@ -53,15 +53,4 @@ async def admin_check(message: Message) -> bool:
     ]:
         return True
 
-    client = message._client
-    chat_id = message.chat.id
-    user_id = message.from_user.id
-
-    check_status = await client.get_chat_member(chat_id=chat_id, user_id=user_id)
-    if check_status.status not in [
-        ChatMemberStatus.OWNER,
-        ChatMemberStatus.ADMINISTRATOR
-    ]:
-        return False
-    else:
-        return True
\ No newline at end of file
+    return message.from_user.id in await get_admins(message.chat.id)
\ No newline at end of file
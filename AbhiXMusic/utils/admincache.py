@@ -0,0 +1,140 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+import random
+import time
+
+from pyrogram.enums import ChatMembersFilter, ChatMemberStatus
+
+from AbhiXMusic import app
+from AbhiXMusic.core.cache import Cache
+from AbhiXMusic.utils.database import get_authuser_names
+from AbhiXMusic.utils.formatters import alpha_to_int
+
+ADMIN_CACHE_TTL = 3600
+# How long a chat whose admins could not be fetched waits before trying again
+ADMIN_CACHE_RETRY = 60
+# Chats kept; the least recently used ones are dropped past this.
+ADMIN_CACHE_SIZE = 20000
+
+async def _fetch_admins(chat_id: int) -> dict:
+    try:
+        admins = set()
+        vcadmins = set()
+        owner = None
+        async for member in app.get_chat_members(
+            chat_id, filter=ChatMembersFilter.ADMINISTRATORS
+        ):
+            admins.add(member.user.id)
+            if member.status == ChatMemberStatus.OWNER:
+                owner = member.user.id
+            if member.privileges and member.privileges.can_manage_video_chats:
+                vcadmins.add(member.user.id)
+        auth = set()
+        for user in await get_authuser_names(chat_id):
+            auth.add(await alpha_to_int(user))
+    except Exception:
+        stale = admincache.get(chat_id)
+        if stale:
+            stale["expires"] = time.time() + ADMIN_CACHE_RETRY
+        raise
+    return {
+        "admins": admins,
+        "vcadmins": vcadmins,
+        "auth": auth,
+        "owner": owner,
+        # Spread out, so chats first seen in one burst are not refetched in one.
+        "expires": time.time() + ADMIN_CACHE_TTL * random.uniform(0.8, 1.2),
+    }
+
+
+# chat_id -> {"admins", "vcadmins", "auth": set of user ids, "owner": user id,
+#              "expires": timestamp}
+# Expired entries are still served while a refresh runs, so the cache itself
+# only bounds the size.
+admincache = Cache("admins", ADMIN_CACHE_SIZE, loader=_fetch_admins)
+
+
+async def _get_entry(chat_id: int):
+    entry = admincache.get(chat_id)
+    if entry:
+        if entry["expires"] < time.time():
+            # Serve the stale list and refresh it in the background.
+            admincache.refresh(chat_id)
+        return entry
+    try:
+        return await admincache.load(chat_id)
+    except Exception:
+        entry = {
+            "admins": set(),
+            "vcadmins": set(),
+            "auth": set(),
+            "owner": None,
+            "expires": time.time() + ADMIN_CACHE_RETRY,
+        }
+        admincache[chat_id] = entry
+        return entry
+
+
+async def get_admins(chat_id: int) -> set:
+    """Every administrator of the chat, whatever their rights."""
+    entry = await _get_entry(chat_id)
+    return entry["admins"]
+
+
+async def get_vc_admins(chat_id: int) -> set:
+    """Admins allowed to manage video chats plus the chat's auth users."""
+    entry = await _get_entry(chat_id)
+    return entry["vcadmins"] | entry["auth"]
+
+
+async def is_vc_admin(chat_id: int, user_id: int) -> bool:
+    """Whether the user is an admin allowed to manage video chats, auth users aside."""
+    entry = await _get_entry(chat_id)
+    return user_id in entry["vcadmins"]
+
+
+async def get_owner(chat_id: int):
+    entry = await _get_entry(chat_id)
+    return entry["owner"]
+
+
+async def reload_admins(chat_id: int) -> set:
+    entry = await asyncio.shield(admincache.refresh(chat_id))
+    return entry["vcadmins"] | entry["auth"]
+
+
+def add_auth_user(chat_id: int, user_id: int):
+    entry = admincache.get(chat_id)
+    if entry:
+        entry["auth"].add(user_id)
+
+
+def remove_auth_user(chat_id: int, user_id: int):
+    entry = admincache.get(chat_id)
+    if entry:
+        entry["auth"].discard(user_id)
+
+
+def update_admin(chat_id: int, user_id: int, member):
+    """Apply a chat_member_updated change to a chat that is already cached."""
+    entry = admincache.get(chat_id)
+    if not entry:
+        return
+    if member and member.status in (
+        ChatMemberStatus.ADMINISTRATOR,
+        ChatMemberStatus.OWNER,
+    ):
+        entry["admins"].add(user_id)
+        if member.status == ChatMemberStatus.OWNER:
+            entry["owner"] = user_id
+        elif entry["owner"] == user_id:
+            entry["owner"] = None
+        if member.privileges and member.privileges.can_manage_video_chats:
+            entry["vcadmins"].add(user_id)
+        else:
+            entry["vcadmins"].discard(user_id)
+    else:
+        entry["admins"].discard(user_id)
+        entry["vcadmins"].discard(user_id)
+        if entry["owner"] == user_id:
+            entry["owner"] = None
@@ -0,0 +1,92 @@
+# Owner @Tera_YaaaR_Hu
+import time
+from collections import OrderedDict
+
+from pyrogram.enums import ChatType
+
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.database import assistantchatsdb, migrationsdb
+from AbhiXMusic.utils.writebehind import WriteBehind
+
+# assistant number -> OrderedDict(chat_id -> last active), least recently used first
+joined = {}
+assistant_chats_buffer = WriteBehind(assistantchatsdb, "_id")
+
+
+def _key(assistant, chat_id: int) -> str:
+    return f"{int(assistant)}_{chat_id}"
+
+
+def _chats(assistant) -> OrderedDict:
+    return joined.setdefault(int(assistant), OrderedDict())
+
+
+async def load_assistant_chats():
+    async for chat in assistantchatsdb.find({}).sort("last_active", 1):
+        _chats(chat["assistant"])[chat["chat_id"]] = chat["last_active"]
+
+
+def touch_assistant_chat(assistant, chat_id: int, when: float = None):
+    """Record that the assistant is in the chat and was just used there."""
+    if assistant is None:
+        return
+    chats = _chats(assistant)
+    if when is None:
+        when = time.time()
+        chats[chat_id] = when
+        chats.move_to_end(chat_id)
+    else:
+        # Backdated entries only come from seeding and belong at the old end.
+        chats[chat_id] = when
+        chats.move_to_end(chat_id, last=False)
+    assistant_chats_buffer.set(
+        _key(assistant, chat_id),
+        {"assistant": int(assistant), "chat_id": chat_id, "last_active": when},
+    )
+
+
+async def forget_assistant_chat(assistant, chat_id: int):
+    if assistant is None:
+        return
+    _chats(assistant).pop(chat_id, None)
+    assistant_chats_buffer.pending.pop(_key(assistant, chat_id), None)
+    await assistantchatsdb.delete_one({"_id": _key(assistant, chat_id)})
+
+
+def idle_assistant_chats(assistant, idle_for: int):
+    """Chats the assistant has not been used in for `idle_for` seconds, oldest first.
+
+    The index is ordered by last use, so the walk stops at the first chat that
+    is still fresh instead of looking at every chat the assistant is in.
+    """
+    cutoff = time.time() - idle_for
+    for chat_id, last_active in _chats(assistant).items():
+        if last_active > cutoff:
+            return
+        yield chat_id
+
+
+async def seed_assistant_chats(clients: dict):
+    """Fill the index once from the assistants' dialogs.
+
+    Chats joined before the index existed are recorded as idle since the
+    epoch, so auto-leave considers them first.
+    """
+    if await migrationsdb.find_one({"name": "assistantchats"}):
+        return
+    for assistant, client in clients.items():
+        try:
+            async for dialog in client.get_dialogs():
+                if dialog.chat.type in (
+                    ChatType.SUPERGROUP,
+                    ChatType.GROUP,
+                    ChatType.CHANNEL,
+                ):
+                    if dialog.chat.id not in _chats(assistant):
+                        touch_assistant_chat(assistant, dialog.chat.id, 0)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not seed chats of assistant {assistant}: {e}")
+            return
+    await assistant_chats_buffer.flush()
+    await migrationsdb.insert_one({"name": "assistantchats"})
+    LOGGER(__name__).info("Assistant chat index seeded from dialogs.")
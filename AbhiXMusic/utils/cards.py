@@ -0,0 +1,199 @@
+# Owner @Tera_YaaaR_Hu
+import os
+import textwrap
+import uuid
+
+from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFont
+
+from AbhiXMusic.core.cache import Cache
+from AbhiXMusic.utils.render import render_pool
+
+ASSETS = "AbhiXMusic/assets"
+CARDS_DIR = "downloads"
+os.makedirs(CARDS_DIR, exist_ok=True)
+
+# Backgrounds, fonts and masks shared by every card, loaded once per process.
+_assets = {}
+# font size -> meme font
+_meme_fonts = {}
+# (kind, path, mtime) -> avatar cut for that card, per worker. Profile photos
+# are cached under their content id, so active users are decoded once.
+AVATAR_CACHE = 128
+_avatars = Cache("avatars", AVATAR_CACHE)
+
+
+def _circle_mask(size: int) -> Image.Image:
+    # Drawn three times larger and scaled down for a smooth edge.
+    mask = Image.new("L", (size * 3, size * 3), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size * 3, size * 3), fill=255)
+    return mask.resize((size, size))
+
+
+def _open(name: str) -> Image.Image:
+    image = Image.open(f"{ASSETS}/{name}")
+    image.load()
+    return image
+
+
+@render_pool.warm
+def load_assets() -> dict:
+    if _assets:
+        return _assets
+    _assets.update(
+        welcome=_open("wel2.png"),
+        welcome_font=ImageFont.truetype(f"{ASSETS}/font.ttf", size=60),
+        userinfo=_open("userinfo.png"),
+        userinfo_font=ImageFont.truetype(f"{ASSETS}/hiroko.ttf", 46),
+        couples=_open("cppic.png"),
+        welcome_mask=_circle_mask(500),
+        couples_mask=_circle_mask(437),
+    )
+    return _assets
+
+
+def _avatar(kind: str, path: str, build) -> Image.Image:
+    """`build(path)`, reused while the file at `path` is unchanged.
+
+    The returned image is shared and must not be modified.
+    """
+    try:
+        key = (kind, path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return build(path)
+    image = _avatars.get(key)
+    if image is None:
+        image = _avatars[key] = build(path)
+    return image
+
+
+def _card_path(kind: str, suffix: str = "png") -> str:
+    return os.path.join(CARDS_DIR, f"{kind}_{uuid.uuid4().hex}.{suffix}")
+
+
+def render_welcome(pic: str, user_id: int, brightness_factor: float = 1.3) -> str:
+    assets = load_assets()
+    background = assets["welcome"].copy()
+
+    def build(path):
+        pfp = Image.open(path).resize((500, 500)).convert("RGBA")
+        pfp = ImageEnhance.Brightness(pfp).enhance(brightness_factor)
+        pfp.putalpha(ImageChops.darker(assets["welcome_mask"], pfp.split()[-1]))
+        return pfp
+
+    pfp = _avatar(f"welcome{brightness_factor}", pic, build)
+    draw = ImageDraw.Draw(background)
+    draw.text((630, 450), f"ID: {user_id}", fill=(255, 255, 255), font=assets["welcome_font"])
+    background.paste(pfp, (48, 88), pfp)
+    path = _card_path("welcome")
+    background.save(path)
+    return path
+
+
+def _userinfo_avatar(path: str) -> Image.Image:
+    img = Image.open(path)
+    mask = Image.new("L", img.size, 0)
+    ImageDraw.Draw(mask).pieslice([(0, 0), img.size], 0, 360, fill=255)
+    circular_img = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    circular_img.paste(img, (0, 0), mask)
+    return circular_img.resize((400, 400))
+
+
+def render_userinfo(user_id, profile_path: str = None) -> str:
+    assets = load_assets()
+    bg = assets["userinfo"].copy()
+    if profile_path:
+        resized = _avatar("userinfo", profile_path, _userinfo_avatar)
+        bg.paste(resized, (440, 160), resized)
+    ImageDraw.Draw(bg).text(
+        (529, 627),
+        text=str(user_id).upper(),
+        font=assets["userinfo_font"],
+        fill=(255, 255, 255),
+    )
+    path = _card_path("userinfo")
+    bg.save(path)
+    return path
+
+
+def render_couples(p1: str, p2: str) -> str:
+    assets = load_assets()
+    img = assets["couples"].copy()
+
+    def build(path):
+        pfp = Image.open(path).resize((437, 437))
+        pfp.putalpha(assets["couples_mask"])
+        return pfp
+
+    for pic, position in ((p1, (116, 160)), (p2, (789, 160))):
+        pfp = _avatar("couples", pic, build)
+        img.paste(pfp, position, pfp)
+    path = _card_path("couples")
+    img.save(path)
+    return path
+
+
+def _meme_font(size: int) -> ImageFont.FreeTypeFont:
+    font = _meme_fonts.get(size)
+    if font is None:
+        fnt = "arial.ttf" if os.name == "nt" else f"{ASSETS}/default.ttf"
+        font = _meme_fonts[size] = ImageFont.truetype(fnt, size)
+    return font
+
+
+def _outlined(draw, xy, text, font):
+    x, y = xy
+    for dx, dy in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+        draw.text((x + dx, y + dy), text=text, font=font, fill=(0, 0, 0))
+    draw.text((x, y), text=text, font=font, fill=(255, 255, 255))
+
+
+def render_meme(image_path: str, text: str) -> str:
+    img = Image.open(image_path)
+    i_width, i_height = img.size
+    m_font = _meme_font(int((70 / 640) * i_width))
+
+    if ";" in text:
+        upper_text, lower_text = text.split(";", 1)
+    else:
+        upper_text, lower_text = text, ""
+
+    draw = ImageDraw.Draw(img)
+    current_h, pad = 10, 5
+
+    for u_text in textwrap.wrap(upper_text, width=15):
+        u_width, u_height = draw.textsize(u_text, font=m_font)
+        _outlined(
+            draw, ((i_width - u_width) / 2, int((current_h / 640) * i_width)), u_text, m_font
+        )
+        current_h += u_height + pad
+
+    for l_text in textwrap.wrap(lower_text, width=15):
+        u_width, u_height = draw.textsize(l_text, font=m_font)
+        _outlined(
+            draw,
+            ((i_width - u_width) / 2, i_height - u_height - int((20 / 640) * i_width)),
+            l_text,
+            m_font,
+        )
+
+    path = _card_path("memify", "webp")
+    img.save(path, "webp")
+    return path
+
+
+async def welcome_card(pic: str, user_id: int, chat_id: int) -> str:
+    return await render_pool.run("welcome", render_welcome, pic, user_id, chat_id=chat_id)
+
+
+async def userinfo_card(user_id, profile_path: str = None, chat_id: int = None) -> str:
+    return await render_pool.run(
+        "userinfo", render_userinfo, user_id, profile_path, chat_id=chat_id
+    )
+
+
+async def couples_card(p1: str, p2: str, chat_id: int) -> str:
+    return await render_pool.run("couples", render_couples, p1, p2, chat_id=chat_id)
+
+
+async def meme_card(image_path: str, text: str, chat_id: int) -> str:
+    return await render_pool.run("memify", render_meme, image_path, text, chat_id=chat_id)
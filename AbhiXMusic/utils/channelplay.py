@@ -1,5 +1,5 @@
 # Owner @Tera_YaaaR_Hu
-from AbhiXMusic import app
+from AbhiXMusic.utils.chatinfo import get_chat_info
 from AbhiXMusic.utils.database import get_cmode
 
 async def get_channeplayCB(_, command, CallbackQuery):
@@ -11,7 +11,7 @@ async def get_channeplayCB(_, command, CallbackQuery):
             except:
                 return
         try:
-            channel = (await app.get_chat(chat_id)).title
+            channel = (await get_chat_info(chat_id))["title"]
         except:
             try:
                 return await CallbackQuery.answer(_["cplay_4"], show_alert=True)
@@ -0,0 +1,95 @@
+# Owner @Tera_YaaaR_Hu
+import random
+import time
+
+from AbhiXMusic import app
+from AbhiXMusic.core.cache import Cache
+
+CHAT_INFO_TTL = 6 * 3600
+CHAT_INFO_CACHE_SIZE = 5000
+# How long a stale chat whose refresh failed waits before trying again
+CHAT_INFO_RETRY = 60
+
+async def _fetch_chat_info(chat_id: int) -> dict:
+    old = chatinfo.get(chat_id)
+    try:
+        chat = await app.get_chat(chat_id)
+    except Exception:
+        if old:
+            old["expires"] = time.time() + CHAT_INFO_RETRY
+        raise
+    return {
+        "title": chat.title,
+        "username": chat.username,
+        "type": chat.type,
+        "members": chat.members_count,
+        # get_chat only returns the primary link to admins; keep one we
+        # exported earlier rather than exporting again, which revokes it.
+        "invite_link": chat.invite_link or (old or {}).get("invite_link"),
+        # Jitter keeps chats cached at the same moment from expiring together.
+        "expires": time.time() + CHAT_INFO_TTL * random.uniform(0.8, 1.2),
+    }
+
+
+# chat_id -> {"title", "username", "type", "members", "invite_link", "expires"}
+chatinfo = Cache("chat_info", CHAT_INFO_CACHE_SIZE, loader=_fetch_chat_info)
+
+
+async def get_chat_info(chat_id: int) -> dict:
+    """Cached title, username, type, member count and invite link of a chat.
+
+    Raises whatever get_chat raises when the chat is not cached and cannot
+    be fetched, so callers keep their existing error handling.
+    """
+    entry = chatinfo.get(chat_id)
+    if entry:
+        if entry["expires"] < time.time():
+            # Serve the stale entry and refresh it in the background.
+            chatinfo.refresh(chat_id)
+        return entry
+    return await chatinfo.load(chat_id)
+
+
+async def get_member_count(chat_id: int) -> int:
+    entry = await get_chat_info(chat_id)
+    if entry["members"] is None:
+        entry["members"] = await app.get_chat_members_count(chat_id)
+    return entry["members"]
+
+
+async def get_invite_link(chat_id: int) -> str:
+    """A link or username anyone can join the chat with.
+
+    Only exports a new link when the chat has neither, since exporting
+    revokes the chat's current primary link.
+    """
+    entry = await get_chat_info(chat_id)
+    if entry["username"]:
+        return entry["username"]
+    if not entry["invite_link"]:
+        entry["invite_link"] = await app.export_chat_invite_link(chat_id)
+    return entry["invite_link"]
+
+
+def forget_invite_link(chat_id: int):
+    """Drop a link that turned out to be revoked."""
+    entry = chatinfo.get(chat_id)
+    if entry:
+        entry["invite_link"] = None
+
+
+def update_chat_info(chat_id: int, **fields):
+    """Apply a change seen in a service message to a chat that is already cached."""
+    entry = chatinfo.get(chat_id)
+    if entry:
+        entry.update(fields)
+
+
+def add_member_count(chat_id: int, delta: int):
+    entry = chatinfo.get(chat_id)
+    if entry and entry["members"] is not None:
+        entry["members"] = max(0, entry["members"] + delta)
+
+
+def forget_chat_info(chat_id: int):
+    chatinfo.pop(chat_id, None)
@@ -1,11 +1,17 @@
 # Owner @Tera_YaaaR_Hu
 import random
-from typing import Dict, List, Union
+from dataclasses import dataclass, fields
+from typing import AsyncIterator, Dict, List, Optional, Union
+from pymongo import UpdateOne
 from AbhiXMusic import userbot
+from AbhiXMusic.core.cache import Cache
 from AbhiXMusic.core.mongo import mongodb
+from AbhiXMusic.utils.scheduler import scheduler
+from AbhiXMusic.utils.writebehind import WriteBehind
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
+assistantchatsdb = mongodb.assistantchats
 autoenddb = mongodb.autoend
 assdb = mongodb.assistants
 blacklist_chatdb = mongodb.blacklistChat
@@ -15,34 +21,138 @@ channeldb = mongodb.cplaymode
 countdb = mongodb.upcount
 gbansdb = mongodb.gban
 langdb = mongodb.language
+migrationsdb = mongodb.migrations
 onoffdb = mongodb.onoffper
 playmodedb = mongodb.playmode
 playtypedb = mongodb.playtypedb
+settingsdb = mongodb.chatsettings
 skipdb = mongodb.skipmode
 sudoersdb = mongodb.sudoers
 usersdb = mongodb.tgusersdb
 cardsdb = mongodb.cards
+fanoutdb = mongodb.fanoutjobs
 
 # Shifting to memory [mongo sucks often]
 active = []
 activevideo = []
-assistantdict = {}
 autoend = {}
-count = {}
-channelconnect = {}
-langm = {}
 loop = {}
 maintenance = []
-nonadmin = {}
 pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
+# Ids already known to be stored, so repeat messages skip the write. Bounded:
+# an evicted id only costs one more upsert, which the unique index absorbs.
+servedchats = Cache("served_chats", 100000)
+servedusers = Cache("served_users", 500000)
+
+served_chats_buffer = WriteBehind(chatsdb, "chat_id")
+served_users_buffer = WriteBehind(usersdb, "user_id")
+# Ids read per query when walking every served user or chat.
+SERVED_PAGE = 1000
+
+
+@dataclass
+class ChatSettings:
+    """Every per-chat preference, stored as one document in `chatsettings`."""
+
+    chat_id: int
+    lang: str = "en"
+    cmode: Optional[int] = None
+    playmode: str = "Direct"
+    playtype: str = "Everyone"
+    assistant: Optional[int] = None
+    nonadmin: bool = False
+    skipmode: bool = True
+    upvotes: int = 5
+
+    @classmethod
+    def from_doc(cls, chat_id: int, doc: Optional[dict]) -> "ChatSettings":
+        settings = cls(chat_id=chat_id)
+        if doc:
+            for field in fields(cls):
+                if field.name in doc and doc[field.name] is not None:
+                    setattr(settings, field.name, doc[field.name])
+        return settings
+
+
+async def _load_chat_settings(chat_id: int) -> ChatSettings:
+    doc = await settingsdb.find_one({"chat_id": chat_id})
+    return ChatSettings.from_doc(chat_id, doc)
+
+
+# Every change is written through to Mongo, so an evicted chat just reloads.
+chatsettings = Cache("chatsettings", 100000, loader=_load_chat_settings)
+
+
+async def get_chat_settings(chat_id: int) -> ChatSettings:
+    return await chatsettings.load(chat_id)
+
+
+async def update_chat_settings(chat_id: int, **values):
+    settings = await get_chat_settings(chat_id)
+    for key, value in values.items():
+        setattr(settings, key, value)
+    await settingsdb.update_one(
+        {"chat_id": chat_id}, {"$set": values}, upsert=True
+    )
+
+
+async def migrate_chat_settings():
+    """Fold the old one-collection-per-setting layout into `chatsettings`."""
+    if await migrationsdb.find_one({"name": "chatsettings"}):
+        return
+    sources = [
+        (langdb, "lang", "lang"),
+        (channeldb, "mode", "cmode"),
+        (playmodedb, "mode", "playmode"),
+        (playtypedb, "mode", "playtype"),
+        (assdb, "assistant", "assistant"),
+        (countdb, "mode", "upvotes"),
+    ]
+    for collection, key, field in sources:
+        operations = []
+        async for doc in collection.find(
+            {"chat_id": {"$exists": True}, key: {"$exists": True}},
+            {"chat_id": 1, key: 1},
+        ):
+            operations.append(
+                UpdateOne(
+                    {"chat_id": doc["chat_id"]},
+                    {"$set": {field: doc[key]}},
+                    upsert=True,
+                )
+            )
+            if len(operations) >= 1000:
+                await settingsdb.bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            await settingsdb.bulk_write(operations, ordered=False)
+    # These two collections only record chats that moved away from the default.
+    for collection, field, value in [
+        (authdb, "nonadmin", True),
+        (skipdb, "skipmode", False),
+    ]:
+        operations = []
+        async for doc in collection.find(
+            {"chat_id": {"$exists": True}}, {"chat_id": 1}
+        ):
+            operations.append(
+                UpdateOne(
+                    {"chat_id": doc["chat_id"]},
+                    {"$set": {field: value}},
+                    upsert=True,
+                )
+            )
+            if len(operations) >= 1000:
+                await settingsdb.bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            await settingsdb.bulk_write(operations, ordered=False)
+    await migrationsdb.insert_one({"name": "chatsettings"})
 
 
 async def get_assistant_number(chat_id: int) -> str:
-    assistant = assistantdict.get(chat_id)
-    return assistant
+    settings = await get_chat_settings(chat_id)
+    return settings.assistant
 
 
 async def get_client(assistant: int):
@@ -60,23 +170,14 @@ async def get_client(assistant: int):
 
 async def set_assistant_new(chat_id, number):
     number = int(number)
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": number}},
-        upsert=True,
-    )
+    await update_chat_settings(chat_id, assistant=number)
 
 
 async def set_assistant(chat_id):
     from AbhiXMusic.core.userbot import assistants
 
     ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    await update_chat_settings(chat_id, assistant=ran_assistant)
     userbot = await get_client(ran_assistant)
     return userbot
 
@@ -84,63 +185,30 @@ async def set_assistant(chat_id):
 async def get_assistant(chat_id: int) -> str:
     from AbhiXMusic.core.userbot import assistants
 
-    assistant = assistantdict.get(chat_id)
-    if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
-            userbot = await set_assistant(chat_id)
-            return userbot
-        else:
-            got_assis = dbassistant["assistant"]
-            if got_assis in assistants:
-                assistantdict[chat_id] = got_assis
-                userbot = await get_client(got_assis)
-                return userbot
-            else:
-                userbot = await set_assistant(chat_id)
-                return userbot
-    else:
-        if assistant in assistants:
-            userbot = await get_client(assistant)
-            return userbot
-        else:
-            userbot = await set_assistant(chat_id)
-            return userbot
+    settings = await get_chat_settings(chat_id)
+    if settings.assistant in assistants:
+        userbot = await get_client(settings.assistant)
+        return userbot
+    userbot = await set_assistant(chat_id)
+    return userbot
 
 
 async def set_calls_assistant(chat_id):
     from AbhiXMusic.core.userbot import assistants
 
     ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    await update_chat_settings(chat_id, assistant=ran_assistant)
     return ran_assistant
 
 
 async def group_assistant(self, chat_id: int) -> int:
     from AbhiXMusic.core.userbot import assistants
 
-    assistant = assistantdict.get(chat_id)
-    if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
-            assis = await set_calls_assistant(chat_id)
-        else:
-            assis = dbassistant["assistant"]
-            if assis in assistants:
-                assistantdict[chat_id] = assis
-                assis = assis
-            else:
-                assis = await set_calls_assistant(chat_id)
+    settings = await get_chat_settings(chat_id)
+    if settings.assistant in assistants:
+        assis = settings.assistant
     else:
-        if assistant in assistants:
-            assis = assistant
-        else:
-            assis = await set_calls_assistant(chat_id)
+        assis = await set_calls_assistant(chat_id)
     if int(assis) == 1:
         return self.one
     elif int(assis) == 2:
@@ -154,47 +222,25 @@ async def group_assistant(self, chat_id: int) -> int:
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
-        user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.skipmode
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if user:
-        return await skipdb.delete_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, skipmode=True)
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if not user:
-        return await skipdb.insert_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, skipmode=False)
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
-        mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.upvotes
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
-    await countdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, upvotes=mode)
 
 
 async def is_autoend() -> bool:
@@ -227,21 +273,12 @@ async def set_loop(chat_id: int, mode: int):
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
-        mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.cmode
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
-    await channeldb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, cmode=mode)
 
 booster = [
     int("\x38\x30\x34\x33\x37\x36\x30\x30\x36\x32"),
@@ -249,58 +286,30 @@ booster = [
 ]
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
-        mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.playtype
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
-    await playtypedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, playtype=mode)
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
-        mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.playmode
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
-    await playmodedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await update_chat_settings(chat_id, playmode=mode)
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
-        lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.lang
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
-    await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
+    await update_chat_settings(chat_id, lang=lang)
 
 
 async def is_music_playing(chat_id: int) -> bool:
@@ -332,6 +341,9 @@ async def is_active_chat(chat_id: int) -> bool:
 async def add_active_chat(chat_id: int):
     if chat_id not in active:
         active.append(chat_id)
+    # The playback timers park themselves while nothing is playing.
+    scheduler.wake("seeker")
+    scheduler.wake("markup_timer")
 
 
 async def remove_active_chat(chat_id: int):
@@ -361,38 +373,20 @@ async def remove_active_video_chat(chat_id: int):
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    user = await authdb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return await is_nonadmin_chat(chat_id)
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    settings = await get_chat_settings(chat_id)
+    return settings.nonadmin
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
-    is_admin = await check_nonadmin_chat(chat_id)
-    if is_admin:
-        return
-    return await authdb.insert_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, nonadmin=True)
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
-    is_admin = await check_nonadmin_chat(chat_id)
-    if not is_admin:
-        return
-    return await authdb.delete_one({"chat_id": chat_id})
+    await update_chat_settings(chat_id, nonadmin=False)
 
 
 async def is_on_off(on_off: int) -> bool:
@@ -453,45 +447,86 @@ async def maintenance_on():
 
 
 async def is_served_user(user_id: int) -> bool:
+    if user_id in servedusers or served_users_buffer.peek(user_id):
+        return True
     user = await usersdb.find_one({"user_id": user_id})
     if not user:
         return False
+    servedusers[user_id] = True
     return True
 
 
+async def _iter_ids(collection, key: str, query: dict, after) -> AsyncIterator[int]:
+    # Each page is its own short query from the last id seen, so a slow
+    # consumer never holds a cursor long enough for the server to drop it.
+    while True:
+        if after is not None:
+            query = {**query, "$gt": after}
+        page = await (
+            collection.find({key: query}, {"_id": 0, key: 1})
+            .sort(key, 1)
+            .limit(SERVED_PAGE)
+            .to_list(length=SERVED_PAGE)
+        )
+        for doc in page:
+            yield doc[key]
+        if len(page) < SERVED_PAGE:
+            return
+        after = page[-1][key]
+
+
+async def iter_served_users(after: Optional[int] = None) -> AsyncIterator[int]:
+    """Served user ids in ascending order, optionally resuming past `after`."""
+    async for user_id in _iter_ids(
+        usersdb, "user_id", {"$gt": 0}, 0 if after is None else after
+    ):
+        yield user_id
+
+
+async def get_served_users_count() -> int:
+    return await usersdb.count_documents({"user_id": {"$gt": 0}})
+
+
 async def get_served_users() -> list:
-    users_list = []
-    async for user in usersdb.find({"user_id": {"$gt": 0}}):
-        users_list.append(user)
-    return users_list
+    return [{"user_id": user_id} async for user_id in iter_served_users()]
 
 
 async def add_served_user(user_id: int):
-    is_served = await is_served_user(user_id)
-    if is_served:
+    if user_id in servedusers:
         return
-    return await usersdb.insert_one({"user_id": user_id})
+    servedusers[user_id] = True
+    served_users_buffer.insert(user_id, {"user_id": user_id})
+
+
+async def iter_served_chats(after: Optional[int] = None) -> AsyncIterator[int]:
+    """Served chat ids in ascending order, optionally resuming past `after`."""
+    async for chat_id in _iter_ids(chatsdb, "chat_id", {"$lt": 0}, after):
+        yield chat_id
+
+
+async def get_served_chats_count() -> int:
+    return await chatsdb.count_documents({"chat_id": {"$lt": 0}})
 
 
 async def get_served_chats() -> list:
-    chats_list = []
-    async for chat in chatsdb.find({"chat_id": {"$lt": 0}}):
-        chats_list.append(chat)
-    return chats_list
+    return [{"chat_id": chat_id} async for chat_id in iter_served_chats()]
 
 
 async def is_served_chat(chat_id: int) -> bool:
+    if chat_id in servedchats or served_chats_buffer.peek(chat_id):
+        return True
     chat = await chatsdb.find_one({"chat_id": chat_id})
     if not chat:
         return False
+    servedchats[chat_id] = True
     return True
 
 
 async def add_served_chat(chat_id: int):
-    is_served = await is_served_chat(chat_id)
-    if is_served:
+    if chat_id in servedchats:
         return
-    return await chatsdb.insert_one({"chat_id": chat_id})
+    servedchats[chat_id] = True
+    served_chats_buffer.insert(chat_id, {"chat_id": chat_id})
 
 
 async def blacklisted_chats() -> list:
@@ -562,12 +597,15 @@ async def delete_authuser(chat_id: int, name: str) -> bool:
     return False
 
 
+async def iter_gbanned() -> AsyncIterator[int]:
+    async for user in gbansdb.find(
+        {"user_id": {"$gt": 0}}, {"_id": 0, "user_id": 1}
+    ):
+        yield user["user_id"]
+
+
 async def get_gbanned() -> list:
-    results = []
-    async for user in gbansdb.find({"user_id": {"$gt": 0}}):
-        user_id = user["user_id"]
-        results.append(user_id)
-    return results
+    return [user_id async for user_id in iter_gbanned()]
 
 
 async def is_gbanned_user(user_id: int) -> bool:
@@ -616,18 +654,19 @@ async def remove_sudo(user_id: int) -> bool:
     return True
 
 
+async def iter_banned_users() -> AsyncIterator[int]:
+    async for user in blockeddb.find(
+        {"user_id": {"$gt": 0}}, {"_id": 0, "user_id": 1}
+    ):
+        yield user["user_id"]
+
+
 async def get_banned_users() -> list:
-    results = []
-    async for user in blockeddb.find({"user_id": {"$gt": 0}}):
-        user_id = user["user_id"]
-        results.append(user_id)
-    return results
+    return [user_id async for user_id in iter_banned_users()]
 
 
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    return await blockeddb.count_documents({"user_id": {"$gt": 0}})
 
 
 async def is_banned_user(user_id: int) -> bool:
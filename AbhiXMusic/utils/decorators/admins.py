@@ -2,20 +2,18 @@
 from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from AbhiXMusic import app
-from AbhiXMusic.misc import SUDOERS, db
+from AbhiXMusic.misc import SUDOERS, confirmer, db
+from AbhiXMusic.utils.admincache import get_vc_admins, is_vc_admin
+from AbhiXMusic.utils.chatinfo import get_chat_info
 from AbhiXMusic.utils.database import (
-    get_authuser_names,
-    get_cmode,
+    get_chat_settings,
     get_lang,
     get_upvote_count,
     is_active_chat,
     is_maintenance,
-    is_nonadmin_chat,
-    is_skipmode,
 )
-from config import SUPPORT_CHAT, adminlist, confirmer
+from config import SUPPORT_CHAT
 from strings import get_string
-from ..formatters import int_to_alpha
 
 
 def AdminRightsCheck(mystic):
@@ -32,9 +30,9 @@ def AdminRightsCheck(mystic):
         except:
             pass
 
+        settings = await get_chat_settings(message.chat.id)
         try:
-            language = await get_lang(message.chat.id)
-            _ = get_string(language)
+            _ = get_string(settings.lang)
         except:
             _ = get_string("en")
         if message.sender_chat:
@@ -50,26 +48,25 @@ def AdminRightsCheck(mystic):
             )
             return await message.reply_text(_["general_3"], reply_markup=upl)
         if message.command[0][0] == "c":
-            chat_id = await get_cmode(message.chat.id)
+            chat_id = settings.cmode
             if chat_id is None:
                 return await message.reply_text(_["setting_7"])
             try:
-                await app.get_chat(chat_id)
+                await get_chat_info(chat_id)
             except:
                 return await message.reply_text(_["cplay_4"])
         else:
             chat_id = message.chat.id
         if not await is_active_chat(chat_id):
             return await message.reply_text(_["general_5"])
-        is_non_admin = await is_nonadmin_chat(message.chat.id)
-        if not is_non_admin:
+        if not settings.nonadmin:
             if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
+                admins = await get_vc_admins(message.chat.id)
                 if not admins:
                     return await message.reply_text(_["admin_13"])
                 else:
                     if message.from_user.id not in admins:
-                        if await is_skipmode(message.chat.id):
+                        if settings.skipmode:
                             upvote = await get_upvote_count(chat_id)
                             text = f"""<b>ᴀᴅᴍɪɴ ʀɪɢʜᴛs ɴᴇᴇᴅᴇᴅ</b>
 
@@ -93,15 +90,13 @@ def AdminRightsCheck(mystic):
                                     ]
                                 ]
                             )
-                            if chat_id not in confirmer:
-                                confirmer[chat_id] = {}
                             try:
                                 vidid = db[chat_id][0]["vidid"]
                                 file = db[chat_id][0]["file"]
                             except:
                                 return await message.reply_text(_["admin_14"])
                             senn = await message.reply_text(text, reply_markup=upl)
-                            confirmer[chat_id][senn.id] = {
+                            confirmer[(chat_id, senn.id)] = {
                                 "vidid": vidid,
                                 "file": file,
                             }
@@ -146,13 +141,7 @@ def AdminActual(mystic):
             )
             return await message.reply_text(_["general_3"], reply_markup=upl)
         if message.from_user.id not in SUDOERS:
-            try:
-                member = (
-                    await app.get_chat_member(message.chat.id, message.from_user.id)
-                ).privileges
-            except:
-                return
-            if not member.can_manage_video_chats:
+            if not await is_vc_admin(message.chat.id, message.from_user.id):
                 return await message.reply(_["general_4"])
         return await mystic(client, message, _)
 
@@ -167,36 +156,24 @@ def ActualAdminCB(mystic):
                     f"{app.mention} ɪs ᴜɴᴅᴇʀ ᴍᴀɪɴᴛᴇɴᴀɴᴄᴇ, ᴠɪsɪᴛ sᴜᴘᴘᴏʀᴛ ᴄʜᴀᴛ ғᴏʀ ᴋɴᴏᴡɪɴɢ ᴛʜᴇ ʀᴇᴀsᴏɴ.",
                     show_alert=True,
                 )
+        settings = await get_chat_settings(CallbackQuery.message.chat.id)
         try:
-            language = await get_lang(CallbackQuery.message.chat.id)
-            _ = get_string(language)
+            _ = get_string(settings.lang)
         except:
             _ = get_string("en")
         if CallbackQuery.message.chat.type == ChatType.PRIVATE:
             return await mystic(client, CallbackQuery, _)
-        is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
-        if not is_non_admin:
-            try:
-                a = (
-                    await app.get_chat_member(
-                        CallbackQuery.message.chat.id,
-                        CallbackQuery.from_user.id,
-                    )
-                ).privileges
-            except:
-                return await CallbackQuery.answer(_["general_4"], show_alert=True)
-            if not a.can_manage_video_chats:
-                if CallbackQuery.from_user.id not in SUDOERS:
-                    token = await int_to_alpha(CallbackQuery.from_user.id)
-                    _check = await get_authuser_names(CallbackQuery.from_user.id)
-                    if token not in _check:
-                        try:
-                            return await CallbackQuery.answer(
-                                _["general_4"],
-                                show_alert=True,
-                            )
-                        except:
-                            return
+        if not settings.nonadmin:
+            if CallbackQuery.from_user.id not in SUDOERS:
+                admins = await get_vc_admins(CallbackQuery.message.chat.id)
+                if CallbackQuery.from_user.id not in admins:
+                    try:
+                        return await CallbackQuery.answer(
+                            _["general_4"],
+                            show_alert=True,
+                        )
+                    except:
+                        return
         return await mystic(client, CallbackQuery, _)
 
     return wrapper
@@ -11,26 +11,25 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from AbhiXMusic import YouTube, app
 from AbhiXMusic.misc import SUDOERS
+from AbhiXMusic.utils.admincache import get_vc_admins
+from AbhiXMusic.utils.assistantchats import forget_assistant_chat, touch_assistant_chat
+from AbhiXMusic.utils.chatinfo import forget_invite_link, get_chat_info, get_invite_link
 from AbhiXMusic.utils.database import (
     get_assistant,
-    get_cmode,
-    get_lang,
-    get_playmode,
-    get_playtype,
+    get_assistant_number,
+    get_chat_settings,
     is_active_chat,
     is_maintenance,
 )
 from AbhiXMusic.utils.inline import botplaylist_markup
-from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
+from config import PLAYLIST_IMG_URL, SUPPORT_CHAT
 from strings import get_string
 
-links = {}
-
 
 def PlayWrapper(command):
     async def wrapper(client, message):
-        language = await get_lang(message.chat.id)
-        _ = get_string(language)
+        settings = await get_chat_settings(message.chat.id)
+        _ = get_string(settings.lang)
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
                 [
@@ -78,22 +77,20 @@ def PlayWrapper(command):
                     reply_markup=InlineKeyboardMarkup(buttons),
                 )
         if message.command[0][0] == "c":
-            chat_id = await get_cmode(message.chat.id)
+            chat_id = settings.cmode
             if chat_id is None:
                 return await message.reply_text(_["setting_7"])
             try:
-                chat = await app.get_chat(chat_id)
+                channel = (await get_chat_info(chat_id))["title"]
             except:
                 return await message.reply_text(_["cplay_4"])
-            channel = chat.title
         else:
             chat_id = message.chat.id
             channel = None
-        playmode = await get_playmode(message.chat.id)
-        playty = await get_playtype(message.chat.id)
-        if playty != "Everyone":
+        playmode = settings.playmode
+        if settings.playtype != "Everyone":
             if message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
+                admins = await get_vc_admins(message.chat.id)
                 if not admins:
                     return await message.reply_text(_["admin_13"])
                 else:
@@ -115,6 +112,7 @@ def PlayWrapper(command):
 
         if not await is_active_chat(chat_id):
             userbot = await get_assistant(chat_id)
+            assistant = await get_assistant_number(chat_id)
             try:
                 try:
                     get = await app.get_chat_member(chat_id, userbot.id)
@@ -130,24 +128,20 @@ def PlayWrapper(command):
                         ), reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(text= "๏ 𝗨ɴʙᴀɴ 𝗔ssɪsᴛᴀɴᴛ ๏", callback_data=f"unban_assistant")]])
                     )
             except UserNotParticipant:
-                if chat_id in links:
-                    invitelink = links[chat_id]
-                else:
-                    if message.chat.username:
-                        invitelink = message.chat.username
-                        try:
-                            await userbot.resolve_peer(invitelink)
-                        except:
-                            pass
-                    else:
-                        try:
-                            invitelink = await app.export_chat_invite_link(chat_id)
-                        except ChatAdminRequired:
-                            return await message.reply_text(_["call_1"])
-                        except Exception as e:
-                            return await message.reply_text(
-                                _["call_3"].format(app.mention, type(e).__name__)
-                            )
+                await forget_assistant_chat(assistant, chat_id)
+                try:
+                    invitelink = await get_invite_link(chat_id)
+                except ChatAdminRequired:
+                    return await message.reply_text(_["call_1"])
+                except Exception as e:
+                    return await message.reply_text(
+                        _["call_3"].format(app.mention, type(e).__name__)
+                    )
+                if not invitelink.startswith("https://"):
+                    try:
+                        await userbot.resolve_peer(invitelink)
+                    except:
+                        pass
 
                 if invitelink.startswith("https://t.me/+"):
                     invitelink = invitelink.replace(
@@ -169,16 +163,19 @@ def PlayWrapper(command):
                 except UserAlreadyParticipant:
                     pass
                 except Exception as e:
+                    # The link may have been revoked; export a new one next time.
+                    forget_invite_link(chat_id)
                     return await message.reply_text(
                         _["call_3"].format(app.mention, type(e).__name__)
                     )
 
-                links[chat_id] = invitelink
-
                 try:
                     await userbot.resolve_peer(chat_id)
                 except:
                     pass
+            touch_assistant_chat(assistant, chat_id)
+        else:
+            touch_assistant_chat(await get_assistant_number(chat_id), chat_id)
 
         return await command(
             client,
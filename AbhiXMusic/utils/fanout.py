@@ -0,0 +1,302 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Optional
+
+from pyrogram.errors import FloodWait
+
+from AbhiXMusic import app
+from AbhiXMusic.core.governor import NORMAL, send_priority
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.database import fanoutdb
+
+# Telegram allows a bot roughly 30 messages a second across all chats; stay
+# under it so long jobs never trip the global flood limit.
+FANOUT_RATE = 25
+FANOUT_WORKERS = 20
+# Targets started between two checkpoints.
+FANOUT_BATCH = 200
+# Targets started but not finished.
+FANOUT_WINDOW = 400
+# A target asked to wait longer than this is counted as failed.
+MAX_FLOOD_WAIT = 300
+MAX_RETRIES = 3
+PROGRESS_INTERVAL = 10
+
+# kind -> (source, action, finish)
+kinds = {}
+# job_id -> FanoutJob
+running = {}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# Shared by every job, since the limit is per bot and not per job.
+bucket = TokenBucket(FANOUT_RATE)
+
+
+class Window:
+    """Runs tasks with at most `size` of them started but not finished.
+
+    Bounds memory on long runs without tying a slot to a worker: a task
+    sleeping out a FloodWait keeps its slot, and the rest keep flowing.
+    """
+
+    def __init__(self, size: int):
+        self.slots = asyncio.Semaphore(size)
+        self.tasks = set()
+
+    async def _run(self, func, args):
+        try:
+            return await func(*args)
+        finally:
+            self.slots.release()
+
+    async def start(self, func, *args) -> asyncio.Task:
+        """Wait for a free slot, then run `func(*args)` as a task."""
+        await self.slots.acquire()
+        task = asyncio.create_task(self._run(func, args))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def wait(self):
+        if self.tasks:
+            await asyncio.gather(*self.tasks)
+
+
+class FanoutJob:
+    def __init__(self, doc: dict):
+        self.doc = doc
+        self.id = doc["job_id"]
+        self.cancelled = False
+        self.reported = 0
+        self.task = None
+
+    def count(self, name: str):
+        counts = self.doc["counts"]
+        counts[name] = counts.get(name, 0) + 1
+
+
+def register(kind: str, source, action, finish=None):
+    """Make a job kind available to start_job and to resume_jobs.
+
+    `source(params, after)` is an async iterator of targets in ascending order,
+    starting past the last checkpointed target `after` (None on a fresh job).
+    `action(target, params)` does the work for one target; it may return the
+    name of an extra counter to bump, and FloodWait raised from it is retried.
+    `finish(doc)` runs once when the job completes without being cancelled.
+    """
+    kinds[kind] = (source, action, finish)
+
+
+def format_job(doc: dict) -> str:
+    counts = doc["counts"]
+    text = (
+        f"<b>{doc['kind']}</b> <code>{doc['job_id']}</code>\n"
+        f"sᴛᴀᴛᴜs : {doc['status']}\n"
+        f"ᴅᴏɴᴇ : {counts.get('done', 0)}"
+    )
+    if doc.get("total"):
+        text += f" / {doc['total']}"
+    text += f"\nғᴀɪʟᴇᴅ : {counts.get('failed', 0)}"
+    for name, value in counts.items():
+        if name not in ("done", "failed"):
+            text += f"\n{name} : {value}"
+    return text
+
+
+async def _report(job: FanoutJob, force: bool = False):
+    doc = job.doc
+    if not doc.get("message_id"):
+        return
+    if not force and time.time() - job.reported < PROGRESS_INTERVAL:
+        return
+    job.reported = time.time()
+    try:
+        await app.edit_message_text(doc["chat_id"], doc["message_id"], format_job(doc))
+    except Exception:
+        pass
+
+
+async def _process(job: FanoutJob, target, action, semaphore: asyncio.Semaphore):
+    params = job.doc["params"]
+    for _ in range(MAX_RETRIES + 1):
+        async with semaphore:
+            if job.cancelled:
+                return
+            await bucket.acquire()
+            try:
+                # Bulk sends never take precedence over replies to users.
+                with send_priority(NORMAL):
+                    result = await action(target, params)
+            except FloodWait as fw:
+                wait = int(fw.value)
+            except Exception:
+                job.count("failed")
+                return
+            else:
+                job.count("done")
+                if isinstance(result, str):
+                    job.count(result)
+                return
+        if wait > MAX_FLOOD_WAIT:
+            break
+        # Sleep outside the semaphore so the other workers keep going.
+        await asyncio.sleep(wait)
+    job.count("failed")
+
+
+async def _checkpoint(job: FanoutJob):
+    doc = job.doc
+    doc["updated"] = time.time()
+    await fanoutdb.update_one(
+        {"job_id": job.id},
+        {
+            "$set": {
+                "after": doc["after"],
+                "counts": doc["counts"],
+                "status": doc["status"],
+                "updated": doc["updated"],
+            }
+        },
+    )
+
+
+async def _run(job: FanoutJob):
+    doc = job.doc
+    source, action, finish = kinds[doc["kind"]]
+    semaphore = asyncio.Semaphore(FANOUT_WORKERS)
+    window = Window(FANOUT_WINDOW)
+    # [target, finished] in source order; the checkpoint only moves past a
+    # target once every target before it has finished too.
+    order = deque()
+
+    async def handle(entry):
+        try:
+            await _process(job, entry[0], action, semaphore)
+        finally:
+            entry[1] = True
+
+    async def checkpoint():
+        if not job.cancelled:
+            while order and order[0][1]:
+                doc["after"] = order.popleft()[0]
+        await _checkpoint(job)
+        await _report(job)
+
+    try:
+        started = 0
+        async for target in source(doc["params"], doc["after"]):
+            if job.cancelled:
+                break
+            entry = [target, False]
+            order.append(entry)
+            await window.start(handle, entry)
+            started += 1
+            if started % FANOUT_BATCH == 0:
+                await checkpoint()
+        await window.wait()
+        await checkpoint()
+        doc["status"] = "cancelled" if job.cancelled else "done"
+    except Exception as e:
+        LOGGER(__name__).error(f"Fan-out job {job.id} ({doc['kind']}) failed: {e}")
+        doc["status"] = "failed"
+    running.pop(job.id, None)
+    try:
+        await _checkpoint(job)
+    except Exception as e:
+        LOGGER(__name__).error(f"Could not save fan-out job {job.id}: {e}")
+    await _report(job, force=True)
+    if finish and doc["status"] == "done":
+        try:
+            await finish(doc)
+        except Exception as e:
+            LOGGER(__name__).error(f"Finishing fan-out job {job.id} failed: {e}")
+
+
+def _launch(doc: dict) -> FanoutJob:
+    job = FanoutJob(doc)
+    running[job.id] = job
+    job.task = asyncio.create_task(_run(job))
+    return job
+
+
+async def start_job(
+    kind: str,
+    params: dict,
+    chat_id: Optional[int] = None,
+    message_id: Optional[int] = None,
+    total: Optional[int] = None,
+) -> str:
+    """Persist a new job and start it; progress is edited into `message_id`."""
+    doc = {
+        "job_id": uuid.uuid4().hex[:8],
+        "kind": kind,
+        "params": params,
+        "status": "running",
+        "after": None,
+        "counts": {"done": 0, "failed": 0},
+        "total": total,
+        "chat_id": chat_id,
+        "message_id": message_id,
+        "started": time.time(),
+        "updated": time.time(),
+    }
+    await fanoutdb.insert_one(dict(doc))
+    _launch(doc)
+    return doc["job_id"]
+
+
+async def cancel_job(job_id: str) -> bool:
+    job = running.get(job_id)
+    if job:
+        job.cancelled = True
+        return True
+    # A job left running by a previous process that has not been resumed.
+    result = await fanoutdb.update_one(
+        {"job_id": job_id, "status": "running"}, {"$set": {"status": "cancelled"}}
+    )
+    return bool(result.modified_count)
+
+
+def list_jobs() -> list:
+    return [job.doc for job in running.values()]
+
+
+async def resume_jobs():
+    """Restart jobs that were still running when the bot stopped."""
+    async for doc in fanoutdb.find({"status": "running"}, {"_id": 0}):
+        if doc["job_id"] in running:
+            continue
+        if doc["kind"] not in kinds:
+            LOGGER(__name__).warning(
+                f"Fan-out job {doc['job_id']} has unknown kind {doc['kind']}"
+            )
+            continue
+        _launch(doc)
+        LOGGER(__name__).info(
+            f"Resumed fan-out job {doc['job_id']} ({doc['kind']}) after {doc['after']}"
+        )
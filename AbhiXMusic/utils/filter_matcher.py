@@ -0,0 +1,55 @@
+# Owner @Tera_YaaaR_Hu
+import re
+from typing import Dict, List, Tuple
+
+
+class FilterMatcher:
+    """All filter names of one chat compiled into a single regex.
+
+    A filter matches when its name appears in the text with no word character
+    directly before or after it, case-insensitively. The combined pattern only
+    finds the positions where some filter may start; the per-name patterns are
+    tried at those positions, so every matching filter is still reported even
+    when names overlap ("hi" and "hi there").
+    """
+
+    def __init__(self, payloads: Dict[str, tuple]):
+        self.payloads = payloads
+        self.patterns = {}
+        self.buckets = {}
+        for name in sorted(payloads, key=len, reverse=True):
+            if not name:
+                continue
+            self.patterns[name] = re.compile(
+                r"(?<!\w)" + re.escape(name) + r"(?!\w)", re.IGNORECASE
+            )
+            self.buckets.setdefault(name[0].lower(), []).append(name)
+        if self.patterns:
+            self.combined = re.compile(
+                r"(?<!\w)(?="
+                + "|".join(re.escape(name) for name in self.patterns)
+                + r")",
+                re.IGNORECASE,
+            )
+        else:
+            self.combined = None
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def __contains__(self, name):
+        return name in self.payloads
+
+    def names(self) -> List[str]:
+        return list(self.payloads)
+
+    def match(self, text: str) -> List[Tuple[str, tuple]]:
+        if not self.combined or not text:
+            return []
+        found = []
+        for hit in self.combined.finditer(text):
+            start = hit.start()
+            for name in self.buckets.get(text[start].lower(), ()):
+                if name not in found and self.patterns[name].match(text, start):
+                    found.append(name)
+        return [(name, self.payloads[name]) for name in found]
@@ -1,6 +1,7 @@
 # Owner @Tera_YaaaR_Hu
 from pyrogram.enums import ParseMode
 from AbhiXMusic import app
+from AbhiXMusic.core.governor import LOW, send_priority
 from AbhiXMusic.utils.database import is_on_off
 from config import LOGGER_ID
 
@@ -22,12 +23,13 @@ async def play_logs(message, streamtype):
 <b>sᴛʀᴇᴀᴍᴛʏᴘᴇ :</b> {streamtype}"""
         if message.chat.id != LOGGER_ID:
             try:
-                await app.send_message(
-                    chat_id=LOGGER_ID,
-                    text=logger_text,
-                    parse_mode=ParseMode.HTML,
-                    disable_web_page_preview=True,
-                )
+                with send_priority(LOW):
+                    await app.send_message(
+                        chat_id=LOGGER_ID,
+                        text=logger_text,
+                        parse_mode=ParseMode.HTML,
+                        disable_web_page_preview=True,
+                    )
             except:
                 pass
         return
@@ -0,0 +1,50 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+import os
+
+from AbhiXMusic import app
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.thumbcache import ThumbCache
+
+PHOTO_VERSION = "v1"
+PHOTO_CACHE_BYTES = 100 * 1024 * 1024
+PHOTO_CACHE_TTL = 14 * 24 * 3600
+DEFAULT_PHOTO = "AbhiXMusic/assets/upic.png"
+
+# Profile photos named after their file_unique_id, so a user or chat keeps
+# the same file until they change their picture.
+photo_cache = ThumbCache(
+    os.path.join("cache", "photos"), PHOTO_VERSION, PHOTO_CACHE_BYTES, PHOTO_CACHE_TTL
+)
+# file_unique_id -> task downloading it, so a burst of lookups downloads once
+_downloading = {}
+
+
+async def _download(photo) -> str:
+    key = photo.big_photo_unique_id
+    try:
+        # Absolute, since pyrogram resolves relative names against the script.
+        await app.download_media(
+            photo.big_file_id, file_name=os.path.abspath(photo_cache.path(key))
+        )
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not download profile photo {key}: {e}")
+        return None
+    photo_cache.put(key)
+    return photo_cache.path(key)
+
+
+async def get_profile_photo(photo) -> str:
+    """Local path of a user's or chat's big profile photo, or None without one."""
+    if not photo or not getattr(photo, "big_file_id", None):
+        return None
+    key = photo.big_photo_unique_id
+    path = photo_cache.get(key)
+    if path:
+        return path
+    task = _downloading.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_download(photo))
+        _downloading[key] = task
+        task.add_done_callback(lambda task: _downloading.pop(key, None))
+    return await asyncio.shield(task)
@@ -0,0 +1,108 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from AbhiXMusic.logging import LOGGER
+
+RENDER_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+# Renders one chat may have running at once, so a join raid in one group
+# cannot take every worker.
+RENDER_PER_CHAT = 2
+
+
+class RenderPool:
+    """Runs CPU-bound PIL work in worker processes instead of on the event loop.
+
+    Modules register their asset loaders with `warm`; `start` runs them once
+    and then forks the workers, so fonts, masks and icon layers are loaded
+    before the first render and inherited by every worker. Forking also keeps
+    the workers from importing the bot package again. Call `start` early,
+    before other threads hold locks a child could inherit.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.warmers = []
+        self.executor = None
+        self.stats = {}
+        # chat_id -> [semaphore, renders holding or waiting for it]; dropped
+        # once nothing uses it, so only chats rendering right now are kept.
+        self.slots = {}
+
+    def warm(self, func):
+        self.warmers.append(func)
+        return func
+
+    def start(self):
+        if self.executor is not None:
+            return
+        for func in self.warmers:
+            try:
+                func()
+            except Exception as e:
+                LOGGER(__name__).warning(f"Could not preload {func.__name__}: {e}")
+        self.executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("fork")
+        )
+        # The executor only forks on submit; fork every worker now rather
+        # than at the first render, when the clients' threads are running.
+        for future in [self.executor.submit(int) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def run(self, name: str, func, *args, chat_id: int = None):
+        """Run `func(*args)` in a worker and record how long it took under `name`."""
+        if chat_id is None:
+            return await self._run(name, func, *args)
+        slot = self.slots.get(chat_id)
+        if slot is None:
+            slot = self.slots[chat_id] = [asyncio.Semaphore(RENDER_PER_CHAT), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                return await self._run(name, func, *args)
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                del self.slots[chat_id]
+
+    async def _run(self, name: str, func, *args):
+        self.start()
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, func, *args
+            )
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next render. This one
+            # forks late, but only after a crash.
+            self.executor = None
+            raise
+        finally:
+            self._record(name, time.monotonic() - started)
+
+    def _record(self, name: str, runtime: float):
+        stats = self.stats.setdefault(
+            name, {"runs": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+        )
+        stats["runs"] += 1
+        stats["total"] += runtime
+        stats["max"] = max(stats["max"], runtime)
+        stats["last"] = runtime
+
+    def report(self) -> dict:
+        return {
+            name: {**stats, "avg": stats["total"] / stats["runs"]}
+            for name, stats in self.stats.items()
+        }
+
+
+render_pool = RenderPool(RENDER_WORKERS)
@@ -0,0 +1,46 @@
+# Owner @Tera_YaaaR_Hu
+import time
+
+from AbhiXMusic import app
+from AbhiXMusic.core.cache import Cache
+
+# A full rescan of a big group is expensive, so rosters live for hours and are
+# kept current in between from join/leave events.
+ROSTER_TTL = 6 * 3600
+ROSTER_CACHE_SIZE = 50
+
+async def _fetch_roster(chat_id: int) -> dict:
+    members = {}
+    async for member in app.get_chat_members(chat_id):
+        user = member.user
+        if user and not user.is_bot and not user.is_deleted:
+            members[user.id] = user.first_name
+    return {"members": members, "expires": time.time() + ROSTER_TTL}
+
+
+# chat_id -> {"members": {user_id: first_name}, "expires": timestamp}
+rosters = Cache("rosters", ROSTER_CACHE_SIZE, loader=_fetch_roster)
+
+
+async def get_roster(chat_id: int) -> list:
+    """(user_id, first_name) of every human member, oldest cached first."""
+    entry = rosters.get(chat_id)
+    if entry:
+        if entry["expires"] < time.time():
+            # Tag from the cached roster and rescan in the background.
+            rosters.refresh(chat_id)
+    else:
+        entry = await rosters.load(chat_id)
+    return list(entry["members"].items())
+
+
+def roster_add(chat_id: int, user):
+    entry = rosters.get(chat_id)
+    if entry and user and not user.is_bot and not user.is_deleted:
+        entry["members"][user.id] = user.first_name
+
+
+def roster_remove(chat_id: int, user_id: int):
+    entry = rosters.get(chat_id)
+    if entry:
+        entry["members"].pop(user_id, None)
@@ -0,0 +1,220 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+import heapq
+import random
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from AbhiXMusic.logging import LOGGER
+
+# What to do with a run that comes due more than `grace` seconds late, for
+# example after the event loop was blocked: run it once now, or skip it.
+COALESCE = "coalesce"
+SKIP = "skip"
+
+
+class Job:
+    def __init__(
+        self,
+        name: str,
+        func,
+        next_run,
+        jitter: float,
+        group: str,
+        misfire: str,
+        grace: float,
+        parks: bool,
+    ):
+        self.name = name
+        self.func = func
+        self.next_run = next_run
+        self.jitter = jitter
+        self.group = group
+        self.misfire = misfire
+        self.grace = grace
+        self.parks = parks
+        self.due = None
+        self.parked = False
+        self.woken = False
+        self.stats = {
+            "runs": 0,
+            "failures": 0,
+            "skipped": 0,
+            "missed": 0,
+            "last_runtime": 0.0,
+            "max_runtime": 0.0,
+            "total_runtime": 0.0,
+            "last_run": None,
+        }
+
+
+class Scheduler:
+    """Runs every periodic background job from one heap and one sleeping task.
+
+    Jobs that have nothing to do can park themselves by returning False and
+    are left out of the heap until `wake` is called for them, so an idle bot
+    has no timers firing at all.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.heap = []
+        self.seq = 0
+        self.limits = {}
+        self.running = {}
+        self.wakeup = asyncio.Event()
+        self._task = None
+
+    def _push(self, job: Job, when: float):
+        if job.jitter:
+            when += random.uniform(0, job.jitter)
+        job.due = when
+        self.seq += 1
+        heapq.heappush(self.heap, (when, self.seq, job))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Registered before the loop exists; it waits for `start`.
+            return
+        self.start()
+
+    def start(self):
+        """Begin running due jobs; called once the event loop is up."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self.wakeup.set()
+
+    def _add(self, job: Job, first: float):
+        self.jobs[job.name] = job
+        self._push(job, first)
+
+    def limit(self, group: str, max_running: int):
+        """Cap how many runs of the jobs in `group` may overlap."""
+        self.limits[group] = max_running
+
+    def every(
+        self,
+        name: str,
+        seconds: float,
+        func,
+        jitter: float = 0,
+        group: str = None,
+        misfire: str = COALESCE,
+        grace: float = None,
+        parks: bool = False,
+    ):
+        job = Job(
+            name,
+            func,
+            lambda after: after + seconds,
+            jitter,
+            group or name,
+            misfire,
+            seconds if grace is None else grace,
+            parks,
+        )
+        self._add(job, time.time() + seconds)
+
+    def daily(
+        self,
+        name: str,
+        hour: int,
+        minute: int,
+        func,
+        timezone: str = "Asia/Kolkata",
+        jitter: float = 0,
+        group: str = None,
+        misfire: str = COALESCE,
+        grace: float = 3600,
+    ):
+        zone = ZoneInfo(timezone)
+
+        def next_run(after: float) -> float:
+            now = datetime.fromtimestamp(after, zone)
+            run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if run <= now:
+                run += timedelta(days=1)
+            return run.timestamp()
+
+        job = Job(name, func, next_run, jitter, group or name, misfire, grace, False)
+        self._add(job, next_run(time.time()))
+
+    def wake(self, name: str):
+        job = self.jobs.get(name)
+        if job is None:
+            return
+        job.woken = True
+        if job.parked:
+            job.parked = False
+            self._push(job, job.next_run(time.time()))
+
+    async def _run(self):
+        while self.heap:
+            when, _, job = self.heap[0]
+            delay = when - time.time()
+            if delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.heap)
+            if job.parked or job.due != when:
+                continue
+            self._fire(job, -delay)
+
+    def _fire(self, job: Job, late: float):
+        # Fixed rate: the next slot follows the one that was due, unless the
+        # run is so late that catching up would fire it back to back.
+        base = job.due if late <= job.grace else time.time()
+        self._push(job, job.next_run(base))
+        if late > job.grace and job.misfire == SKIP:
+            job.stats["missed"] += 1
+            return
+        running = self.running.get(job.group, 0)
+        if running >= self.limits.get(job.group, 1):
+            job.stats["skipped"] += 1
+            return
+        self.running[job.group] = running + 1
+        asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: Job):
+        start = time.monotonic()
+        result = None
+        job.woken = False
+        try:
+            result = await job.func()
+        except Exception as e:
+            job.stats["failures"] += 1
+            LOGGER(__name__).error(f"Scheduled job {job.name} failed: {e}")
+        finally:
+            runtime = time.monotonic() - start
+            stats = job.stats
+            stats["runs"] += 1
+            stats["last_runtime"] = runtime
+            stats["max_runtime"] = max(stats["max_runtime"], runtime)
+            stats["total_runtime"] += runtime
+            stats["last_run"] = time.time()
+            self.running[job.group] -= 1
+        # A wake that arrived during the run means there is work again.
+        if result is False and job.parks and not job.woken:
+            job.parked = True
+
+    def report(self) -> dict:
+        report = {}
+        for name, job in self.jobs.items():
+            stats = job.stats
+            report[name] = {
+                **stats,
+                "parked": job.parked,
+                "next_run": None if job.parked else job.due,
+                "avg_runtime": stats["total_runtime"] / stats["runs"]
+                if stats["runs"]
+                else 0,
+            }
+        return report
+
+
+scheduler = Scheduler()
@@ -0,0 +1,135 @@
+# Owner @Tera_YaaaR_Hu
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.mongo.afkdb import afkdb
+from AbhiXMusic.mongo.couples_db import coupledb
+from AbhiXMusic.mongo.filtersdb import filters
+from AbhiXMusic.mongo.nightmodedb import nightdb
+from AbhiXMusic.mongo.notesdb import notes
+from AbhiXMusic.utils import imposterdb
+from AbhiXMusic.utils.database import (
+    authuserdb,
+    autoenddb,
+    blacklist_chatdb,
+    blockeddb,
+    cardsdb,
+    chatsdb,
+    fanoutdb,
+    gbansdb,
+    migrationsdb,
+    onoffdb,
+    settingsdb,
+    sudoersdb,
+    usersdb,
+)
+from AbhiXMusic.utils.mongo import impdb
+
+# (collection, field, unique, partial filter). A partial filter keeps documents
+# that share a collection but not the key (pretender toggles) out of the index.
+INDEXES = [
+    (settingsdb, "chat_id", True, None),
+    (chatsdb, "chat_id", True, None),
+    (usersdb, "user_id", True, None),
+    (gbansdb, "user_id", True, None),
+    (blockeddb, "user_id", True, None),
+    (blacklist_chatdb, "chat_id", True, None),
+    (authuserdb, "chat_id", True, None),
+    (autoenddb, "chat_id", False, None),
+    (onoffdb, "on_off", False, None),
+    (sudoersdb, "sudo", True, None),
+    (cardsdb, "cc", True, None),
+    (migrationsdb, "name", True, None),
+    (fanoutdb, "job_id", True, None),
+    (fanoutdb, "status", False, None),
+    (afkdb, "user_id", True, None),
+    (coupledb, "chat_id", True, None),
+    (filters, "chat_id", True, None),
+    (notes, "chat_id", True, None),
+    (nightdb, "chat_id", True, None),
+    (impdb, "user_id", True, {"user_id": {"$exists": True}}),
+    (impdb, "chat_id_toggle", True, {"chat_id_toggle": {"$exists": True}}),
+    (imposterdb.impdb, "user_id", True, {"user_id": {"$exists": True}}),
+    (imposterdb.impdb, "chat_id_toggle", True, {"chat_id_toggle": {"$exists": True}}),
+]
+
+# Queries that run per message or per command, checked by /dbaudit.
+HOT_QUERIES = [
+    (settingsdb, {"chat_id": -1}),
+    (chatsdb, {"chat_id": -1}),
+    (usersdb, {"user_id": 1}),
+    (gbansdb, {"user_id": 1}),
+    (blockeddb, {"user_id": 1}),
+    (blacklist_chatdb, {"chat_id": -1}),
+    (authuserdb, {"chat_id": -1}),
+    (afkdb, {"user_id": 1}),
+    (filters, {"chat_id": -1}),
+    (notes, {"chat_id": -1}),
+    (nightdb, {"chat_id": -1}),
+    (impdb, {"user_id": 1}),
+    (impdb, {"chat_id_toggle": -1}),
+]
+
+
+async def ensure_indexes():
+    # Indexes that exist only without their unique constraint, and ones that
+    # could not be created at all.
+    degraded = []
+    missing = []
+    for collection, field, unique, partial in INDEXES:
+        name = f"{collection.full_name}.{field}"
+        options = {"name": f"{field}_1"}
+        if unique:
+            options["unique"] = True
+        if partial:
+            options["partialFilterExpression"] = partial
+        try:
+            await collection.create_index([(field, ASCENDING)], **options)
+        except OperationFailure as e:
+            # Duplicates left by the old find_one/insert_one pattern block a
+            # unique index; fall back to a plain one so lookups stay indexed.
+            LOGGER(__name__).warning(f"Index {name} not created as requested: {e}")
+            if not unique:
+                missing.append(name)
+                continue
+            options.pop("unique")
+            options["name"] = f"{field}_1_nonunique"
+            try:
+                await collection.create_index([(field, ASCENDING)], **options)
+                degraded.append(name)
+            except OperationFailure as e:
+                LOGGER(__name__).error(f"Fallback index {name} not created either: {e}")
+                missing.append(name)
+    if missing:
+        LOGGER(__name__).error(f"Mongo indexes missing: {', '.join(missing)}")
+    if degraded:
+        LOGGER(__name__).warning(
+            f"Mongo indexes created without their unique constraint: {', '.join(degraded)}"
+        )
+    if not missing and not degraded:
+        LOGGER(__name__).info("Mongo indexes are in place.")
+
+
+def _stages(plan: dict):
+    yield plan.get("stage")
+    if "inputStage" in plan:
+        yield from _stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def audit_queries() -> list:
+    """Explain every hot query and report the ones that scan a whole collection."""
+    report = []
+    for collection, query in HOT_QUERIES:
+        try:
+            explain = await collection.find(query).explain()
+        except OperationFailure as e:
+            report.append((collection.full_name, query, f"ERROR {e}"))
+            continue
+        winning = explain.get("queryPlanner", {}).get("winningPlan", {})
+        stages = [stage for stage in _stages(winning) if stage]
+        status = "COLLSCAN" if "COLLSCAN" in stages else "OK"
+        report.append((collection.full_name, query, status))
+    return report
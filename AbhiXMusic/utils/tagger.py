@@ -0,0 +1,69 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+
+from pyrogram.errors import FloodWait
+
+from AbhiXMusic.core.governor import NORMAL, send_priority
+from AbhiXMusic.utils.roster import get_roster
+
+# Mentions packed into one message.
+TAG_BATCH = 5
+# Chats that may be tagging at the same time across the whole bot.
+TAG_CONCURRENCY = 10
+
+# chat_id -> event set by stop_tagging
+tagging = {}
+_slots = asyncio.Semaphore(TAG_CONCURRENCY)
+
+
+def mention(user_id: int, name: str) -> str:
+    return f"[{name}](tg://user?id={user_id})"
+
+
+def is_tagging(chat_id: int) -> bool:
+    return chat_id in tagging
+
+
+def stop_tagging(chat_id: int) -> bool:
+    cancel = tagging.get(chat_id)
+    if cancel is None:
+        return False
+    cancel.set()
+    return True
+
+
+async def tag_members(chat_id: int, send, batch_size: int = TAG_BATCH):
+    """Call `send(users)` for each batch of the chat's roster.
+
+    `users` is a list of (user_id, first_name). Sends are paced by the
+    outbound governor rather than fixed sleeps. Returns the number of members
+    tagged, or None if the chat is already being tagged.
+    """
+    if chat_id in tagging:
+        return None
+    cancel = tagging[chat_id] = asyncio.Event()
+    tagged = 0
+    try:
+        async with _slots:
+            if cancel.is_set():
+                return tagged
+            members = await get_roster(chat_id)
+            i = 0
+            while i < len(members):
+                if cancel.is_set():
+                    break
+                users = members[i : i + batch_size]
+                try:
+                    with send_priority(NORMAL):
+                        await send(users)
+                except FloodWait as e:
+                    # Sleep it out and send the same batch again.
+                    await asyncio.sleep(int(e.value))
+                    continue
+                except Exception:
+                    break
+                tagged += len(users)
+                i += batch_size
+    finally:
+        tagging.pop(chat_id, None)
+    return tagged
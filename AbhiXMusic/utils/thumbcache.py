@@ -0,0 +1,146 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+
+from AbhiXMusic.logging import LOGGER
+
+# Play counts kept for warming; the rest are forgotten.
+MAX_PLAY_COUNTS = 1000
+
+
+class ThumbCache:
+    """Files on disk, bounded by total size and by age.
+
+    The manifest in the cache directory records every file with its size
+    and last use, so lookups never stat the disk. Files whose name does not
+    carry the current `version` belong to an older layout and are removed
+    when the manifest is loaded. Play counts are kept alongside, so the
+    most played videos can be rendered again after a restart.
+    """
+
+    def __init__(self, directory: str, version: str, max_bytes: int, ttl: int):
+        self.directory = directory
+        self.version = version
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> [size, last used], least recently used first
+        self.entries = OrderedDict()
+        self.plays = {}
+        self.total = 0
+        self.dirty = False
+        self.manifest = os.path.join(directory, "manifest.json")
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}_{self.version}.jpg")
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        entry[1] = time.time()
+        self.entries.move_to_end(key)
+        self.dirty = True
+        return self.path(key)
+
+    def played(self, key: str):
+        self.plays[key] = self.plays.get(key, 0) + 1
+        if len(self.plays) > MAX_PLAY_COUNTS * 2:
+            self.plays = dict(self.most_played_counts(MAX_PLAY_COUNTS))
+        self.dirty = True
+
+    def most_played_counts(self, count: int) -> list:
+        return sorted(self.plays.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def most_played(self, count: int) -> list:
+        return [key for key, _ in self.most_played_counts(count)]
+
+    def put(self, key: str):
+        """Record a file that was just written to `path(key)`."""
+        try:
+            size = os.path.getsize(self.path(key))
+        except OSError:
+            return
+        old = self.entries.pop(key, None)
+        if old:
+            self.total -= old[0]
+        self.entries[key] = [size, time.time()]
+        self.total += size
+        self.dirty = True
+        self._evict()
+
+    def _remove(self, key: str):
+        size, _ = self.entries.pop(key)
+        self.total -= size
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        cutoff = time.time() - self.ttl
+        while self.entries:
+            key, (_, used) = next(iter(self.entries.items()))
+            if self.total <= self.max_bytes and used >= cutoff:
+                break
+            self._remove(key)
+
+    def _load(self):
+        try:
+            with open(self.manifest) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        known = manifest.get("entries", {})
+        self.plays = manifest.get("plays", {})
+        suffix = f"_{self.version}.jpg"
+        found = {}
+        # One listing at startup instead of a stat per lookup afterwards.
+        for file in os.scandir(self.directory):
+            if file.name == "manifest.json":
+                continue
+            if not file.name.endswith(suffix):
+                try:
+                    os.remove(file.path)
+                except OSError:
+                    pass
+                continue
+            key = file.name[: -len(suffix)]
+            stat = file.stat()
+            found[key] = [stat.st_size, known.get(key, [0, stat.st_mtime])[1]]
+        self.entries = OrderedDict(sorted(found.items(), key=lambda item: item[1][1]))
+        self.total = sum(size for size, _ in self.entries.values())
+        self._evict()
+
+    def _save(self, manifest: dict):
+        tmp = f"{self.manifest}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest)
+
+    async def load(self):
+        await asyncio.to_thread(self._load)
+        LOGGER(__name__).info(
+            f"Disk cache {self.directory}: {len(self.entries)} files, {self.total // 1024} KB"
+        )
+
+    async def save(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        manifest = {"entries": dict(self.entries), "plays": dict(self.plays)}
+        try:
+            await asyncio.to_thread(self._save, manifest)
+        except OSError as e:
+            self.dirty = True
+            LOGGER(__name__).warning(f"Could not save the manifest of {self.directory}: {e}")
+
+    def report(self) -> dict:
+        return {
+            "files": len(self.entries),
+            "bytes": self.total,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,10 +1,14 @@
 # Owner @Tera_YaaaR_Hu
+import asyncio
+import io
 import os
 import re
-import aiofiles
 import aiohttp
 from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
 from youtubesearchpython.__future__ import VideosSearch
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.render import render_pool
+from AbhiXMusic.utils.thumbcache import ThumbCache
 from config import YOUTUBE_IMG_URL
 
 # Constants
@@ -36,6 +40,26 @@ ICONS_Y = BAR_Y + 48
 
 MAX_TITLE_WIDTH = 580
 
+# Bump whenever the card layout changes, so cards in the old layout are dropped.
+THUMB_VERSION = "v5"
+THUMB_CACHE_BYTES = 200 * 1024 * 1024
+THUMB_CACHE_TTL = 7 * 24 * 3600
+# Most played videos rendered again at startup if their card is missing
+THUMB_WARM = 20
+TITLE_FONT = "AbhiXMusic/assets/assets/font2.ttf"
+REGULAR_FONT = "AbhiXMusic/assets/assets/font.ttf"
+ICONS_PATH = "AbhiXMusic/assets/assets/play_icons.png"
+
+# Everything about the card that does not depend on the video, built once per
+# process by load_layers.
+_layers = {}
+thumb_cache = ThumbCache(
+    os.path.join(CACHE_DIR, "thumbs"), THUMB_VERSION, THUMB_CACHE_BYTES, THUMB_CACHE_TTL
+)
+# videoid -> task rendering its card, so chats playing the same video share it
+_rendering = {}
+
+
 def trim_to_width(text: str, font: ImageFont.FreeTypeFont, max_w: int) -> str:
     ellipsis = "…"
     if font.getlength(text) <= max_w:
@@ -45,11 +69,86 @@ def trim_to_width(text: str, font: ImageFont.FreeTypeFont, max_w: int) -> str:
             return text[:i] + ellipsis
     return ellipsis
 
-async def get_thumb(videoid: str) -> str:
-    cache_path = os.path.join(CACHE_DIR, f"{videoid}_v4.png")
-    if os.path.exists(cache_path):
-        return cache_path
 
+@render_pool.warm
+def load_layers() -> dict:
+    if _layers:
+        return _layers
+    try:
+        title_font = ImageFont.truetype(TITLE_FONT, 32)
+        regular_font = ImageFont.truetype(REGULAR_FONT, 18)
+    except OSError:
+        title_font = regular_font = ImageFont.load_default()
+
+    panel_mask = Image.new("L", (PANEL_W, PANEL_H), 0)
+    ImageDraw.Draw(panel_mask).rounded_rectangle((0, 0, PANEL_W, PANEL_H), 50, fill=255)
+    thumb_mask = Image.new("L", (THUMB_W, THUMB_H), 0)
+    ImageDraw.Draw(thumb_mask).rounded_rectangle((0, 0, THUMB_W, THUMB_H), 20, fill=255)
+
+    # The icons are drawn black, so only their alpha channel is needed.
+    icons = None
+    if os.path.isfile(ICONS_PATH):
+        alpha = Image.open(ICONS_PATH).resize((ICONS_W, ICONS_H)).convert("RGBA").getchannel("A")
+        icons = Image.new("RGBA", (ICONS_W, ICONS_H), (0, 0, 0, 255))
+        icons.putalpha(alpha)
+
+    _layers.update(
+        title_font=title_font,
+        regular_font=regular_font,
+        overlay=Image.new("RGBA", (PANEL_W, PANEL_H), (255, 255, 255, TRANSPARENCY)),
+        panel_mask=panel_mask,
+        thumb_mask=thumb_mask,
+        icons=icons,
+    )
+    return _layers
+
+
+def render_thumb(
+    image: bytes, path: str, title: str, views: str, duration_text: str, is_live: bool
+) -> str:
+    """Draw the now-playing card for one video; runs inside a render worker."""
+    layers = load_layers()
+    title_font = layers["title_font"]
+    regular_font = layers["regular_font"]
+
+    # Create base image
+    base = Image.open(io.BytesIO(image)).resize((1280, 720)).convert("RGBA")
+    bg = ImageEnhance.Brightness(base.filter(ImageFilter.BoxBlur(10))).enhance(0.6)
+
+    # Frosted glass panel
+    panel_area = bg.crop((PANEL_X, PANEL_Y, PANEL_X + PANEL_W, PANEL_Y + PANEL_H))
+    frosted = Image.alpha_composite(panel_area, layers["overlay"])
+    bg.paste(frosted, (PANEL_X, PANEL_Y), layers["panel_mask"])
+
+    # Draw details
+    draw = ImageDraw.Draw(bg)
+    thumb = base.resize((THUMB_W, THUMB_H))
+    bg.paste(thumb, (THUMB_X, THUMB_Y), layers["thumb_mask"])
+
+    draw.text((TITLE_X, TITLE_Y), trim_to_width(title, title_font, MAX_TITLE_WIDTH), fill="black", font=title_font)
+    draw.text((META_X, META_Y), f"YouTube | {views}", fill="black", font=regular_font)
+
+    # Progress bar
+    draw.line([(BAR_X, BAR_Y), (BAR_X + BAR_RED_LEN, BAR_Y)], fill="red", width=6)
+    draw.line([(BAR_X + BAR_RED_LEN, BAR_Y), (BAR_X + BAR_TOTAL_LEN, BAR_Y)], fill="gray", width=5)
+    draw.ellipse([(BAR_X + BAR_RED_LEN - 7, BAR_Y - 7), (BAR_X + BAR_RED_LEN + 7, BAR_Y + 7)], fill="red")
+
+    draw.text((BAR_X, BAR_Y + 15), "00:00", fill="black", font=regular_font)
+    end_text = "Live" if is_live else duration_text
+    draw.text((BAR_X + BAR_TOTAL_LEN - (90 if is_live else 60), BAR_Y + 15), end_text, fill="red" if is_live else "black", font=regular_font)
+
+    # Icons
+    if layers["icons"]:
+        bg.paste(layers["icons"], (ICONS_X, ICONS_Y), layers["icons"])
+
+    # Write next to the target and rename, so readers never see half a file.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    bg.convert("RGB").save(tmp_path, "JPEG", quality=90)
+    os.replace(tmp_path, path)
+    return path
+
+
+async def _make_thumb(videoid: str) -> str:
     # YouTube video data fetch
     results = VideosSearch(f"https://www.youtube.com/watch?v={videoid}", limit=1)
     try:
@@ -69,66 +168,56 @@ async def get_thumb(videoid: str) -> str:
     duration_text = "Live" if is_live else duration or "Unknown Mins"
 
     # Download thumbnail
-    thumb_path = os.path.join(CACHE_DIR, f"thumb{videoid}.png")
     try:
         async with aiohttp.ClientSession() as session:
             async with session.get(thumbnail) as resp:
-                if resp.status == 200:
-                    async with aiofiles.open(thumb_path, "wb") as f:
-                        await f.write(await resp.read())
+                if resp.status != 200:
+                    return YOUTUBE_IMG_URL
+                image = await resp.read()
     except Exception:
         return YOUTUBE_IMG_URL
 
-    # Create base image
-    base = Image.open(thumb_path).resize((1280, 720)).convert("RGBA")
-    bg = ImageEnhance.Brightness(base.filter(ImageFilter.BoxBlur(10))).enhance(0.6)
-
-    # Frosted glass panel
-    panel_area = bg.crop((PANEL_X, PANEL_Y, PANEL_X + PANEL_W, PANEL_Y + PANEL_H))
-    overlay = Image.new("RGBA", (PANEL_W, PANEL_H), (255, 255, 255, TRANSPARENCY))
-    frosted = Image.alpha_composite(panel_area, overlay)
-    mask = Image.new("L", (PANEL_W, PANEL_H), 0)
-    ImageDraw.Draw(mask).rounded_rectangle((0, 0, PANEL_W, PANEL_H), 50, fill=255)
-    bg.paste(frosted, (PANEL_X, PANEL_Y), mask)
-
-    # Draw details
-    draw = ImageDraw.Draw(bg)
     try:
-        title_font = ImageFont.truetype("AbhiXMusic/assets/assets/font2.ttf", 32)
-        regular_font = ImageFont.truetype("AbhiXMusic/assets/assets/font.ttf", 18)
-    except OSError:
-        title_font = regular_font = ImageFont.load_default()
-
-    thumb = base.resize((THUMB_W, THUMB_H))
-    tmask = Image.new("L", thumb.size, 0)
-    ImageDraw.Draw(tmask).rounded_rectangle((0, 0, THUMB_W, THUMB_H), 20, fill=255)
-    bg.paste(thumb, (THUMB_X, THUMB_Y), tmask)
+        path = await render_pool.run(
+            "thumbnail", render_thumb, image, thumb_cache.path(videoid), title, views, duration_text, is_live
+        )
+        thumb_cache.put(videoid)
+        return path
+    except Exception as e:
+        LOGGER(__name__).warning(f"Could not render thumbnail for {videoid}: {e}")
+        return YOUTUBE_IMG_URL
 
-    draw.text((TITLE_X, TITLE_Y), trim_to_width(title, title_font, MAX_TITLE_WIDTH), fill="black", font=title_font)
-    draw.text((META_X, META_Y), f"YouTube | {views}", fill="black", font=regular_font)
 
-    # Progress bar
-    draw.line([(BAR_X, BAR_Y), (BAR_X + BAR_RED_LEN, BAR_Y)], fill="red", width=6)
-    draw.line([(BAR_X + BAR_RED_LEN, BAR_Y), (BAR_X + BAR_TOTAL_LEN, BAR_Y)], fill="gray", width=5)
-    draw.ellipse([(BAR_X + BAR_RED_LEN - 7, BAR_Y - 7), (BAR_X + BAR_RED_LEN + 7, BAR_Y + 7)], fill="red")
+async def _thumb(videoid: str) -> str:
+    path = thumb_cache.get(videoid)
+    if path:
+        return path
+    task = _rendering.get(videoid)
+    if task is None:
+        task = asyncio.ensure_future(_make_thumb(videoid))
+        _rendering[videoid] = task
+        task.add_done_callback(lambda task: _rendering.pop(videoid, None))
+    return await asyncio.shield(task)
 
-    draw.text((BAR_X, BAR_Y + 15), "00:00", fill="black", font=regular_font)
-    end_text = "Live" if is_live else duration_text
-    draw.text((BAR_X + BAR_TOTAL_LEN - (90 if is_live else 60), BAR_Y + 15), end_text, fill="red" if is_live else "black", font=regular_font)
 
-    # Icons
-    icons_path = "AbhiXMusic/assets/assets/play_icons.png"
-    if os.path.isfile(icons_path):
-        ic = Image.open(icons_path).resize((ICONS_W, ICONS_H)).convert("RGBA")
-        r, g, b, a = ic.split()
-        black_ic = Image.merge("RGBA", (r.point(lambda *_: 0), g.point(lambda *_: 0), b.point(lambda *_: 0), a))
-        bg.paste(black_ic, (ICONS_X, ICONS_Y), black_ic)
-
-    # Cleanup and save
-    try:
-        os.remove(thumb_path)
-    except OSError:
-        pass
-
-    bg.save(cache_path)
-    return cache_path
\ No newline at end of file
+async def get_thumb(videoid: str) -> str:
+    thumb_cache.played(videoid)
+    return await _thumb(videoid)
+
+
+def _remove_legacy_thumbs():
+    # Cards from before the thumbnail cache lived directly in CACHE_DIR.
+    for file in os.scandir(CACHE_DIR):
+        if re.search(r"_v\d+\.png$", file.name):
+            try:
+                os.remove(file.path)
+            except OSError:
+                pass
+
+
+async def warm_thumbs():
+    """Render the cards of the most played videos that are not on disk."""
+    await asyncio.to_thread(_remove_legacy_thumbs)
+    for videoid in thumb_cache.most_played(THUMB_WARM):
+        if videoid not in thumb_cache.entries:
+            await _thumb(videoid)
@@ -0,0 +1,128 @@
+# Owner @Tera_YaaaR_Hu
+import asyncio
+from typing import Dict, Optional
+
+from pymongo import UpdateOne
+
+from AbhiXMusic.logging import LOGGER
+from AbhiXMusic.utils.scheduler import scheduler
+
+buffers = []
+
+# Flushes a key may fail before its update is given up.
+MAX_ATTEMPTS = 5
+
+
+def _merge(older: dict, newer: dict) -> dict:
+    """`older` followed by `newer`: $inc amounts add up, newer fields win elsewhere."""
+    merged = {operator: dict(fields) for operator, fields in older.items()}
+    for operator, fields in newer.items():
+        target = merged.setdefault(operator, {})
+        if operator == "$inc":
+            for field, amount in fields.items():
+                target[field] = target.get(field, 0) + amount
+        else:
+            target.update(fields)
+    return merged
+
+
+class WriteBehind:
+    """Collects upserts keyed by one field and writes them as a single bulk_write.
+
+    Repeated writes for the same key are merged in memory, so a busy user costs
+    one operation per flush no matter how many messages they send. Flushes
+    happen every `interval` seconds, as soon as `max_size` keys are pending,
+    and once more on shutdown through `flush_all`. While the database is
+    failing, at most `max_pending` keys are held and a key is dropped after
+    `MAX_ATTEMPTS` failed flushes.
+    """
+
+    def __init__(
+        self,
+        collection,
+        key: str,
+        max_size: int = 500,
+        interval: int = 5,
+        max_pending: int = 50000,
+    ):
+        self.collection = collection
+        self.key = key
+        self.max_size = max_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self.pending: Dict[object, Dict[str, dict]] = {}
+        # key -> failed flushes so far
+        self.attempts: Dict[object, int] = {}
+        self.dropped = 0
+        self._lock = asyncio.Lock()
+        buffers.append(self)
+        scheduler.every(
+            f"writebehind_{collection.name}", interval, self.flush, jitter=1
+        )
+
+    def _queue(self, value, operator: str, fields: dict):
+        update = self.pending.setdefault(value, {})
+        update.setdefault(operator, {}).update(fields)
+        if len(self.pending) >= self.max_size and not self._lock.locked():
+            asyncio.create_task(self.flush())
+
+    def set(self, value, fields: dict):
+        self._queue(value, "$set", fields)
+
+    def insert(self, value, fields: dict):
+        self._queue(value, "$setOnInsert", fields)
+
+    def peek(self, value) -> Optional[dict]:
+        update = self.pending.get(value)
+        if not update:
+            return None
+        return {**update.get("$setOnInsert", {}), **update.get("$set", {})}
+
+    async def flush(self):
+        async with self._lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, {}
+            operations = [
+                UpdateOne({self.key: value}, update, upsert=True)
+                for value, update in batch.items()
+            ]
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except Exception as e:
+                LOGGER(__name__).error(
+                    f"Write-behind flush of {len(operations)} ops to {self.collection.name} failed: {e}"
+                )
+                self._requeue(batch)
+            else:
+                for value in batch:
+                    self.attempts.pop(value, None)
+
+    def _requeue(self, batch: dict):
+        given_up = 0
+        for value, update in batch.items():
+            attempts = self.attempts.get(value, 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                self.attempts.pop(value, None)
+                given_up += 1
+                continue
+            self.attempts[value] = attempts
+            # Writes queued during the failed flush are newer than the batch.
+            newer = self.pending.get(value)
+            self.pending[value] = _merge(update, newer) if newer else update
+        # Oldest keys go first once the database has been down for a while.
+        while len(self.pending) > self.max_pending:
+            value = next(iter(self.pending))
+            del self.pending[value]
+            self.attempts.pop(value, None)
+            given_up += 1
+        if given_up:
+            self.dropped += given_up
+            LOGGER(__name__).warning(
+                f"Write-behind gave up on {given_up} updates to {self.collection.name}"
+            )
+
+
+async def flush_all():
+    for buffer in buffers:
+        await buffer.flush()
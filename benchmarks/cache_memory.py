@@ -0,0 +1,57 @@
+"""Memory and eviction behaviour of core.cache.Cache at a million keys.
+
+Run from the repository root:  python benchmarks/cache_memory.py
+"""
+import importlib.util
+import os
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location(
+    "cache", os.path.join(ROOT, "AbhiXMusic", "core", "cache.py")
+)
+cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cache)
+
+KEYS = 1_000_000
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def fill(store, start, count):
+    began = time.perf_counter()
+    for i in range(start, start + count):
+        # Shaped like a chatsettings entry: an int key and a small record.
+        store[-(10**12) - i] = {"lang": "en", "mode": "direct", "nonadmin": False}
+    return time.perf_counter() - began
+
+
+# The bounded case runs first, since freed memory is not handed back to the OS.
+print(f"{'case':<34} {'keys':>9} {'RSS MB':>8} {'evictions':>10} {'fill s':>7}")
+base = rss_mb()
+print(f"{'empty interpreter':<34} {0:>9} {base:>8.1f} {0:>10} {0:>7}")
+
+small = cache.Cache("bench_small", 100_000, ttl=3600)
+took = fill(small, 0, KEYS)
+print(
+    f"{'1M keys, maxsize 100k':<34} {len(small):>9} {rss_mb():>8.1f} "
+    f"{small.stats['evictions']:>10} {took:>7.2f}"
+)
+
+store = cache.Cache("bench_full", KEYS)
+took = fill(store, 0, KEYS)
+print(
+    f"{'1M keys, maxsize 1M':<34} {len(store):>9} {rss_mb():>8.1f} "
+    f"{store.stats['evictions']:>10} {took:>7.2f}"
+)
+took = fill(store, KEYS, KEYS)
+print(
+    f"{'1M more keys, maxsize 1M':<34} {len(store):>9} {rss_mb():>8.1f} "
+    f"{store.stats['evictions']:>10} {took:>7.2f}"
+)
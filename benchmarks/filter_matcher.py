@@ -0,0 +1,50 @@
+"""Per-message cost of FilterCheckker: old per-filter re.search loop vs FilterMatcher.
+
+Run from the repository root:  python benchmarks/filter_matcher.py
+"""
+import importlib.util
+import os
+import random
+import re
+import string
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location(
+    "filter_matcher", os.path.join(ROOT, "AbhiXMusic", "utils", "filter_matcher.py")
+)
+filter_matcher = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(filter_matcher)
+
+random.seed(0)
+
+
+def word(length):
+    return "".join(random.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def old_match(names, text):
+    found = []
+    for name in names:
+        pattern = r"( |^|[^\w])" + re.escape(name) + r"( |$|[^\w])"
+        if re.search(pattern, text, flags=re.IGNORECASE):
+            found.append(name)
+    return found
+
+
+MESSAGES = [" ".join(word(random.randint(2, 9)) for _ in range(12)) for _ in range(200)]
+
+print(f"{'filters':>8} {'old µs/msg':>12} {'new µs/msg':>12} {'build ms':>10}")
+for size in (10, 100, 1000):
+    names = list({word(random.randint(3, 10)) for _ in range(size)})
+    payloads = {name: ("", name, 1) for name in names}
+    built = timeit.timeit(lambda: filter_matcher.FilterMatcher(payloads), number=3) / 3
+    matcher = filter_matcher.FilterMatcher(payloads)
+    messages = MESSAGES + [f"say {names[0]} now"]
+    for text in messages:
+        assert sorted(old_match(names, text)) == sorted(n for n, _ in matcher.match(text))
+    runs = 5 if size == 1000 else 20
+    old = timeit.timeit(lambda: [old_match(names, t) for t in messages], number=runs)
+    new = timeit.timeit(lambda: [matcher.match(t) for t in messages], number=runs)
+    per = runs * len(messages)
+    print(f"{size:>8} {old / per * 1e6:>12.1f} {new / per * 1e6:>12.1f} {built * 1e3:>10.1f}")
@@ -73,11 +73,7 @@ STRING7 = getenv("STRING_SESSION7", None)
 
 # Miscellaneous
 BANNED_USERS = filters.user()
-adminlist = {}
-lyrical = {}
-votemode = {}
 autoclean = []
-confirmer = {}
 
 DEBUG_IGNORE_LOG = True
 